@@ -21,7 +21,8 @@ from typing import List, Tuple
 # Core application imports
 from src.core.chatbot import HiringAssistantChatbot
 from src.core.data_handler import DataHandler
-from src.core.config import APP_TITLE, APP_ICON, COMPANY_NAME
+from src.core.config import APP_TITLE, APP_ICON, COMPANY_NAME, ADMIN_MODE
+from src.core.profiler import profiler
 
 # UI component imports
 from src.ui.styles import get_main_css
@@ -34,6 +35,7 @@ from src.ui.enhanced_components import (
 )
 from src.ui.sidebar import display_sidebar
 from src.ui.progress import display_candidate_progress
+from src.ui.performance_dashboard import display_performance_dashboard
 
 # Configure Streamlit page settings
 st.set_page_config(
@@ -239,7 +241,10 @@ def main():
     
     # Display components
     display_header()
-    display_chat_interface()
+    if ADMIN_MODE and st.session_state.get('show_performance_dashboard', False):
+        display_performance_dashboard()
+    else:
+        display_chat_interface()
     display_sidebar()
     
     # Footer
@@ -247,5 +252,18 @@ def main():
     display_footer()
 
 
+def run():
+    """Run one Streamlit rerun, under the profiler when it is armed for reruns"""
+    if profiler.remaining and profiler.scope == "rerun":
+        chatbot = st.session_state.get('chatbot')
+        profiler.profile(
+            main, scope="rerun",
+            session_id=getattr(chatbot, 'session_id', None),
+            stage=f"rerun-{getattr(chatbot, 'conversation_stage', 'init')}"
+        )
+    else:
+        main()
+
+
 if __name__ == "__main__":
-    main()
+    run()
@@ -0,0 +1 @@
+# Benchmark and Load-Testing Package
@@ -0,0 +1,56 @@
+"""
+Chatbot turn throughput benchmarks against the offline stub model
+"""
+
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from src.core.chatbot import HiringAssistantChatbot
+from src.core.data_handler import DataHandler
+from src.core.llm_backends import StubModel
+
+from .bench_storage import seed_store
+from .scenarios import candidate_script
+from .stats import summarize
+
+
+def run_chatbot_benchmarks(conversations: int = 50, llm_latency: float = 0.0,
+                           store_size: int = 0, engine: str = "json") -> Dict[str, Dict[str, float]]:
+    """
+    Run scripted interviews back to back and report per-stage turn throughput.
+
+    ``store_size`` pre-seeds the candidate store so storage cost shows up in
+    the tech-stack and completion stages.
+    """
+    samples: Dict[str, List[float]] = defaultdict(list)
+
+    with tempfile.TemporaryDirectory(prefix="talentscout-bench-") as data_dir:
+        handler = DataHandler(data_dir=data_dir, backend=engine)
+        if store_size:
+            seed_store(handler, store_size)
+
+        model = StubModel(latency=llm_latency, seed=0)
+        for index in range(conversations):
+            chatbot = HiringAssistantChatbot(model=model, data_handler=handler)
+            for message in candidate_script(index):
+                stage = chatbot.conversation_stage
+                start = time.perf_counter()
+                chatbot.process_message(message)
+                samples[stage].append(time.perf_counter() - start)
+            if chatbot.conversation_stage != "completion":
+                raise RuntimeError(f"Scripted interview {index} stopped at {chatbot.conversation_stage}")
+        handler.close()
+
+    results = {}
+    for stage, stage_samples in samples.items():
+        summary = summarize(stage_samples)
+        summary["turns_per_sec"] = len(stage_samples) / sum(stage_samples) if sum(stage_samples) else 0.0
+        results[f"chatbot.turn.{stage}"] = summary
+
+    all_samples = [s for stage_samples in samples.values() for s in stage_samples]
+    overall = summarize(all_samples)
+    overall["turns_per_sec"] = len(all_samples) / sum(all_samples) if sum(all_samples) else 0.0
+    results["chatbot.turn.all"] = overall
+    return results
@@ -0,0 +1,129 @@
+"""
+Peak memory of reading a large candidates.json: json.load vs the streaming reader
+
+Each reader runs in a fresh interpreter. On Linux the peak RSS counter is
+reset after imports (``/proc/self/clear_refs``), so the figure is what the
+read itself added; elsewhere it is the whole process peak.
+
+Usage (one measurement, as run by the benchmark):
+    python -m benchmarks.bench_json_stream --measure stream data/candidates.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from .scenarios import synthetic_candidate
+
+READERS = ("json_load", "stream")
+
+
+def write_candidates_file(path: str, size: int) -> None:
+    """Write ``size`` synthetic candidates as an indented JSON array, like JsonFileStore"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(size):
+            record = synthetic_candidate(i)
+            record['id'] = f"{i:016x}"
+            f.write(("  " if i == 0 else ",\n  ") + json.dumps(record, indent=2, ensure_ascii=False))
+        f.write("\n]")
+
+
+def _proc_status_mb(field: str) -> float:
+    with open("/proc/self/status", "r", encoding="utf-8") as f:
+        return int(re.search(rf"{field}:\s+(\d+)", f.read()).group(1)) / 1024
+
+
+def _reset_peak_rss() -> float:
+    """Restart peak RSS tracking; returns the current RSS in MB (0 if unsupported)"""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as f:
+            f.write("5")
+        return _proc_status_mb("VmRSS")
+    except OSError:
+        return 0.0
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    try:
+        return _proc_status_mb("VmHWM")
+    except OSError:
+        import resource
+
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(reader: str, path: str) -> Dict[str, float]:
+    """Read every record of ``path`` with ``reader`` in this process"""
+    from src.core.storage.json_stream import iter_json_array
+
+    rss_before = _reset_peak_rss()
+    start = time.perf_counter()
+    if reader == "json_load":
+        with open(path, "r", encoding="utf-8") as f:
+            records = sum(1 for _ in json.load(f))
+    else:
+        records = sum(1 for _ in iter_json_array(path))
+    return {"seconds": time.perf_counter() - start, "peak_rss_mb": _peak_rss_mb() - rss_before,
+            "records": records}
+
+
+def _measure_in_child(reader: str, path: str) -> Dict[str, float]:
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_json_stream", "--measure",
+                             reader, path], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_json_stream_benchmarks(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    """
+    Time and peak RSS per reader and file size
+
+    Keys are ``json_read.<reader>@<size>``.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="talentscout-bench-") as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"candidates_{size}.json")
+            write_candidates_file(path, size)
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+            print(f"  json read @ {size:,} candidates ({file_mb:.0f} MB)...")
+            for reader in READERS:
+                run = _measure_in_child(reader, path)
+                results[f"json_read.{reader}@{size}"] = {
+                    "count": 1,
+                    "mean_s": run["seconds"],
+                    "peak_rss_mb": run["peak_rss_mb"],
+                    "file_mb": file_mb,
+                }
+    return results
+
+
+def print_memory_comparison(results: Dict[str, Dict[str, float]]) -> None:
+    """Print time and net peak RSS per reader and size"""
+    print(f"\n{'JSON read':<30} {'Time':>10} {'Peak RSS':>12} {'File':>10}")
+    for name, summary in sorted(results.items()):
+        if name.startswith("json_read."):
+            print(f"{name[len('json_read.'):]:<30} {summary['mean_s']:>9.2f}s "
+                  f"{summary['peak_rss_mb']:>10.1f}MB {summary['file_mb']:>8.1f}MB")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure one candidates.json reader")
+    parser.add_argument("--measure", choices=READERS, required=True)
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+    print(json.dumps(measure(args.measure, args.path)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+DataHandler storage benchmarks at increasing store sizes
+"""
+
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from src.core.data_handler import DataHandler
+
+from .scenarios import synthetic_candidate
+from .stats import summarize
+
+
+def seed_store(handler: DataHandler, size: int) -> List[str]:
+    """Write ``size`` synthetic candidates in one go and return their ids"""
+    records = [synthetic_candidate(i) for i in range(size)]
+    for record in records:
+        record['id'] = handler.generate_candidate_id(record['email'])
+    handler.storage.replace_all(records)
+    return [record['id'] for record in records]
+
+
+def _time(func: Callable[[], Any], reps: int) -> List[float]:
+    """Time ``reps`` calls of ``func``"""
+    samples = []
+    for _ in range(reps):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_storage_size(size: int, reps: int = 5, engine: str = "json",
+                       seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Benchmark every DataHandler operation against a ``size``-candidate store on ``engine``"""
+    rng = random.Random(seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="talentscout-bench-") as data_dir:
+        handler = DataHandler(data_dir=data_dir, backend=engine)
+
+        start = time.perf_counter()
+        ids = seed_store(handler, size)
+        results["seed"] = summarize([time.perf_counter() - start])
+
+        new_index = iter(range(size, size + reps))
+        results["save_candidate_info"] = summarize(_time(
+            lambda: handler.save_candidate_info(synthetic_candidate(next(new_index))), reps))
+        results["get_candidate_info"] = summarize(_time(
+            lambda: handler.get_candidate_info(rng.choice(ids)), reps))
+        results["update_candidate_responses"] = summarize(_time(
+            lambda: handler.update_candidate_responses(
+                rng.choice(ids), {"question_1": "Updated answer"}), reps))
+        results["mark_session_complete"] = summarize(_time(
+            lambda: handler.mark_session_complete(rng.choice(ids)), reps))
+        results["get_candidate_counts"] = summarize(_time(handler.get_candidate_counts, reps))
+
+        export_path = os.path.join(data_dir, "export.csv")
+        results["export_candidates_csv"] = summarize(_time(
+            lambda: handler.export_candidates_csv(export_path), 1))
+
+        # Destructive, so it runs last and only once
+        results["cleanup_old_sessions"] = summarize(_time(
+            lambda: handler.cleanup_old_sessions(days_old=30), 1))
+        handler.close()
+
+    return results
+
+
+def run_storage_benchmarks(sizes: List[int], reps: int = 5,
+                           engines: List[str] = ("json",)) -> Dict[str, Dict[str, float]]:
+    """
+    Run identical workloads per engine and size
+
+    Keys are ``storage.<engine>.<op>@<size>`` so engines line up side by side.
+    """
+    results = {}
+    for engine in engines:
+        for size in sizes:
+            print(f"  storage [{engine}] @ {size:,} candidates...")
+            for operation, summary in bench_storage_size(size, reps, engine).items():
+                results[f"storage.{engine}.{operation}@{size}"] = summary
+    return results
+
+
+def print_engine_comparison(results: Dict[str, Dict[str, float]], engines: List[str]) -> None:
+    """Print mean latency per operation with one column per engine"""
+    rows: Dict[str, Dict[str, float]] = {}
+    for name, summary in results.items():
+        if not name.startswith("storage."):
+            continue
+        engine, operation = name[len("storage."):].split(".", 1)
+        rows.setdefault(operation, {})[engine] = summary["mean_s"]
+
+    print(f"\n{'Operation':<40}" + "".join(f"{engine:>14}" for engine in engines))
+    for operation, by_engine in sorted(rows.items()):
+        cells = "".join(
+            f"{by_engine[engine] * 1000:>12.2f}ms" if engine in by_engine else f"{'-':>14}"
+            for engine in engines)
+        print(f"{operation:<40}{cells}")
@@ -0,0 +1,197 @@
+"""
+Concurrent interview load generator
+
+Runs N scripted candidate conversations, greeting to completion, in parallel
+against the chatbot engine with a configurable-latency stub model. Each
+conversation gets its own DataHandler on a shared data directory, the same
+way concurrent Streamlit sessions share ``candidates.json``.
+
+Usage:
+    python -m benchmarks.load_test --conversations 200 --concurrency 50 --llm-latency 0.3
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.core.chatbot import HiringAssistantChatbot
+from src.core.config import STORAGE_BACKEND
+from src.core.data_handler import DataHandler
+from src.core.llm_backends import StubModel
+from src.core.performance_optimizer import metrics
+
+from .bench_storage import seed_store
+from .scenarios import candidate_script
+from .stats import summarize
+
+
+class LoadTestRecorder:
+    """Thread-safe collector of per-stage turn latencies and errors"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: List[Dict[str, Any]] = []
+
+    def record_turn(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def record_error(self, conversation: int, stage: str, error: Exception) -> None:
+        with self._lock:
+            self.errors.append({
+                "conversation": conversation,
+                "stage": stage,
+                "error": f"{type(error).__name__}: {error}",
+                "traceback": traceback.format_exc(limit=3),
+            })
+
+
+def run_conversation(index: int, data_dir: str, model: StubModel, recorder: LoadTestRecorder,
+                     think_time: float = 0.0, backend: str = None) -> str:
+    """Drive one scripted interview; returns the stage it ended in"""
+    chatbot = HiringAssistantChatbot(model=model,
+                                     data_handler=DataHandler(data_dir=data_dir, backend=backend))
+    for message in candidate_script(index):
+        stage = chatbot.conversation_stage
+        start = time.perf_counter()
+        try:
+            chatbot.process_message(message)
+        except Exception as e:
+            recorder.record_error(index, stage, e)
+            return stage
+        recorder.record_turn(stage, time.perf_counter() - start)
+        if think_time:
+            time.sleep(think_time)
+    return chatbot.conversation_stage
+
+
+def verify_store(data_dir: str, conversations: int, store_size: int = 0,
+                 backend: str = None) -> Dict[str, int]:
+    """Count interviews whose final state did not survive concurrent writes"""
+    handler = DataHandler(data_dir=data_dir, backend=backend)
+    stored = len(handler.get_all_candidates())
+    missing = incomplete = 0
+    for index in range(conversations):
+        record = handler.get_candidate_info(handler.generate_candidate_id(f"candidate{index}@example.com"))
+        if record is None:
+            missing += 1
+        elif not record.get("session_completed"):
+            incomplete += 1
+    return {
+        "expected_records": store_size + conversations,
+        "stored_records": stored,
+        "missing_records": missing,
+        "incomplete_records": incomplete,
+    }
+
+
+def run_load_test(conversations: int, concurrency: int, llm_latency: float, jitter: float = 0.0,
+                  store_size: int = 0, think_time: float = 0.0, data_dir: str = None,
+                  backend: str = None) -> Dict[str, Any]:
+    """Run the load test and return a JSON-serializable report"""
+    metrics.reset()
+    recorder = LoadTestRecorder()
+    model = StubModel(latency=llm_latency, jitter=jitter)
+
+    with tempfile.TemporaryDirectory(prefix="talentscout-load-") as tmp_dir:
+        data_dir = data_dir or tmp_dir
+        if store_size:
+            seed_store(DataHandler(data_dir=data_dir, backend=backend), store_size)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            final_stages = list(pool.map(
+                lambda i: run_conversation(i, data_dir, model, recorder, think_time, backend),
+                range(conversations)))
+        elapsed = time.perf_counter() - start
+
+        integrity = verify_store(data_dir, conversations, store_size, backend)
+        DataHandler(data_dir=data_dir, backend=backend).close()
+
+    total_turns = sum(len(samples) for samples in recorder.samples.values())
+    storage = {name: summary for name, summary in metrics.snapshot()["histograms"].items()
+               if name.startswith("storage.")}
+
+    return {
+        "config": {
+            "conversations": conversations, "concurrency": concurrency,
+            "llm_latency": llm_latency, "jitter": jitter,
+            "store_size": store_size, "think_time": think_time,
+            "backend": backend or STORAGE_BACKEND,
+        },
+        "elapsed_s": elapsed,
+        "turns": total_turns,
+        "turns_per_sec": total_turns / elapsed if elapsed else 0.0,
+        "completed_conversations": final_stages.count("completion"),
+        "stages": {stage: summarize(samples) for stage, samples in recorder.samples.items()},
+        "storage": storage,
+        "integrity": integrity,
+        "errors": recorder.errors,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary"""
+    config = report["config"]
+    print(f"\n{config['conversations']} conversations @ concurrency {config['concurrency']} "
+          f"(LLM latency {config['llm_latency'] * 1000:.0f}ms, {config['backend']} storage)")
+    print(f"Elapsed: {report['elapsed_s']:.2f}s   Turns: {report['turns']}   "
+          f"Throughput: {report['turns_per_sec']:.1f} turns/s   "
+          f"Completed: {report['completed_conversations']}/{config['conversations']}")
+
+    print(f"\n{'Stage':<24} {'Turns':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for stage, s in sorted(report["stages"].items()):
+        print(f"{stage:<24} {s['count']:>6} {s['p50_s'] * 1000:>7.1f}ms {s['p95_s'] * 1000:>7.1f}ms "
+              f"{s['p99_s'] * 1000:>7.1f}ms {s['max_s'] * 1000:>7.1f}ms")
+
+    print(f"\n{'Storage operation':<40} {'Calls':>6} {'p50':>9} {'p99':>9} {'max':>9}")
+    for name, s in sorted(report["storage"].items()):
+        print(f"{name:<40} {s['count']:>6} {s['p50'] * 1000:>7.1f}ms "
+              f"{s['p99'] * 1000:>7.1f}ms {s['max'] * 1000:>7.1f}ms")
+
+    integrity = report["integrity"]
+    print(f"\nStored records: {integrity['stored_records']}/{integrity['expected_records']}   "
+          f"Lost updates: {integrity['missing_records']} missing, "
+          f"{integrity['incomplete_records']} not marked complete")
+    print(f"Errors: {len(report['errors'])}")
+    for error in report["errors"][:5]:
+        print(f"  #{error['conversation']} in {error['stage']}: {error['error']}")
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Concurrent interview load test")
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub model latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (s)")
+    parser.add_argument("--store-size", type=int, default=0, help="Pre-seeded candidates")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause between turns (s)")
+    parser.add_argument("--data-dir", help="Run against this data directory instead of a temp one")
+    parser.add_argument("--backend", default=STORAGE_BACKEND, help="Storage engine to load-test")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.conversations, args.concurrency, args.llm_latency, args.jitter,
+                           args.store_size, args.think_time, args.data_dir, args.backend)
+    print_report(report)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to: {args.output}")
+
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
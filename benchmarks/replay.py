@@ -0,0 +1,106 @@
+"""
+Replay recorded production conversations offline
+
+Reads a cassette written with TALENTSCOUT_LLM_MODE=record, re-drives every
+recorded session's user messages through the current chatbot code, and
+serves model calls from the cassette with original or scaled latency.
+
+Usage:
+    python -m benchmarks.replay data/cassettes/llm_cassette.jsonl --latency-scale 0.5
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.core.chatbot import HiringAssistantChatbot
+from src.core.data_handler import DataHandler
+from src.core.llm_backends import ReplayModel, read_cassette
+
+from .load_test import LoadTestRecorder
+from .stats import summarize
+
+
+def load_sessions(cassette_path: str) -> Dict[str, List[str]]:
+    """Group recorded user messages by session, in recording order"""
+    sessions: Dict[str, List[str]] = OrderedDict()
+    for entry in read_cassette(cassette_path):
+        if entry.get("type") == "turn":
+            sessions.setdefault(entry["session"], []).append(entry["message"])
+    return sessions
+
+
+def replay_session(index: int, messages: List[str], model: ReplayModel, data_dir: str,
+                   recorder: LoadTestRecorder) -> None:
+    """Drive one recorded session through a fresh chatbot"""
+    chatbot = HiringAssistantChatbot(model=model, data_handler=DataHandler(data_dir=data_dir))
+    for message in messages:
+        stage = chatbot.conversation_stage
+        start = time.perf_counter()
+        try:
+            chatbot.process_message(message)
+        except Exception as e:
+            recorder.record_error(index, stage, e)
+            return
+        recorder.record_turn(stage, time.perf_counter() - start)
+
+
+def run_replay(cassette_path: str, latency_scale: float = 1.0, concurrency: int = 1) -> Dict[str, Any]:
+    """Replay every session in the cassette and return a report"""
+    sessions = load_sessions(cassette_path)
+    model = ReplayModel(cassette_path, latency_scale=latency_scale)
+    recorder = LoadTestRecorder()
+
+    with tempfile.TemporaryDirectory(prefix="talentscout-replay-") as data_dir:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda item: replay_session(item[0], item[1], model, data_dir, recorder),
+                          enumerate(sessions.values())))
+        elapsed = time.perf_counter() - start
+        DataHandler(data_dir=data_dir).close()
+
+    total_turns = sum(len(samples) for samples in recorder.samples.values())
+    return {
+        "sessions": len(sessions),
+        "turns": total_turns,
+        "elapsed_s": elapsed,
+        "cassette_hits": model.hits,
+        "cassette_misses": model.misses,
+        "stages": {stage: summarize(samples) for stage, samples in recorder.samples.items()},
+        "errors": recorder.errors,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Replay recorded conversations offline")
+    parser.add_argument("cassette", help="Cassette JSONL recorded with TALENTSCOUT_LLM_MODE=record")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiply recorded latencies (0 = no sleeping)")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run_replay(args.cassette, args.latency_scale, args.concurrency)
+    print(f"Replayed {report['sessions']} sessions / {report['turns']} turns in {report['elapsed_s']:.2f}s")
+    print(f"Cassette hits: {report['cassette_hits']}   misses: {report['cassette_misses']}")
+    for stage, s in sorted(report["stages"].items()):
+        print(f"  {stage:<24} {s['count']:>5} turns  p50 {s['p50_s'] * 1000:.1f}ms  "
+              f"p95 {s['p95_s'] * 1000:.1f}ms")
+    if report["errors"]:
+        print(f"Errors: {len(report['errors'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    # Misses mean the code under test now sends prompts that were never recorded
+    return 1 if report["errors"] or report["cassette_misses"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""
+TalentScout benchmark runner
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 10000,100000,1000000
+    python -m benchmarks.run_benchmarks --suite storage --engines json,log,sqlite,partitioned,memory
+    python -m benchmarks.run_benchmarks --suite json --json-sizes 100000,500000
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from src.core.config import STORAGE_BACKEND
+from src.core.storage import STORAGE_BACKENDS
+
+from .bench_chatbot import run_chatbot_benchmarks
+from .bench_json_stream import print_memory_comparison, run_json_stream_benchmarks
+from .bench_storage import print_engine_comparison, run_storage_benchmarks
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+DEFAULT_SIZES = "10000,100000,1000000"
+DEFAULT_JSON_SIZES = "10000,100000"
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare mean latencies against a baseline run
+
+    Returns one row per shared benchmark with the ratio current/baseline and
+    whether it exceeds ``1 + threshold``.
+    """
+    rows = []
+    for name, summary in sorted(results.items()):
+        base = baseline.get(name)
+        if not base or not base.get("mean_s") or "mean_s" not in summary:
+            continue
+        ratio = summary["mean_s"] / base["mean_s"]
+        rows.append({
+            "benchmark": name,
+            "baseline_mean_s": base["mean_s"],
+            "current_mean_s": summary["mean_s"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    """Print a baseline comparison table"""
+    print(f"\n{'Benchmark':<50} {'Baseline':>12} {'Current':>12} {'Ratio':>8}")
+    for row in rows:
+        flag = "  ⚠️ REGRESSION" if row["regression"] else ""
+        print(f"{row['benchmark']:<50} {row['baseline_mean_s'] * 1000:>10.2f}ms "
+              f"{row['current_mean_s'] * 1000:>10.2f}ms {row['ratio']:>7.2f}x{flag}")
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point; exits non-zero when a regression is detected"""
+    parser = argparse.ArgumentParser(description="Run TalentScout benchmarks")
+    parser.add_argument("--suite", choices=["all", "chatbot", "storage", "json"], default="all")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="Comma-separated store sizes for the storage suite")
+    parser.add_argument("--json-sizes", default=DEFAULT_JSON_SIZES,
+                        help="Comma-separated candidates.json sizes for the JSON reader suite")
+    parser.add_argument("--reps", type=int, default=5, help="Repetitions per storage operation")
+    parser.add_argument("--engines", default=STORAGE_BACKEND,
+                        help=f"Comma-separated storage engines to compare ({', '.join(STORAGE_BACKENDS)})")
+    parser.add_argument("--conversations", type=int, default=50,
+                        help="Scripted interviews for the chatbot suite")
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Simulated stub model latency in seconds")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline JSON to compare against (skipped if missing)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Also store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before a result counts as a regression")
+    args = parser.parse_args(argv)
+
+    engines = [engine.strip() for engine in args.engines.split(",") if engine.strip()]
+    results: Dict[str, Dict[str, Any]] = {}
+    if args.suite in ("all", "chatbot"):
+        print("Running chatbot benchmarks...")
+        results.update(run_chatbot_benchmarks(args.conversations, args.llm_latency,
+                                              engine=engines[0]))
+    if args.suite in ("all", "storage"):
+        print("Running storage benchmarks...")
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        results.update(run_storage_benchmarks(sizes, args.reps, engines))
+        print_engine_comparison(results, engines)
+    if args.suite in ("all", "json"):
+        print("Running JSON reader benchmarks...")
+        sizes = [int(size) for size in args.json_sizes.split(",") if size.strip()]
+        results.update(run_json_stream_benchmarks(sizes))
+        print_memory_comparison(results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to: {args.output}")
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        rows = compare_to_baseline(results, baseline, args.threshold)
+        print_comparison(rows)
+        report["comparison"] = rows
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        if any(row["regression"] for row in rows):
+            exit_code = 1
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to: {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""
+Scripted candidates and synthetic records shared by benchmarks and load tests
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+POSITIONS = ["Software Engineer", "Data Scientist", "DevOps Engineer",
+             "Frontend Developer", "Backend Developer", "ML Engineer"]
+TECH_POOL = ["Python", "Django", "React", "PostgreSQL", "AWS", "Docker",
+             "Kubernetes", "Go", "Java", "Spring Boot", "MongoDB", "TypeScript"]
+LOCATIONS = ["Bangalore", "Berlin", "Remote", "New York", "London"]
+
+
+def candidate_script(index: int, seed: int = 0) -> List[str]:
+    """
+    Return the user messages of one complete interview, greeting to completion.
+
+    The first message triggers the greeting; the rest answer each stage in turn.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    tech = rng.sample(TECH_POOL, 4)
+    return [
+        "hello",
+        f"Candidate {index}",
+        f"candidate{index}@example.com",
+        f"+1 555 {index % 1000:03d} {index % 10000:04d}",
+        f"{rng.randint(0, 15)} years",
+        rng.choice(POSITIONS),
+        rng.choice(LOCATIONS),
+        f"I work with {', '.join(tech)}",
+        "I split the monolith into services and kept the shared schema stable.",
+        "I reproduce locally, add a failing test, then bisect recent deploys.",
+        "Add caching in front of the database and scale readers horizontally.",
+    ]
+
+
+def synthetic_candidate(index: int, now: datetime = None, max_age_days: int = 60) -> Dict[str, Any]:
+    """Build one stored candidate record shaped like DataHandler output"""
+    rng = random.Random(index)
+    now = now or datetime.now()
+    timestamp = now - timedelta(seconds=rng.randint(0, max_age_days * 86400))
+    completed = rng.random() < 0.7
+    record = {
+        "name": f"Candidate {index}",
+        "email": f"candidate{index}@seed.example.com",
+        "phone": f"555-{index % 1000:03d}-{index % 10000:04d}",
+        "experience_years": rng.randint(0, 15),
+        "desired_position": rng.choice(POSITIONS),
+        "location": rng.choice(LOCATIONS),
+        "tech_stack": rng.sample(TECH_POOL, 4),
+        "tech_stack_raw": "I work with a few things",
+        "timestamp": timestamp.isoformat(),
+        "session_completed": completed,
+    }
+    if completed:
+        record["technical_responses"] = {
+            f"question_{q}": "A short answer about past work." for q in range(1, 4)
+        }
+        record["completion_time"] = (timestamp + timedelta(minutes=12)).isoformat()
+    return record
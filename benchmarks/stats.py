@@ -0,0 +1,29 @@
+"""
+Small timing helpers shared by the benchmark and load-test tools
+"""
+
+import statistics
+from typing import Dict, List
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile (0-100) of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds)"""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean_s": statistics.fmean(samples),
+        "p50_s": percentile(samples, 50),
+        "p95_s": percentile(samples, 95),
+        "p99_s": percentile(samples, 99),
+        "max_s": max(samples),
+    }
@@ -0,0 +1,236 @@
+"""
+Recruiter analytics for TalentScout Hiring Assistant
+Vectorized aggregations over a typed, columnar view of the candidate store
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import ANALYTICS_SOURCE, EXPERIENCE_BUCKETS
+from .performance_optimizer import metrics
+from .storage import POSITIONS, TECHNOLOGIES, CanonicalTerms
+
+_FRAME_COLUMNS = ['id', 'desired_position', 'experience_years', 'tech_stack',
+                  'session_completed', 'timestamp', 'completion_time']
+
+
+@dataclass
+class CandidateFrame:
+    """Columnar candidate data: one row per candidate, one row per (candidate, skill)"""
+    candidates: pd.DataFrame
+    skills: pd.DataFrame
+
+
+def term_codes(terms: CanonicalTerms, values: pd.Series) -> np.ndarray:
+    """Canonical code per value, folding each distinct spelling once (-1 for missing or blank)"""
+    inverse, uniques = pd.factorize(values)
+    lookup = np.append(terms.codes(list(uniques)), np.int32(-1))  # factorize marks NA as -1
+    return lookup[inverse]
+
+
+def canonical_categorical(terms: CanonicalTerms, codes: np.ndarray, missing: str = None) -> pd.Categorical:
+    """Categorical of the canonical labels of ``codes``; -1 becomes ``missing`` (NaN if None)"""
+    labels = terms.labels()
+    if missing is not None:
+        fill = labels.index(missing) if missing in labels else len(labels)
+        labels = labels if fill < len(labels) else labels + [missing]
+        codes = np.where(codes < 0, fill, codes)
+    return pd.Categorical.from_codes(codes, labels).remove_unused_categories()
+
+
+def build_candidate_frame(records: Iterable[Dict]) -> CandidateFrame:
+    """Build typed frames in one pass: canonical categorical positions and skills, numeric experience, datetimes"""
+    frame = pd.DataFrame.from_records(list(records), columns=_FRAME_COLUMNS)
+    positions = term_codes(POSITIONS, frame['desired_position'].astype("string"))
+    candidates = pd.DataFrame({
+        'id': frame['id'].astype("string"),
+        'desired_position': canonical_categorical(POSITIONS, positions, "Unknown"),
+        'experience_years': pd.to_numeric(frame['experience_years'], errors='coerce'),
+        'session_completed': frame['session_completed'].fillna(False).astype(bool),
+        'timestamp': pd.to_datetime(frame['timestamp'], errors='coerce', format='ISO8601'),
+        'completion_time': pd.to_datetime(frame['completion_time'], errors='coerce',
+                                          format='ISO8601'),
+    })
+
+    stacks = frame['tech_stack'].where(frame['tech_stack'].map(lambda v: isinstance(v, list)))
+    exploded = stacks.explode().dropna()
+    return CandidateFrame(candidates=candidates,
+                          skills=_skill_table(exploded.index.to_numpy(),
+                                              term_codes(TECHNOLOGIES, exploded.astype(str))))
+
+
+def _skill_table(rows: np.ndarray, codes: np.ndarray) -> pd.DataFrame:
+    """One row per (candidate row, canonical skill) from skill codes indexed by candidate row"""
+    keep = codes >= 0
+    skills = pd.DataFrame({'row': rows[keep], 'skill': codes[keep]}).drop_duplicates()
+    skills['skill'] = canonical_categorical(TECHNOLOGIES, skills['skill'].to_numpy())
+    return skills.reset_index(drop=True)
+
+
+def snapshot_candidate_frame(snapshot) -> CandidateFrame:
+    """
+    Same frame as ``build_candidate_frame``, read from a ``CandidateSnapshot``
+
+    Numeric and time columns are taken from the mapped file without parsing
+    records. Positions and skills are dictionary-encoded in the snapshot, so
+    each distinct name is folded to its canonical code once and rows only
+    carry integer codes.
+    """
+    positions = np.append(POSITIONS.codes(snapshot.dictionary('desired_position')), np.int32(-1))
+    candidates = pd.DataFrame({
+        'id': pd.Series(snapshot.strings('id'), dtype="string"),
+        'desired_position': canonical_categorical(POSITIONS, positions[snapshot.codes('desired_position')],
+                                                  "Unknown"),
+        'experience_years': snapshot.column('experience_years'),
+        'session_completed': snapshot.column('session_completed'),
+        'timestamp': snapshot.column('timestamp'),
+        'completion_time': snapshot.column('completion_time'),
+    })
+    skills = TECHNOLOGIES.codes(snapshot.dictionary('tech_stack'))
+    return CandidateFrame(candidates=candidates,
+                          skills=_skill_table(snapshot.list_rows('tech_stack'),
+                                              skills[snapshot.codes('tech_stack')]))
+
+
+class CandidateAnalytics:
+    """
+    Cached analytics over one candidate store.
+
+    The columnar frame is built on first use and rebuilt only after a write
+    (``data_handler.data_version()`` changed); every aggregation result is
+    memoized per version. With ``source="snapshot"`` the frame comes from the
+    published dashboard snapshot instead and follows its republishing, so
+    analytics never read the live store.
+    """
+
+    def __init__(self, data_handler, source: str = ANALYTICS_SOURCE):
+        if source not in ("store", "snapshot"):
+            raise ValueError(f"Unknown analytics source: {source} (expected 'store' or 'snapshot')")
+        self.data_handler = data_handler
+        self.source = source
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._version: Any = None
+        self._frame: CandidateFrame = None
+        self._results: Dict[Hashable, pd.DataFrame] = {}
+
+    def _current_frame(self) -> CandidateFrame:
+        """Return the frame for the current data, rebuilding it after writes (caller holds the lock)"""
+        if self.source == "snapshot":
+            if self._snapshot is None:
+                self._snapshot = self.data_handler.candidate_snapshot()
+            else:
+                self._snapshot.refresh()
+            version = self._snapshot.version
+        else:
+            version = self.data_handler.data_version()
+        if self._frame is None or version is None or version != self._version:
+            with metrics.timer("analytics.build_frame"):
+                if self.source == "snapshot":
+                    self._frame = snapshot_candidate_frame(self._snapshot)
+                else:
+                    self._frame = build_candidate_frame(self.data_handler.get_all_candidates())
+            self._version = version
+            self._results = {}
+        return self._frame
+
+    def _cached(self, key: Hashable, compute: Callable[[CandidateFrame], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            frame = self._current_frame()
+            if key not in self._results:
+                metrics.increment("analytics.cache_misses")
+                self._results[key] = compute(frame)
+            else:
+                metrics.increment("analytics.cache_hits")
+            return self._results[key].copy()
+
+    def frame(self) -> CandidateFrame:
+        """The current typed frame (shared; do not modify)"""
+        with self._lock:
+            return self._current_frame()
+
+    def skill_frequency(self, top: int = None, completed_only: bool = False) -> pd.DataFrame:
+        """Candidates per skill, most common first, with their share of all candidates"""
+        def compute(frame: CandidateFrame) -> pd.DataFrame:
+            skills, candidates = frame.skills, frame.candidates
+            if completed_only:
+                completed = candidates['session_completed'].to_numpy()
+                skills = skills[completed[skills['row'].to_numpy()]]
+                total = int(completed.sum())
+            else:
+                total = len(candidates)
+            counts = skills['skill'].value_counts(sort=True)
+            counts = counts[counts > 0]
+            if top:
+                counts = counts.head(top)
+            return pd.DataFrame({
+                'skill': counts.index.astype(str),
+                'candidates': counts.to_numpy(),
+                'share': counts.to_numpy() / total if total else 0.0,
+            })
+        return self._cached(('skill_frequency', top, completed_only), compute)
+
+    def experience_distribution(self) -> pd.DataFrame:
+        """Candidates per experience bucket (see ``EXPERIENCE_BUCKETS``); unparseable values are 'unknown'"""
+        def compute(frame: CandidateFrame) -> pd.DataFrame:
+            edges = [low for low, _ in EXPERIENCE_BUCKETS.values()] + [np.inf]
+            buckets = pd.cut(frame.candidates['experience_years'], bins=edges, right=False,
+                             labels=list(EXPERIENCE_BUCKETS))
+            counts = buckets.value_counts(sort=False)
+            counts['unknown'] = int(buckets.isna().sum())
+            total = len(frame.candidates)
+            return pd.DataFrame({
+                'level': counts.index.astype(str),
+                'candidates': counts.to_numpy(),
+                'share': counts.to_numpy() / total if total else 0.0,
+            })
+        return self._cached('experience_distribution', compute)
+
+    def completion_rate_by_position(self) -> pd.DataFrame:
+        """Candidates, completed interviews and completion rate per desired position"""
+        def compute(frame: CandidateFrame) -> pd.DataFrame:
+            grouped = frame.candidates.groupby('desired_position', observed=True)['session_completed']
+            result = grouped.agg(candidates='size', completed='sum').reset_index()
+            result['completion_rate'] = result['completed'] / result['candidates']
+            result['desired_position'] = result['desired_position'].astype(str)
+            return result.sort_values('candidates', ascending=False, ignore_index=True)
+        return self._cached('completion_rate_by_position', compute)
+
+    def time_to_complete(self, by_position: bool = False) -> pd.DataFrame:
+        """Minutes from first save to completion: count, mean, median and p90"""
+        def compute(frame: CandidateFrame) -> pd.DataFrame:
+            candidates = frame.candidates
+            minutes = (candidates['completion_time'] - candidates['timestamp']).dt.total_seconds() / 60
+            data = pd.DataFrame({'desired_position': candidates['desired_position'],
+                                 'minutes': minutes})
+            data = data[candidates['session_completed'] & data['minutes'].notna()]
+            keys = ['desired_position'] if by_position else [np.zeros(len(data), dtype=int)]
+            grouped = data.groupby(keys, observed=True)['minutes']
+            result = grouped.agg(count='size', mean='mean', median='median')
+            result['p90'] = grouped.quantile(0.9)
+            if by_position:
+                result = result.reset_index()
+                result['desired_position'] = result['desired_position'].astype(str)
+                return result
+            return result.reset_index(drop=True)
+        return self._cached(('time_to_complete', by_position), compute)
+
+
+_instances: Dict[Tuple[str, str], CandidateAnalytics] = {}
+_instances_lock = threading.Lock()
+
+
+def get_analytics(data_handler) -> CandidateAnalytics:
+    """Return the process-wide analytics for the handler's store, shared by every session"""
+    key = (data_handler.backend, os.path.abspath(data_handler.data_dir))
+    with _instances_lock:
+        analytics = _instances.get(key)
+        # A released and reopened store gets fresh analytics
+        if analytics is None or analytics.data_handler.storage is not data_handler.storage:
+            analytics = _instances[key] = CandidateAnalytics(data_handler)
+        return analytics
@@ -0,0 +1,133 @@
+"""
+Candidate ids for TalentScout Hiring Assistant
+Keyed BLAKE2b ids and the migration that splits legacy id collisions
+"""
+
+import argparse
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List
+
+from .config import CANDIDATE_ID_BYTES, CANDIDATE_ID_KEY, DATA_DIR, STORAGE_BACKEND
+from .storage import normalize_email
+from .storage.records import apply_patch, merge_record
+
+_PERSONALIZATION = b"talentscout-id"
+
+
+def candidate_id(email: str, attempt: int = 0, key: str = CANDIDATE_ID_KEY,
+                 digest_size: int = CANDIDATE_ID_BYTES) -> str:
+    """
+    Id for ``email``: keyed BLAKE2b of the normalized address, as hex
+
+    ``attempt`` > 0 derives alternative ids for the (astronomically rare)
+    case where the first one already belongs to another candidate.
+    """
+    data = normalize_email(email).encode()
+    if attempt:
+        data += b"#%d" % attempt
+    return hashlib.blake2b(data, digest_size=digest_size, key=key.encode(),
+                           person=_PERSONALIZATION).hexdigest()
+
+
+def find_id_collisions(changes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Ids that were saved with more than one email, from a store's change history
+
+    Each email's record is rebuilt from the upserts made with it plus the
+    patches that followed them (responses and completion of that email's
+    session). Returns ``{id: {email: record}}``, emails ordered by their
+    last upsert, so the final one is the candidate the store shows today.
+    """
+    versions: Dict[str, Dict[str, Dict]] = {}
+    current: Dict[str, str] = {}
+    for op in changes:
+        kind = op.get('op')
+        if kind == 'upsert':
+            record = op['record']
+            owner = record['id']
+            email = normalize_email(record['email']) if 'email' in record else current.get(owner, "")
+            by_email = versions.setdefault(owner, {})
+            by_email[email] = merge_record(by_email.pop(email, None), record)
+            current[owner] = email
+        elif kind == 'patch':
+            by_email = versions.get(op['id'])
+            email = current.get(op['id'])
+            if by_email and email in by_email:
+                by_email[email] = apply_patch(by_email[email], op.get('set'), op.get('merge'))
+        elif kind == 'delete':
+            versions.pop(op['id'], None)
+            current.pop(op['id'], None)
+    return {owner: by_email for owner, by_email in versions.items() if len(by_email) > 1}
+
+
+@dataclass
+class CollisionReport:
+    """Result of ``split_id_collisions``"""
+    history_available: bool  # False: the engine keeps no history, so merges cannot be detected
+    collisions: List[Dict[str, Any]] = field(default_factory=list)  # {'id', 'candidates', 'split_into'}
+
+
+def split_id_collisions(data_handler, dry_run: bool = False) -> CollisionReport:
+    """
+    Give every candidate merged under a shared legacy id its own record back
+
+    The candidate the store currently shows keeps the id; the others get new
+    ids with ``split_from`` pointing at the old one. Collisions are only
+    visible where the engine keeps history (the log backend back to its
+    last compaction). Elsewhere the older candidate's fields were
+    overwritten: only duplicate entries of one id are found, and the report
+    has ``history_available`` False, so an empty result does not mean the
+    store is free of collisions. Run with the app stopped.
+
+    Returns:
+        CollisionReport: One ``{'id', 'candidates', 'split_into'}`` entry per shared id
+    """
+    data_handler.flush_pending_writes()
+    storage = data_handler.storage
+    report = CollisionReport(history_available=storage.keeps_history())
+    for shared_id, by_email in find_id_collisions(storage.history()).items():
+        *others, kept = by_email
+        entry = {'id': shared_id, 'candidates': len(by_email), 'split_into': []}
+        report.collisions.append(entry)
+        if dry_run:
+            continue
+        storage.delete(shared_id)
+        storage.upsert(dict(by_email[kept], id=shared_id))
+        for email in others:
+            new_id = data_handler.resolve_candidate_id(email)
+            record = dict(by_email[email], id=new_id, split_from=shared_id)
+            # The person may have come back since and been saved under a new id
+            existing = storage.get(new_id)
+            storage.upsert(merge_record(record, existing) if existing else record)
+            entry['split_into'].append(new_id)
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI: detect (and split) candidates that share a legacy id"""
+    from .data_handler import DataHandler
+
+    parser = argparse.ArgumentParser(description="Split candidates merged under a shared id")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--backend", default=STORAGE_BACKEND)
+    parser.add_argument("--dry-run", action="store_true", help="Only report shared ids")
+    args = parser.parse_args(argv)
+
+    handler = DataHandler(data_dir=args.data_dir, backend=args.backend, write_behind=False)
+    try:
+        report = split_id_collisions(handler, dry_run=args.dry_run)
+    finally:
+        handler.close()
+    if not report.history_available:
+        print(f"Warning: the {args.backend} backend keeps no history, so candidates merged under a "
+              f"shared id cannot be detected; only duplicate entries were checked")
+    for entry in report.collisions:
+        print(f"{entry['id']}: {entry['candidates']} candidates"
+              + ("" if args.dry_run else f" -> kept, {', '.join(entry['split_into'])}"))
+    print(f"{len(report.collisions)} shared id(s) {'found' if args.dry_run else 'split'}")
+    return 0 if report.history_available else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
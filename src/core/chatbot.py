@@ -18,6 +18,10 @@ Date: July 2025
 
 import os
 import re
+import sys
+import json
+import time
+import weakref
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import google.generativeai as genai
@@ -26,9 +30,13 @@ from dotenv import load_dotenv
 # Internal module imports
 from .config import (
     EXIT_KEYWORDS, TECH_CATEGORIES, DIFFICULTY_LEVELS,
-    MODEL_NAME, MAX_TOKENS, TEMPERATURE, COMPANY_NAME
+    MODEL_NAME, MAX_TOKENS, TEMPERATURE, COMPANY_NAME,
+    LLM_MODE, LLM_CASSETTE, LLM_REPLAY_LATENCY_SCALE
 )
 from .data_handler import DataHandler
+from .llm_backends import RecordingModel, ReplayModel, StubModel
+from .performance_optimizer import metrics
+from .profiler import profiler
 
 # Load environment variables
 load_dotenv()
@@ -52,18 +60,34 @@ class HiringAssistantChatbot:
         session_id: Unique identifier for the current session
     """
     
-    def __init__(self):
-        """Initialize the chatbot with all necessary components."""
-        self.data_handler = DataHandler()
+    def __init__(self, model: Any = None, data_handler: Optional[DataHandler] = None):
+        """
+        Initialize the chatbot with all necessary components.
+        
+        Args:
+            model: Object exposing ``generate_content(prompt)``; defaults to Gemini
+            data_handler: Storage handler; defaults to a new ``DataHandler``
+        """
+        self.data_handler = data_handler or DataHandler()
         self.conversation_history = []
         self.current_candidate = {}
         self.conversation_stage = "greeting"
         self.info_step = "name"  # Start with name collection
         self.tech_questions_generated = False
         self.session_id = None
+        self._history_bytes = 0
+        self._transcript_saved = False
+        
+        # Initialize Google Gemini AI unless a model was injected
+        if model is None:
+            self._initialize_ai()
+        else:
+            self.model = model
         
-        # Initialize Google Gemini AI
-        self._initialize_ai()
+        # Report this session to the shared metrics registry
+        self._metrics_label = f"session-{id(self):x}"
+        metrics.add_to_gauge("sessions.active", 1)
+        weakref.finalize(self, _release_session_metrics, self._metrics_label)
         
         # Map conversation stages to their handler methods
         self.stages = {
@@ -75,13 +99,35 @@ class HiringAssistantChatbot:
         }
     
     def _initialize_ai(self) -> None:
-        """Initialize Google Gemini AI with API key"""
+        """Initialize the model for the configured LLM mode (Gemini by default)"""
+        if LLM_MODE == "replay":
+            self.model = ReplayModel(LLM_CASSETTE, latency_scale=LLM_REPLAY_LATENCY_SCALE)
+            return
+        if LLM_MODE == "stub":
+            self.model = StubModel()
+            return
+        
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
         
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(MODEL_NAME)
+        if LLM_MODE == "record":
+            self.model = RecordingModel(self.model, LLM_CASSETTE)
+    
+    def _generate(self, prompt: str, call_type: str) -> str:
+        """Call the model and record latency per call type; returns stripped text"""
+        metrics.add_to_gauge("llm.in_flight", 1)
+        start = time.perf_counter()
+        try:
+            return self.model.generate_content(prompt).text.strip()
+        except Exception:
+            metrics.increment(f"llm.{call_type}.errors")
+            raise
+        finally:
+            metrics.observe(f"llm.{call_type}", time.perf_counter() - start)
+            metrics.add_to_gauge("llm.in_flight", -1)
     
     def _add_to_history(self, role: str, message: str) -> None:
         """Add message to conversation history"""
@@ -90,6 +136,19 @@ class HiringAssistantChatbot:
             "message": message,
             "timestamp": datetime.now().isoformat()
         })
+        self._history_bytes += sys.getsizeof(message)
+    
+    def _save_transcript(self) -> None:
+        """Persist the full conversation once per session, keyed by the candidate id"""
+        if self.session_id and not self._transcript_saved:
+            self._transcript_saved = self.data_handler.save_transcript(
+                self.session_id, self.conversation_history)
+    
+    def _update_memory_gauge(self) -> None:
+        """Publish an estimate of this session's in-memory footprint"""
+        candidate_bytes = len(json.dumps(self.current_candidate, default=str))
+        metrics.set_gauge("session.memory_bytes", self._history_bytes + candidate_bytes,
+                          label=self._metrics_label)
     
     def _check_exit_intent(self, user_input: str) -> bool:
         """Check if user wants to exit the conversation"""
@@ -111,8 +170,7 @@ class HiringAssistantChatbot:
         """
         
         try:
-            ai_response = self.model.generate_content(prompt)
-            extracted = ai_response.text.strip()
+            extracted = self._generate(prompt, "extract_info")
             return None if extracted == "NOT_FOUND" else extracted
         except Exception as e:
             print(f"Error extracting {field}: {e}")
@@ -171,7 +229,9 @@ To get started, could you please tell me your full name?
             email = self._extract_info_from_response(user_input, "email")
             if email and "@" in email:
                 self.current_candidate["email"] = email
-                self.session_id = self.data_handler.generate_candidate_id(email)
+                self.session_id = self.data_handler.resolve_candidate_id(email)
+                # Create the record now; each later step patches its field into it
+                self.data_handler.save_candidate_info(self.current_candidate)
                 self.info_step = "phone"
                 response = "Great! Now, what's your phone number?"
             else:
@@ -181,6 +241,7 @@ To get started, could you please tell me your full name?
             phone = self._extract_info_from_response(user_input, "phone number")
             if phone:
                 self.current_candidate["phone"] = phone
+                self._autosave("phone")
                 self.info_step = "experience"
                 response = "Perfect! How many years of professional experience do you have? (Please provide just the number)"
             else:
@@ -191,6 +252,7 @@ To get started, could you please tell me your full name?
             try:
                 exp_years = int(re.findall(r'\d+', experience or user_input)[0])
                 self.current_candidate["experience_years"] = exp_years
+                self._autosave("experience_years")
                 self.info_step = "position"
                 response = "Excellent! What position(s) are you interested in? (e.g., Software Engineer, Data Scientist, etc.)"
             except (ValueError, IndexError):
@@ -199,12 +261,14 @@ To get started, could you please tell me your full name?
         elif self.info_step == "position":
             position = user_input.strip()
             self.current_candidate["desired_position"] = position
+            self._autosave("desired_position")
             self.info_step = "location"
             response = "Great choice! What's your current location or preferred work location?"
             
         elif self.info_step == "location":
             location = user_input.strip()
             self.current_candidate["location"] = location
+            self._autosave("location")
             self.conversation_stage = "tech_stack"
             response = self._start_tech_stack_collection()
         else:
@@ -215,6 +279,12 @@ To get started, could you please tell me your full name?
         self._add_to_history("assistant", response)
         return response
     
+    def _autosave(self, *fields: str) -> None:
+        """Patch just-collected fields into the stored record, so progress survives a dropped session"""
+        if self.session_id:
+            self.data_handler.patch_candidate(
+                self.session_id, {field: self.current_candidate[field] for field in fields})
+    
     def _start_tech_stack_collection(self) -> str:
         """Transition to tech stack collection"""
         tech_prompt = f"""
@@ -244,12 +314,12 @@ What technologies do you work with?
             self.current_candidate["tech_stack"] = tech_stack
             self.current_candidate["tech_stack_raw"] = user_input
             
-            # Save candidate info
-            self.data_handler.save_candidate_info(self.current_candidate)
+            self._autosave("tech_stack", "tech_stack_raw")
             
             # Generate technical questions
             questions = self._generate_technical_questions(tech_stack)
             self.current_candidate["technical_questions"] = questions
+            self._autosave("technical_questions")
             
             self.conversation_stage = "technical_questions"
             self.question_index = 0
@@ -291,8 +361,7 @@ Let's start with the first question:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            tech_list = response.text.strip()
+            tech_list = self._generate(prompt, "extract_tech_stack")
             
             if tech_list == "NONE":
                 return []
@@ -339,8 +408,7 @@ Let's start with the first question:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            questions_text = response.text.strip()
+            questions_text = self._generate(prompt, "generate_questions")
             
             # Parse questions
             questions = []
@@ -395,12 +463,11 @@ Thank you for your answer!
     
     def _handle_completion(self, user_input: str) -> str:
         """Handle conversation completion"""
-        # Save final data
-        self.data_handler.update_candidate_responses(
-            self.session_id, 
+        # Save final data (queued as one write-behind patch)
+        self.data_handler.complete_session(
+            self.session_id,
             self.current_candidate.get("technical_responses", {})
         )
-        self.data_handler.mark_session_complete(self.session_id)
         
         completion_message = f"""
 Excellent! That completes our initial screening process. Thank you for taking the time to speak with me today, {self.current_candidate.get('name', 'there')}!
@@ -425,6 +492,7 @@ Thank you for your interest in {COMPANY_NAME}! Have a great day! 🌟
         """.strip()
         
         self._add_to_history("assistant", completion_message)
+        self._save_transcript()
         return completion_message
     
     def process_message(self, user_input: str) -> str:
@@ -437,22 +505,41 @@ Thank you for your interest in {COMPANY_NAME}! Have a great day! 🌟
         Returns:
             Chatbot's response
         """
+        if profiler.remaining and profiler.scope == "turn":
+            return profiler.profile(
+                self._process_message, user_input, scope="turn",
+                session_id=self.session_id or self._metrics_label,
+                stage=self.conversation_stage
+            )
+        return self._process_message(user_input)
+    
+    def _process_message(self, user_input: str) -> str:
+        """Process one turn (see ``process_message``)"""
         if not user_input.strip():
             return "I didn't receive any input. Could you please say something?"
         
-        # Check for exit intent
-        if self._check_exit_intent(user_input):
-            return self._handle_exit()
+        if isinstance(self.model, RecordingModel):
+            self.model.record_turn(self._metrics_label, user_input)
         
-        # Handle based on current conversation stage
-        handler = self.stages.get(self.conversation_stage, self._handle_fallback)
-        return handler(user_input)
+        stage = self.conversation_stage
+        with metrics.timer(f"turn.{stage}"):
+            # Check for exit intent
+            if self._check_exit_intent(user_input):
+                response = self._handle_exit()
+            else:
+                # Handle based on current conversation stage
+                handler = self.stages.get(stage, self._handle_fallback)
+                response = handler(user_input)
+        
+        self._update_memory_gauge()
+        return response
     
     def _handle_exit(self) -> str:
         """Handle user exit request"""
         if self.session_id and self.current_candidate:
             # Save partial data
             self.data_handler.save_candidate_info(self.current_candidate)
+        self._save_transcript()
         
         return f"""
 Thank you for your time with {COMPANY_NAME}'s Hiring Assistant! 
@@ -475,8 +562,7 @@ Have a great day! 👋
         """
         
         try:
-            response = self.model.generate_content(fallback_prompt)
-            fallback_response = response.text.strip()
+            fallback_response = self._generate(fallback_prompt, "fallback")
         except:
             fallback_response = "I'm here to help with your job application. Could you please provide the information I requested?"
         
@@ -499,5 +585,14 @@ Have a great day! 👋
         self.conversation_stage = "greeting"
         self.tech_questions_generated = False
         self.session_id = None
+        self._history_bytes = 0
+        self._transcript_saved = False
+        self._update_memory_gauge()
         if hasattr(self, '_greeted'):
             delattr(self, '_greeted')
+
+
+def _release_session_metrics(label: str) -> None:
+    """Drop a session's gauges once its chatbot is garbage collected"""
+    metrics.add_to_gauge("sessions.active", -1)
+    metrics.remove_gauge("session.memory_bytes", label=label)
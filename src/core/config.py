@@ -48,6 +48,15 @@ TECH_CATEGORIES = {
     ]
 }
 
+# Other spellings of TECH_CATEGORIES names (matched case-insensitively)
+TECH_ALIASES = {
+    "golang": "Go", "js": "JavaScript", "ts": "TypeScript", "cpp": "C++", "csharp": "C#",
+    "reactjs": "React", "react.js": "React", "vue": "Vue.js", "vuejs": "Vue.js", "nextjs": "Next.js",
+    "express": "Express.js", "rails": "Ruby on Rails", "spring": "Spring Boot",
+    "postgres": "PostgreSQL", "mongo": "MongoDB", "mssql": "SQL Server",
+    "k8s": "Kubernetes", "google cloud": "GCP", "sklearn": "Scikit-learn", "spark": "Apache Spark",
+}
+
 # Question Difficulty Levels
 DIFFICULTY_LEVELS = {
     "beginner": "0-2 years experience",
@@ -55,10 +64,81 @@ DIFFICULTY_LEVELS = {
     "advanced": "5+ years experience"
 }
 
+# Experience buckets used by analytics and indexes: name -> [min, max) years
+EXPERIENCE_BUCKETS = {
+    "beginner": (0, 2),
+    "intermediate": (2, 5),
+    "advanced": (5, None)
+}
+
 # Data Storage
 DATA_DIR = "data"
 CANDIDATES_FILE = "candidates.json"
 
+# Storage backend: "json" (single candidates.json), "log" (append-only
+# change log rebuilt in memory at startup, compacted in the background)
+# "sqlite" (indexed SQLite database in WAL mode), "partitioned" (per-day or
+# per-week files under data/partitions) or "memory" (tests, benchmarks)
+STORAGE_BACKEND = os.getenv("TALENTSCOUT_STORAGE", "json")
+SQLITE_FILE = "candidates.db"
+PARTITIONS_DIR = "partitions"
+PARTITION_GRANULARITY = os.getenv("TALENTSCOUT_PARTITION_BY", "day")  # "day" or "week"
+LOG_COMPACT_THRESHOLD = 5000  # Log entries between background compactions
+LOG_FSYNC = os.getenv("TALENTSCOUT_LOG_FSYNC", "false").lower() in ("1", "true", "yes")
+
+# Candidate ids: keyed BLAKE2b of the normalized email, CANDIDATE_ID_BYTES
+# wide (8 bytes = 16 hex characters). Existing candidates are found by email,
+# so changing the key only changes the ids of new candidates
+CANDIDATE_ID_BYTES = 8
+CANDIDATE_ID_KEY = os.getenv("TALENTSCOUT_ID_KEY", "")
+
+# Candidates per page for paginated listings (sidebar, dashboards)
+CANDIDATE_PAGE_SIZE = 50
+
+# Read cache: keep all records plus running counts in memory, reloading only
+# when the store's version changes (e.g. another worker wrote)
+READ_CACHE = os.getenv("TALENTSCOUT_READ_CACHE", "true").lower() in ("1", "true", "yes")
+# Stores larger than this on disk (MB) are not cached; reads stream from the engine instead
+READ_CACHE_MAX_MB = int(os.getenv("TALENTSCOUT_READ_CACHE_MAX_MB", "256"))
+
+# Email index: an SQLite email -> id table shared by every worker, updated on
+# every save, so saves resolve a returning candidate's id without a scan
+EMAIL_INDEX_FILE = "emails.db"
+
+# Full-text search: an SQLite FTS5 index over tech stacks and interview
+# answers, updated on every save
+SEARCH_INDEX = os.getenv("TALENTSCOUT_SEARCH_INDEX", "true").lower() in ("1", "true", "yes")
+SEARCH_INDEX_FILE = "search.db"
+
+# Skill index: in-memory bitmaps per technology, position, experience year
+# and completion for multi-criteria filters; snapshot written on shutdown
+SKILL_INDEX = os.getenv("TALENTSCOUT_SKILL_INDEX", "true").lower() in ("1", "true", "yes")
+SKILL_INDEX_FILE = "skill_index.npz"
+
+# Dashboard snapshot: an immutable columnar copy of the store that readers
+# memory-map, republished in the background when the store has changed.
+# Analytics read it instead of the store with TALENTSCOUT_ANALYTICS_SOURCE=snapshot
+SNAPSHOT_FILE = "dashboard_snapshot.bin"
+SNAPSHOT_INTERVAL_SECONDS = 60
+ANALYTICS_SOURCE = os.getenv("TALENTSCOUT_ANALYTICS_SOURCE", "store")  # "store" or "snapshot"
+
+# Write-behind: completion writes are queued, coalesced per candidate and
+# flushed by a background thread when the queue fills or the interval elapses
+WRITE_BEHIND = os.getenv("TALENTSCOUT_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+WRITE_BEHIND_MAX_PENDING = 100  # Candidates queued before an early flush
+WRITE_BEHIND_FLUSH_SECONDS = 0.5
+
+# Conversation transcripts: each session's full history, compressed into its
+# own file under data/transcripts when it completes or the candidate leaves.
+# "gzip" (default) or "zstd" (requires the zstandard package)
+TRANSCRIPTS_DIR = "transcripts"
+TRANSCRIPT_CODEC = os.getenv("TALENTSCOUT_TRANSCRIPT_CODEC", "gzip")
+
+# Privacy jobs: bulk anonymize/purge requests run in batches, with a
+# checkpoint under data/privacy_jobs after each batch so they can resume
+PRIVACY_BATCH_SIZE = 500
+PRIVACY_JOBS_DIR = "privacy_jobs"
+
 # UI Configuration
 SIDEBAR_WIDTH = 300
 CHAT_HEIGHT = 400
@@ -67,3 +147,20 @@ CHAT_HEIGHT = 400
 MODEL_NAME = "gemini-1.5-flash"  # Updated to current available model
 MAX_TOKENS = 1000
 TEMPERATURE = 0.7
+
+# LLM Backend Mode: "live" (Gemini), "record" (Gemini + cassette),
+# "replay" (cassette only, no network) or "stub" (offline test model)
+LLM_MODE = os.getenv("TALENTSCOUT_LLM_MODE", "live")
+LLM_CASSETTE = os.getenv("TALENTSCOUT_CASSETTE", os.path.join(DATA_DIR, "cassettes", "llm_cassette.jsonl"))
+LLM_REPLAY_LATENCY_SCALE = float(os.getenv("TALENTSCOUT_REPLAY_LATENCY_SCALE", "1.0"))
+
+# Admin / Monitoring
+# Set TALENTSCOUT_ADMIN=true to expose the performance dashboard in the sidebar
+ADMIN_MODE = os.getenv("TALENTSCOUT_ADMIN", "false").lower() in ("1", "true", "yes")
+PERF_DASHBOARD_REFRESH_SECONDS = 5
+
+# On-demand Profiling
+# TALENTSCOUT_PROFILE_TURNS=N profiles the next N turns (or reruns) after startup
+PROFILES_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_TURNS = int(os.getenv("TALENTSCOUT_PROFILE_TURNS", "0"))
+PROFILE_SCOPE = os.getenv("TALENTSCOUT_PROFILE_SCOPE", "turn")  # "turn" or "rerun"
@@ -3,51 +3,129 @@ Data handling utilities for TalentScout Hiring Assistant
 Manages candidate information storage and retrieval
 """
 
-import json
 import os
-import hashlib
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime
+from typing import Collection, Dict, Iterator, List, Optional, Any, Tuple
 import pandas as pd
-from .config import DATA_DIR, CANDIDATES_FILE
+from .config import (CANDIDATE_PAGE_SIZE, DATA_DIR, CANDIDATES_FILE, STORAGE_BACKEND, TRANSCRIPT_CODEC,
+                     TRANSCRIPTS_DIR, WRITE_BEHIND)
+from .candidate_ids import candidate_id
+from .data_quality import QualityReport, apply_fixes, scan_quality
+from .analytics import CandidateAnalytics, get_analytics
+from .export import ExportJob, date_bound, export_candidates
+from .performance_optimizer import metrics
+from .privacy_manager import PrivacyManager, anonymized_fields
+from .storage.records import matches_filters, project
+from .storage import (CandidateSnapshot, SkillIndex, candidate_stage, count_candidates, get_index,
+                      get_snapshot_publisher, get_store, get_write_buffer, read_snapshot_header,
+                      release_store, TranscriptStore)
 
 
 class DataHandler:
     """Handles secure storage and retrieval of candidate data"""
     
-    def __init__(self):
-        self.data_dir = DATA_DIR
+    def __init__(self, data_dir: str = None, backend: str = None, write_behind: bool = None):
+        self.data_dir = data_dir or DATA_DIR
         self.candidates_file = os.path.join(self.data_dir, CANDIDATES_FILE)
+        self.backend = backend or STORAGE_BACKEND
         self._ensure_data_directory()
+        self.storage = get_store(self.backend, self.data_dir)
+        use_write_behind = WRITE_BEHIND if write_behind is None else write_behind
+        self.write_buffer = get_write_buffer(self.backend, self.data_dir) if use_write_behind else None
+        self.transcripts = TranscriptStore(os.path.join(self.data_dir, TRANSCRIPTS_DIR), TRANSCRIPT_CODEC)
+        self.privacy = PrivacyManager(self)
     
     def _ensure_data_directory(self) -> None:
         """Create data directory if it doesn't exist"""
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
-    def _load_candidates(self) -> List[Dict]:
-        """Load existing candidate data from JSON file"""
-        if not os.path.exists(self.candidates_file):
-            return []
+    def iter_candidates(self, start_date=None, end_date=None) -> Iterator[Dict]:
+        """
+        Stream candidate records from the storage backend, including queued changes
         
-        try:
-            with open(self.candidates_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+        With a date range, time-partitioned engines only read the partitions
+        it overlaps; other records outside the range may still be yielded.
+        """
+        if start_date or end_date:
+            records = self.storage.scan_range(date_bound(start_date), date_bound(end_date, end=True))
+        else:
+            records = self.storage.scan()
+        if self.write_buffer:
+            records = self.write_buffer.overlay_all(records)
+        return iter(records)
+    
+    def _load_candidates(self) -> List[Dict]:
+        """Load all candidate records from the storage backend"""
+        return list(self.iter_candidates())
     
     def _save_candidates(self, candidates: List[Dict]) -> None:
-        """Save candidate data to JSON file"""
-        try:
-            with open(self.candidates_file, 'w', encoding='utf-8') as f:
-                json.dump(candidates, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving candidate data: {e}")
+        """Replace all candidate records in the storage backend"""
+        self.flush_pending_writes()
+        self.storage.replace_all(candidates)
+    
+    def flush_pending_writes(self) -> None:
+        """Write queued changes now so a direct write cannot be overtaken by older ones"""
+        if self.write_buffer and self.write_buffer.pending_count():
+            self.write_buffer.flush()
+    
+    def data_version(self) -> Any:
+        """Token that changes on every write, queued or stored; None if unknown"""
+        version = self.storage.version()
+        if version is None:
+            return None
+        return version, self.write_buffer.enqueued if self.write_buffer else 0
+    
+    def candidate_snapshot(self) -> CandidateSnapshot:
+        """
+        Memory-mapped, read-only columnar snapshot for dashboards
+        
+        Republished in the background while the store changes; call
+        ``refresh()`` on the returned view to pick up a newer one. Published
+        right away if there is none yet (or only one in an older format).
+        """
+        publisher = get_snapshot_publisher(self.backend, self.data_dir)
+        if read_snapshot_header(publisher.path) is None:
+            self.flush_pending_writes()
+            publisher.publish_if_changed()
+        return CandidateSnapshot(publisher.path)
     
-    def generate_candidate_id(self, email: str) -> str:
-        """Generate unique candidate ID based on email hash"""
-        return hashlib.md5(email.lower().encode()).hexdigest()[:8]
+    def get_analytics(self) -> CandidateAnalytics:
+        """Cached recruiter analytics over this store (skills, experience, completion)"""
+        return get_analytics(self)
     
+    def close(self) -> None:
+        """Release the shared store for this data directory (tools and tests)"""
+        release_store(self.backend, self.data_dir)
+    
+    def generate_candidate_id(self, email: str, attempt: int = 0) -> str:
+        """Generate candidate ID from a keyed hash of the email (64 bits by default)"""
+        return candidate_id(email, attempt)
+    
+    def find_candidate_id(self, email: str) -> Optional[str]:
+        """ID of the stored candidate with this email (legacy or current scheme), or None"""
+        return get_index(self.backend, self.data_dir, "emails").lookup(email)
+    
+    def resolve_candidate_id(self, email: str) -> str:
+        """
+        ID to save a candidate with this email under
+        
+        The existing record's ID if there is one, otherwise a new ID that no
+        other candidate holds, so two people are never merged into one record.
+        """
+        emails = get_index(self.backend, self.data_dir, "emails")
+        existing = emails.lookup(email)
+        if existing is not None:
+            return existing
+        attempt = 0
+        new_id = self.generate_candidate_id(email)
+        # Taken by another email, e.g. this address before it was anonymized
+        while emails.has_id(new_id):
+            attempt += 1
+            new_id = self.generate_candidate_id(email, attempt)
+        return new_id
+    
+    @metrics.timed("storage.save_candidate_info")
     def save_candidate_info(self, candidate_data: Dict[str, Any]) -> bool:
         """
         Save candidate information securely
@@ -59,84 +137,221 @@ class DataHandler:
             bool: Success status
         """
         try:
-            candidates = self._load_candidates()
-            
             # Add metadata
-            candidate_data['id'] = self.generate_candidate_id(candidate_data.get('email', ''))
+            self.flush_pending_writes()
+            candidate_data['id'] = self.resolve_candidate_id(candidate_data.get('email', ''))
             candidate_data['timestamp'] = datetime.now().isoformat()
             candidate_data['session_completed'] = False
             
-            # Check if candidate already exists
-            existing_index = -1
-            for i, candidate in enumerate(candidates):
-                if candidate.get('id') == candidate_data['id']:
-                    existing_index = i
-                    break
-            
-            if existing_index >= 0:
-                # Update existing candidate
-                candidates[existing_index].update(candidate_data)
-            else:
-                # Add new candidate
-                candidates.append(candidate_data)
-            
-            self._save_candidates(candidates)
+            # Insert, or merge into the existing record with the same email
+            self.storage.upsert(candidate_data)
             return True
             
         except Exception as e:
             print(f"Error saving candidate info: {e}")
             return False
     
+    @metrics.timed("storage.get_candidate_info")
     def get_candidate_info(self, candidate_id: str) -> Optional[Dict]:
         """Retrieve candidate information by ID"""
-        candidates = self._load_candidates()
-        for candidate in candidates:
-            if candidate.get('id') == candidate_id:
-                return candidate
-        return None
+        record = self.storage.get(candidate_id)
+        return self.write_buffer.overlay(record) if self.write_buffer else record
     
+    @metrics.timed("storage.patch_candidate")
+    def patch_candidate(self, candidate_id: str, fields: Dict[str, Any],
+                        merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        """
+        Set a few fields of an existing candidate, leaving the rest of the record untouched
+
+        The change is applied as one atomic patch; backends that support it
+        write only the changed fields. With write-behind enabled it is queued
+        and coalesced with other pending changes for the candidate.
+
+        Args:
+            candidate_id: Id of the candidate to update
+            fields: Field -> new value
+            merge_fields: Field -> entries merged into the dict it holds
+
+        Returns:
+            bool: Success status
+        """
+        try:
+            set_fields = {**fields, 'last_updated': datetime.now().isoformat()}
+            if self.write_buffer:
+                self.write_buffer.enqueue(candidate_id, set_fields, merge_fields)
+            else:
+                self.storage.patch(candidate_id, set_fields, merge_fields)
+            return True
+
+        except Exception as e:
+            print(f"Error patching candidate: {e}")
+            return False
+
+    @metrics.timed("storage.update_candidate_responses")
     def update_candidate_responses(self, candidate_id: str, responses: Dict[str, str]) -> bool:
         """Update candidate's technical question responses"""
         try:
-            candidates = self._load_candidates()
-            
-            for candidate in candidates:
-                if candidate.get('id') == candidate_id:
-                    if 'technical_responses' not in candidate:
-                        candidate['technical_responses'] = {}
-                    candidate['technical_responses'].update(responses)
-                    candidate['last_updated'] = datetime.now().isoformat()
-                    break
-            
-            self._save_candidates(candidates)
+            self.flush_pending_writes()
+            self.storage.patch(
+                candidate_id,
+                set_fields={'last_updated': datetime.now().isoformat()},
+                merge_fields={'technical_responses': responses}
+            )
             return True
             
         except Exception as e:
             print(f"Error updating responses: {e}")
             return False
     
+    @metrics.timed("storage.mark_session_complete")
     def mark_session_complete(self, candidate_id: str) -> bool:
         """Mark candidate session as completed"""
         try:
-            candidates = self._load_candidates()
+            self.flush_pending_writes()
+            self.storage.patch(candidate_id, set_fields={
+                'session_completed': True,
+                'completion_time': datetime.now().isoformat()
+            })
+            return True
             
-            for candidate in candidates:
-                if candidate.get('id') == candidate_id:
-                    candidate['session_completed'] = True
-                    candidate['completion_time'] = datetime.now().isoformat()
-                    break
+        except Exception as e:
+            print(f"Error marking session complete: {e}")
+            return False
+    
+    @metrics.timed("storage.complete_session")
+    def complete_session(self, candidate_id: str, responses: Dict[str, str]) -> bool:
+        """
+        Persist final responses and mark the session complete as one write
+        
+        With write-behind enabled the change is queued and flushed in the
+        background, so the completion turn does not wait on disk.
+        """
+        try:
+            now = datetime.now().isoformat()
+            set_fields = {'last_updated': now, 'session_completed': True, 'completion_time': now}
+            merge_fields = {'technical_responses': responses}
+            if self.write_buffer:
+                self.write_buffer.enqueue(candidate_id, set_fields, merge_fields)
+            else:
+                self.storage.patch(candidate_id, set_fields, merge_fields)
+            return True
             
-            self._save_candidates(candidates)
+        except Exception as e:
+            print(f"Error completing session: {e}")
+            return False
+    
+    def save_transcript(self, candidate_id: str, messages: List[Dict[str, Any]]) -> bool:
+        """Store a session's full conversation history, compressed, outside the candidate record"""
+        try:
+            self.transcripts.save(candidate_id, messages)
             return True
             
         except Exception as e:
-            print(f"Error marking session complete: {e}")
+            print(f"Error saving transcript: {e}")
             return False
     
+    def get_transcript(self, candidate_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Messages of a candidate's stored transcript (read from disk on each call), or None"""
+        document = self.transcripts.load(candidate_id)
+        return document['messages'] if document else None
+    
+    @metrics.timed("storage.get_all_candidates")
     def get_all_candidates(self) -> List[Dict]:
         """Retrieve all candidate records"""
         return self._load_candidates()
     
+    @metrics.timed("storage.get_candidates_page")
+    def get_candidates_page(self, cursor: Optional[str] = None, page_size: int = CANDIDATE_PAGE_SIZE,
+                            fields: Optional[Collection[str]] = None,
+                            filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of candidates in ID order
+        
+        Args:
+            cursor: Opaque cursor from the previous page (None for the first)
+            page_size: Records per page
+            fields: Fields to return besides ``id`` (all if None)
+            filters: ``{field: value}`` equality filters; a list, tuple or set
+                value accepts any of its members
+            
+        Returns:
+            (records, next_cursor): next_cursor is None on the last page
+        """
+        # One extra record tells whether another page follows
+        limit = page_size + 1
+        pending = set(self.write_buffer.pending_ids()) if self.write_buffer else set()
+        if pending:
+            records = self._page_with_pending(cursor, limit, fields, filters, pending)
+        else:
+            records = self.storage.scan_page(cursor, limit, fields, filters)
+        next_cursor = records[page_size - 1]['id'] if len(records) > page_size else None
+        return records[:page_size], next_cursor
+    
+    def _page_with_pending(self, cursor: Optional[str], limit: int, fields: Optional[Collection[str]],
+                           filters: Optional[Dict[str, Any]], pending: Collection[str]) -> List[Dict]:
+        """
+        ``scan_page`` with queued changes merged in, without flushing them
+        
+        Queued changes (e.g. a completion) can move a record into or out of
+        the filters, so queued records are matched from the store plus their
+        overlay and the engine's copies of them are dropped.
+        """
+        queued = []
+        for candidate_id in pending:
+            if cursor is None or candidate_id > cursor:
+                record = self.write_buffer.overlay(self.storage.get(candidate_id))
+                if record is not None and matches_filters(record, filters):
+                    queued.append(project(record, fields))
+        records: List[Dict] = []
+        after = cursor
+        while True:
+            batch = self.storage.scan_page(after, limit, fields, filters)
+            records.extend(record for record in batch if record['id'] not in pending)
+            if len(batch) < limit or len(records) >= limit:
+                break
+            after = batch[-1]['id']
+        if len(batch) == limit:
+            # The store has more past this batch; later queued records belong to later pages
+            queued = [record for record in queued if record['id'] <= batch[-1]['id']]
+        return sorted(records + queued, key=lambda record: record['id'])[:limit]
+    
+    def iter_candidate_pages(self, page_size: int = CANDIDATE_PAGE_SIZE,
+                             fields: Optional[Collection[str]] = None,
+                             filters: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict]]:
+        """Stream every matching candidate page by page, holding one page at a time"""
+        cursor = None
+        while True:
+            records, cursor = self.get_candidates_page(cursor, page_size, fields, filters)
+            if records:
+                yield records
+            if cursor is None:
+                return
+    
+    @metrics.timed("storage.get_candidate_counts")
+    def get_candidate_counts(self) -> Dict[str, Any]:
+        """
+        Total, completed and per-stage candidate counts
+        
+        O(1) with the read cache enabled (counts are maintained on every
+        write); otherwise computed with one scan.
+        """
+        counts_fn = getattr(self.storage, 'counts', None)
+        counts = counts_fn() if counts_fn else count_candidates(self.storage.scan())
+        if not self.write_buffer:
+            return counts
+        
+        # Account for queued completions not yet flushed to the store
+        stages = dict(counts['stages'])
+        for candidate_id in self.write_buffer.pending_ids():
+            stored = self.storage.get(candidate_id)
+            if stored is None:
+                continue
+            before, after = candidate_stage(stored), candidate_stage(self.write_buffer.overlay(stored))
+            stages[before] = stages.get(before, 0) - 1
+            stages[after] = stages.get(after, 0) + 1
+        return {'total': counts['total'], 'completed': stages.get("completion", 0),
+                'stages': {stage: n for stage, n in stages.items() if n}}
+    
     def get_candidates_summary(self) -> pd.DataFrame:
         """Get summary statistics of candidates"""
         candidates = self._load_candidates()
@@ -147,42 +362,75 @@ class DataHandler:
         return df[['name', 'email', 'experience_years', 'desired_position', 
                   'tech_stack', 'session_completed', 'timestamp']]
     
+    def search_candidates(self, query: str, limit: int = 20, match_all: bool = True) -> List[Dict]:
+        """
+        Ranked keyword search over tech stacks, positions and interview answers
+        
+        Args:
+            match_all: Require every keyword; otherwise candidates matching any rank
+            
+        Returns:
+            list: Candidate records, best match first, with ``search_score`` and ``search_snippet``
+        """
+        index = get_index(self.backend, self.data_dir, "search")
+        if index is None:
+            raise RuntimeError("Full-text search is disabled (TALENTSCOUT_SEARCH_INDEX) "
+                               "or SQLite lacks FTS5")
+        results = []
+        for hit in index.search(query, limit=limit, match_all=match_all):
+            candidate = self.get_candidate_info(hit.candidate_id)
+            if candidate is not None:
+                results.append({**candidate, 'search_score': hit.score, 'search_snippet': hit.snippet})
+        return results
+    
+    def filter_candidate_ids(self, skills: List[str] = (), positions: List[str] = (),
+                             min_experience: int = None, max_experience: int = None,
+                             levels: List[str] = (), completed: Optional[bool] = None) -> List[str]:
+        """
+        Ids of candidates matching every criterion, via bitmap intersections
+        
+        Args:
+            skills: Technologies the candidate must all list (names from ``TECH_CATEGORIES``)
+            positions: Desired positions, any of which matches
+            min_experience, max_experience: Inclusive range of whole years
+            levels: ``EXPERIENCE_BUCKETS`` names, any of which matches
+            completed: Only completed (True) or unfinished (False) interviews
+        """
+        # Queued completion writes must be in the store (and so in the index)
+        self.flush_pending_writes()
+        index = get_index(self.backend, self.data_dir, "skills")
+        if index is None:
+            # Index disabled: same semantics over a throwaway index built from a scan
+            index = SkillIndex()
+            index.rebuild(self.iter_candidates())
+        return index.filter(skills=skills, positions=positions, min_experience=min_experience,
+                            max_experience=max_experience, levels=levels, completed=completed)
+    
+    def filter_candidates(self, **criteria) -> List[Dict]:
+        """Candidate records matching ``criteria`` (see ``filter_candidate_ids``)"""
+        records = (self.get_candidate_info(candidate_id)
+                   for candidate_id in self.filter_candidate_ids(**criteria))
+        return [record for record in records if record is not None]
+    
+    @metrics.timed("storage.anonymize_candidate_data")
     def anonymize_candidate_data(self, candidate_id: str) -> bool:
         """Anonymize sensitive candidate information"""
         try:
-            candidates = self._load_candidates()
-            
-            for candidate in candidates:
-                if candidate.get('id') == candidate_id:
-                    # Replace sensitive data with anonymized versions
-                    candidate['name'] = f"Candidate_{candidate_id}"
-                    candidate['email'] = f"candidate_{candidate_id}@anonymous.com"
-                    candidate['phone'] = "XXX-XXX-XXXX"
-                    candidate['anonymized'] = True
-                    candidate['anonymized_date'] = datetime.now().isoformat()
-                    break
-            
-            self._save_candidates(candidates)
+            # Replace sensitive data with anonymized versions
+            self.flush_pending_writes()
+            self.storage.patch(candidate_id, set_fields=anonymized_fields(candidate_id))
+            self.transcripts.delete_many([candidate_id])
             return True
             
         except Exception as e:
             print(f"Error anonymizing data: {e}")
             return False
     
+    @metrics.timed("storage.cleanup_old_sessions")
     def cleanup_old_sessions(self, days_old: int = 30) -> int:
         """Remove candidate data older than specified days"""
         try:
-            candidates = self._load_candidates()
-            cutoff_date = datetime.now() - timedelta(days=days_old)
-            
-            initial_count = len(candidates)
-            candidates = [
-                candidate for candidate in candidates
-                if datetime.fromisoformat(candidate.get('timestamp', datetime.now().isoformat())) > cutoff_date
-            ]
-            
-            self._save_candidates(candidates)
-            return initial_count - len(candidates)
+            return self.privacy.apply_retention(days_old)
             
         except Exception as e:
             print(f"Error cleaning up old sessions: {e}")
@@ -223,17 +471,58 @@ class DataHandler:
         
         return len(errors) == 0, errors
     
+    def check_data_quality(self, fix: bool = False) -> QualityReport:
+        """
+        Check every stored candidate's email, phone and experience in bulk
+        
+        Same rules as ``validate_candidate_data``, vectorized over the whole
+        store. With ``fix``, values that only need normalizing (whitespace and
+        domain case of emails, phone formatting, experience stored as text)
+        are written back; the rest is only reported.
+        """
+        self.flush_pending_writes()
+        version = self.storage.version()
+        report = scan_quality(self.storage.scan())
+        report.version = version
+        return apply_fixes(self, report) if fix else report
+    
+    def _export_path(self, fmt: str) -> str:
+        return os.path.join(self.data_dir, f"candidates_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}")
+    
+    @metrics.timed("storage.export_candidates")
+    def export_candidates(self, filepath: str = None, fmt: str = "csv", columns: List[str] = None,
+                          start_date=None, end_date=None, completed_only: bool = False) -> int:
+        """
+        Stream candidates to a CSV or Parquet file in fixed-size chunks
+        
+        Args:
+            columns: Fields to export (defaults to the summary columns)
+            start_date, end_date: Inclusive ``timestamp`` range (date, datetime or ISO string);
+                a date-only end covers that whole day
+            completed_only: Only export completed interviews
+            
+        Returns:
+            int: Number of rows written
+        """
+        return export_candidates(self.iter_candidates(start_date, end_date), filepath or self._export_path(fmt),
+                                 fmt=fmt, columns=columns, start_date=start_date,
+                                 end_date=end_date, completed_only=completed_only)
+    
+    def start_export(self, filepath: str = None, fmt: str = "csv", columns: List[str] = None,
+                     start_date=None, end_date=None, completed_only: bool = False) -> ExportJob:
+        """Run ``export_candidates`` on a background thread; poll the returned job for progress"""
+        return ExportJob(self.iter_candidates(start_date, end_date), filepath or self._export_path(fmt),
+                         total=self.storage.count(), fmt=fmt, columns=columns,
+                         start_date=start_date, end_date=end_date, completed_only=completed_only)
+    
+    @metrics.timed("storage.export_candidates_csv")
     def export_candidates_csv(self, filepath: str = None) -> str:
         """Export candidate data to CSV file"""
         try:
-            df = self.get_candidates_summary()
-            if df.empty:
+            filepath = filepath or self._export_path("csv")
+            if not self.export_candidates(filepath):
+                os.remove(filepath)
                 return "No candidate data to export"
-            
-            if not filepath:
-                filepath = os.path.join(self.data_dir, f"candidates_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-            
-            df.to_csv(filepath, index=False)
             return f"Data exported to: {filepath}"
             
         except Exception as e:
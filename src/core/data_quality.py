@@ -0,0 +1,245 @@
+"""
+Bulk data-quality checks for TalentScout Hiring Assistant
+Validates and normalizes emails, phones and experience over the whole store
+
+The rules are those of ``DataHandler.validate_candidate_data``,
+``is_valid_email`` and ``format_phone_number``, run as vectorized pandas
+string operations over one column at a time instead of per record.
+
+Usage:
+    python -m src.core.data_quality --data-dir data --backend json          # report
+    python -m src.core.data_quality --data-dir data --backend json --fix    # normalize
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import DATA_DIR, STORAGE_BACKEND
+from .performance_optimizer import metrics
+
+QUALITY_FIELDS = ['email', 'phone', 'experience_years']
+MAX_EXPERIENCE_YEARS = 50
+MIN_PHONE_DIGITS = 10
+SCAN_CHUNK_SIZE = 100_000  # Records checked per vectorized pass; bounds memory
+
+# format_phone_number's output for 10 digits
+_PHONE_FORMAT = r"\(\d{3}\) \d{3}-\d{4}"
+
+# Issue kinds; only "not_normalized" comes with a corrected value
+ISSUES = ("missing", "invalid", "out_of_range", "not_normalized")
+
+
+@dataclass
+class QualityReport:
+    """Result of a scan: one row per problem found, plus how many were fixed"""
+    scanned: int
+    issues: pd.DataFrame  # id, field, issue, value, fixed_value
+    fixed: int = 0
+    skipped: List[str] = field(default_factory=list)  # Ids changed since the scan, left as they are
+    version: Any = None  # Store version the scan read; None if unknown
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """``{field: {issue: count}}``"""
+        counts = self.issues.groupby(['field', 'issue'], observed=True).size()
+        summary: Dict[str, Dict[str, int]] = {}
+        for (name, issue), count in counts.items():
+            summary.setdefault(name, {})[issue] = int(count)
+        return summary
+
+    @property
+    def fixable(self) -> pd.DataFrame:
+        return self.issues[self.issues['issue'] == "not_normalized"]
+
+
+def quality_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """The checked fields of ``records`` as columns (object dtype, values as stored)"""
+    return pd.DataFrame({name: [record.get(name) for record in records]
+                         for name in ['id', 'anonymized'] + QUALITY_FIELDS}, dtype=object)
+
+
+def _blank(text: pd.Series) -> pd.Series:
+    return text.isna() | (text.str.strip() == "")
+
+
+def _label(conditions: List[Any], labels: List[str], index: pd.Index) -> pd.Series:
+    """First matching label per row, None where no condition holds (NA counts as False)"""
+    masks = [condition.fillna(False).to_numpy(dtype=bool) if isinstance(condition, pd.Series)
+             else condition for condition in conditions]
+    return pd.Series(np.select(masks, labels, None), index=index)
+
+
+def _issues(frame: pd.DataFrame, name: str, issue: pd.Series, fixed: pd.Series) -> pd.DataFrame:
+    """Rows of one field's issue table from per-record issue labels (None = fine) and fixes"""
+    found = issue.notna()
+    return pd.DataFrame({
+        'id': frame.loc[found, 'id'],
+        'field': name,
+        'issue': issue[found],
+        'value': frame.loc[found, name],
+        'fixed_value': fixed[found].astype(object).where(issue[found] == "not_normalized", None),
+    })
+
+
+def check_emails(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Missing emails, and emails ``is_valid_email`` rejects
+
+    Surrounding whitespace and capitals in the domain are normalized; the
+    local part is left as it is, since it may be case-sensitive.
+    """
+    text = frame['email'].astype("string")
+    # is_valid_email: an "@", and a "." between the first "@" and the next one
+    valid = text.str.split("@").str[1].str.contains(".", regex=False).fillna(False).astype(bool)
+    local, at, domain = (column for _, column in text.str.strip().str.rpartition("@").items())
+    normalized = local + at + domain.str.lower()
+    issue = _label([_blank(text), ~valid, normalized != text],
+                   ["missing", "invalid", "not_normalized"], frame.index)
+    return _issues(frame, 'email', issue, normalized)
+
+
+def check_phones(frame: pd.DataFrame) -> pd.DataFrame:
+    """Phones with fewer than 10 digits; 10-digit numbers are formatted as (555) 123-4567"""
+    text = frame['phone'].astype("string")
+    # Most phones are already formatted; only the others are parsed
+    formatted_already = text.str.fullmatch(_PHONE_FORMAT).fillna(False).to_numpy(dtype=bool)
+    frame, text = frame[~formatted_already], text[~formatted_already]
+    digits = text.str.replace(r"\D", "", regex=True)
+    length = digits.str.len()
+    formatted = ("(" + digits.str[:3] + ") " + digits.str[3:6] + "-" + digits.str[6:]).where(length == 10)
+    issue = _label([_blank(text), length < MIN_PHONE_DIGITS, formatted.notna() & (formatted != text)],
+                   ["missing", "invalid", "not_normalized"], frame.index)
+    return _issues(frame, 'phone', issue, formatted)
+
+
+def check_experience(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Experience that is not a number of years between 0 and 50
+
+    Text holding a number ("5", "5 years") is stored as that number, and
+    whole floats as an int, like the chatbot stores them.
+    """
+    raw = frame['experience_years']
+    kind = raw.map(type)
+    is_text = (kind == str).to_numpy()
+    value = pd.Series(np.nan, index=frame.index)
+    is_number = kind.isin((int, float)).to_numpy()  # Not bool
+    value[is_number] = raw[is_number].astype(float)
+    blank = raw.isna().to_numpy(copy=True)
+    if is_text.any():
+        text = raw[is_text].astype("string")
+        value[is_text] = pd.to_numeric(text.str.extract(r"(\d+(?:\.\d+)?)")[0], errors="coerce").to_numpy()
+        blank[is_text] = (text.str.strip() == "").to_numpy()
+    whole = value == value.round()
+    issue = _label([blank, value.isna(), ~value.between(0, MAX_EXPERIENCE_YEARS),
+                    is_text | (whole & (kind == float)).to_numpy()],
+                   ["missing", "invalid", "out_of_range", "not_normalized"], frame.index)
+    fixable = (issue == "not_normalized").to_numpy()
+    fixed = pd.Series(None, index=frame.index, dtype=object)
+    fixed[fixable] = [int(years) if years == round(years) else years
+                      for years in value[fixable].tolist()]
+    return _issues(frame, 'experience_years', issue, fixed)
+
+
+_CHECKS = {'email': check_emails, 'phone': check_phones, 'experience_years': check_experience}
+
+
+@metrics.timed("data_quality.scan")
+def scan_quality(records: Iterable[Dict[str, Any]], fields: List[str] = None) -> QualityReport:
+    """
+    Check every record; anonymized records are only checked for experience
+
+    Records are checked ``SCAN_CHUNK_SIZE`` at a time, so a scan of any size
+    holds one chunk plus the issues found.
+
+    Returns:
+        QualityReport: Issues in store order per chunk, by field within a chunk
+    """
+    tables = [pd.DataFrame(columns=['id', 'field', 'issue', 'value', 'fixed_value'])]
+    scanned = 0
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, SCAN_CHUNK_SIZE))
+        if not chunk:
+            break
+        scanned += len(chunk)
+        frame = quality_frame(chunk)
+        anonymized = frame['anonymized'].fillna(False).astype(bool)
+        for name in fields or QUALITY_FIELDS:
+            tables.append(_CHECKS[name](frame[~anonymized] if name in ('email', 'phone') else frame))
+    issues = pd.concat(tables, ignore_index=True)
+    issues['issue'] = pd.Categorical(issues['issue'], categories=ISSUES)
+    return QualityReport(scanned=scanned, issues=issues)
+
+
+@metrics.timed("data_quality.fix")
+def apply_fixes(data_handler, report: QualityReport) -> QualityReport:
+    """
+    Write the normalized values of ``report`` back in one ``patch_many``
+
+    A field is only rewritten if it still holds the value that was scanned.
+    If the store changed since the scan, current values are checked in one
+    streaming pass; records changed in the meantime are listed in
+    ``report.skipped``.
+    """
+    fixable = report.fixable
+    by_id: Dict[str, Dict[str, tuple]] = {}
+    for candidate_id, name, value, fixed_value in zip(fixable['id'], fixable['field'],
+                                                      fixable['value'], fixable['fixed_value']):
+        by_id.setdefault(candidate_id, {})[name] = (value, fixed_value)
+
+    data_handler.flush_pending_writes()
+    storage = data_handler.storage
+    current: Optional[Dict[str, Dict[str, Any]]] = None
+    if report.version is None or storage.version() != report.version:
+        current = {record['id']: record for record in storage.scan() if record.get('id') in by_id}
+
+    patches = {}
+    for candidate_id, fields in by_id.items():
+        changes = {name: fixed_value for name, (value, fixed_value) in fields.items()
+                   if current is None or current.get(candidate_id, {}).get(name) == value}
+        if len(changes) < len(fields):
+            report.skipped.append(candidate_id)
+        if changes:
+            patches[candidate_id] = (changes, {})
+    if patches:
+        storage.patch_many(patches)
+    report.fixed = sum(len(changes) for changes, _ in patches.values())
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI: report (and optionally normalize) malformed emails, phones and experience"""
+    from .data_handler import DataHandler
+
+    parser = argparse.ArgumentParser(description="Check stored candidates for malformed fields")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--backend", default=STORAGE_BACKEND)
+    parser.add_argument("--fix", action="store_true", help="Write normalized values back")
+    parser.add_argument("--show", type=int, default=10, help="Example issues to print per field")
+    args = parser.parse_args(argv)
+
+    handler = DataHandler(data_dir=args.data_dir, backend=args.backend, write_behind=False)
+    try:
+        report = handler.check_data_quality(fix=args.fix)
+    finally:
+        handler.close()
+    print(f"Scanned {report.scanned} candidates")
+    for name, counts in report.summary().items():
+        print(f"  {name}: " + ", ".join(f"{issue} {count}" for issue, count in counts.items()))
+        examples = report.issues[report.issues['field'] == name].head(args.show)
+        for row in examples.itertuples(index=False):
+            fix = f" -> {row.fixed_value!r}" if row.issue == "not_normalized" else ""
+            print(f"    {row.id}: {row.issue} {row.value!r}{fix}")
+    if args.fix:
+        print(f"Fixed {report.fixed} value(s)" + (f", skipped {len(report.skipped)} changed record(s)"
+                                                  if report.skipped else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
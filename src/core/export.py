@@ -0,0 +1,237 @@
+"""
+Streaming candidate export for TalentScout Hiring Assistant
+Writes CSV or Parquet in fixed-size chunks straight from a storage scan
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from .performance_optimizer import metrics
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_CHUNK_SIZE = 5000
+
+# Columns of the original summary export, used when no projection is given
+DEFAULT_EXPORT_COLUMNS = ['name', 'email', 'experience_years', 'desired_position',
+                          'tech_stack', 'session_completed', 'timestamp']
+
+# Parquet column kinds; anything else is written as a string (dicts and lists as JSON)
+PARQUET_NUMBER_COLUMNS = ('experience_years',)
+PARQUET_BOOL_COLUMNS = ('session_completed', 'anonymized')
+PARQUET_TIMESTAMP_COLUMNS = ('timestamp', 'last_updated', 'completion_time', 'anonymized_date')
+
+DateBound = Union[date, datetime, str, None]
+
+
+def date_bound(value: DateBound, end: bool = False) -> Optional[datetime]:
+    """
+    Normalize a bound; ``end=True`` returns the exclusive upper limit of an inclusive end
+
+    A plain date (or date-only ISO string) as the end covers that whole
+    day; a datetime end includes records stamped exactly at it.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if len(value) > 10 else date.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+        if end:
+            value += timedelta(days=1)
+    elif end:
+        value += timedelta(microseconds=1)  # Timestamps are stored to the microsecond
+    return value
+
+
+def filter_candidates(records: Iterable[Dict], start_date: DateBound = None,
+                      end_date: DateBound = None, completed_only: bool = False) -> Iterator[Dict]:
+    """Yield records with ``start_date <= timestamp <= end_date`` (both inclusive), optionally completed only"""
+    start = date_bound(start_date)
+    end = date_bound(end_date, end=True)
+    for record in records:
+        if completed_only and not record.get('session_completed'):
+            continue
+        if start or end:
+            timestamp = record.get('timestamp')
+            if not timestamp:
+                continue
+            created = datetime.fromisoformat(timestamp)
+            if (start and created < start) or (end and created >= end):
+                continue
+        yield record
+
+
+def _chunks(records: Iterable[Dict], columns: List[str], chunk_size: int) -> Iterator[List[Dict]]:
+    """Project records onto ``columns`` and group them into lists of ``chunk_size``"""
+    chunk = []
+    for record in records:
+        chunk.append({column: record.get(column) for column in columns})
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parquet_schema(columns: List[str]):
+    """Fixed schema so every chunk lands in the same Parquet file"""
+    import pyarrow as pa
+
+    types = {'tech_stack': pa.list_(pa.string()),
+             **{column: pa.float64() for column in PARQUET_NUMBER_COLUMNS},
+             **{column: pa.bool_() for column in PARQUET_BOOL_COLUMNS},
+             **{column: pa.timestamp("us") for column in PARQUET_TIMESTAMP_COLUMNS}}
+    return pa.schema([(column, types.get(column, pa.string())) for column in columns])
+
+
+def _parquet_value(column: str, value: Any) -> Any:
+    """Coerce a stored value to the column's Parquet type; unparseable numbers and times become null"""
+    if value is None:
+        return None
+    if column == 'tech_stack':
+        return [str(item) for item in value]
+    if column in PARQUET_BOOL_COLUMNS:
+        return bool(value)
+    if column in PARQUET_NUMBER_COLUMNS:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if column in PARQUET_TIMESTAMP_COLUMNS:
+        try:
+            return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def write_csv(chunks: Iterable[List[Dict]], path: str, columns: List[str],
+              progress: Callable[[int], None] = None) -> int:
+    """Append each chunk to ``path``; the header is written once"""
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        pd.DataFrame(columns=columns).to_csv(f, index=False)
+        for chunk in chunks:
+            pd.DataFrame(chunk, columns=columns).to_csv(f, index=False, header=False)
+            written += len(chunk)
+            if progress:
+                progress(written)
+    return written
+
+
+def write_parquet(chunks: Iterable[List[Dict]], path: str, columns: List[str],
+                  progress: Callable[[int], None] = None) -> int:
+    """Write each chunk as a row group of one Parquet file (requires ``pyarrow``)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+    schema = _parquet_schema(columns)
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            arrays = {column: [_parquet_value(column, row[column]) for row in chunk]
+                      for column in columns}
+            writer.write_table(pa.Table.from_pydict(arrays, schema=schema))
+            written += len(chunk)
+            if progress:
+                progress(written)
+    return written
+
+
+def export_candidates(records: Iterable[Dict], path: str, fmt: str = "csv",
+                      columns: List[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                      progress: Callable[[int], None] = None, **filters) -> int:
+    """
+    Stream ``records`` into a CSV or Parquet file
+
+    Memory is bounded by ``chunk_size`` rows. ``filters`` are passed to
+    ``filter_candidates`` (start_date, end_date, completed_only).
+
+    Returns:
+        int: Number of rows written
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {EXPORT_FORMATS})")
+    columns = list(columns or DEFAULT_EXPORT_COLUMNS)
+    chunks = _chunks(filter_candidates(records, **filters), columns, chunk_size)
+    writer = write_csv if fmt == "csv" else write_parquet
+
+    # Write to a temp name so a reader never picks up a half-written export
+    tmp_path = f"{path}.partial"
+    try:
+        with metrics.timer(f"export.{fmt}"):
+            written = writer(chunks, tmp_path, columns, progress)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+class ExportJob:
+    """
+    Export running on a background thread.
+
+    Poll ``status`` ("running", "done" or "failed"), ``rows_written`` and
+    ``progress`` (records scanned out of ``total`` when known) from the UI.
+    """
+
+    def __init__(self, records: Iterable[Dict], path: str, total: Optional[int] = None, **options):
+        self.path = path
+        self.total = total
+        self.rows_scanned = 0
+        self.rows_written = 0
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, args=(self._count(records), options),
+                                        name="candidate-export", daemon=True)
+        self._thread.start()
+
+    def _run(self, records: Iterable[Dict], options: Dict[str, Any]) -> None:
+        try:
+            export_candidates(records, self.path, progress=self._on_progress, **options)
+            self.status = "done"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+
+    def _count(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        for record in records:
+            self.rows_scanned += 1
+            yield record
+
+    def _on_progress(self, rows_written: int) -> None:
+        self.rows_written = rows_written
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the store scanned so far"""
+        if self.status == "done":
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.rows_scanned / self.total, 1.0)
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the export finishes; returns True if it has"""
+        self._thread.join(timeout)
+        return self.done
@@ -0,0 +1,195 @@
+"""
+Alternative LLM backends for TalentScout Hiring Assistant
+Drop-in replacements for ``genai.GenerativeModel`` used by benchmarks and tests
+
+- ``StubModel``: deterministic offline answers to the chatbot's own prompts
+- ``RecordingModel``: wraps a real model and writes every call to a cassette
+- ``ReplayModel``: serves recorded responses by canonical prompt hash
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StubResponse:
+    """Minimal stand-in for a Gemini response object"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """
+    Deterministic offline model that understands the chatbot's own prompts.
+
+    It echoes the values a scripted candidate typed, so a full interview can
+    run from greeting to completion without network access. ``latency`` and
+    ``jitter`` (seconds) simulate model response time.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def _sleep(self) -> None:
+        """Simulate model latency"""
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        """Answer one of the chatbot's prompt templates"""
+        self._sleep()
+        return StubResponse(self._answer(prompt))
+
+    def _answer(self, prompt: str) -> str:
+        """Build a plausible response for the given prompt"""
+        extract = re.search(r'Extract the (.+?) from this user response: "(.*)"', prompt)
+        if extract:
+            field, response = extract.group(1), extract.group(2)
+            if field == "email":
+                match = re.search(r'[\w.+-]+@[\w-]+\.[\w.]+', response)
+                return match.group(0) if match else "NOT_FOUND"
+            if field == "years of experience":
+                match = re.search(r'\d+', response)
+                return match.group(0) if match else "NOT_FOUND"
+            return response.strip() or "NOT_FOUND"
+
+        tech = re.search(r'mentioned in this text: "(.*)"', prompt)
+        if tech:
+            names = [t.strip() for t in re.split(r',|\band\b', tech.group(1)) if t.strip()]
+            names = [re.sub(r'^(I work with|I use)\s+', '', n, flags=re.IGNORECASE) for n in names]
+            return ", ".join(names) if names else "NONE"
+
+        if "technical interview questions" in prompt:
+            return "\n".join([
+                "1. Describe a system you designed and the trade-offs you made.",
+                "2. How do you test and debug production issues?",
+                "3. Explain how you would scale a read-heavy service."
+            ])
+
+        return "Let's get back to your screening. Could you answer the previous question?"
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed prompt was never recorded"""
+
+
+def canonical_prompt(prompt: str) -> str:
+    """Normalize whitespace so re-indented prompt templates hash the same"""
+    return " ".join(prompt.split())
+
+
+def prompt_hash(prompt: str) -> str:
+    """Stable key for a prompt in a cassette"""
+    return hashlib.sha256(canonical_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+def read_cassette(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield cassette entries (one JSON object per line)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordingModel:
+    """
+    Pass-through wrapper that appends every prompt/response pair to a cassette.
+
+    Entries are JSON lines of type ``llm`` (prompt, response, latency) or
+    ``turn`` (a user message for a session), so a day of traffic can be
+    replayed through newer code with ``benchmarks.replay``.
+    """
+
+    def __init__(self, inner: Any, cassette_path: str):
+        self.inner = inner
+        self.cassette_path = cassette_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(cassette_path) or ".", exist_ok=True)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Append one entry; a single write call keeps lines whole across threads"""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        """Call the wrapped model and record the exchange with its latency"""
+        start = time.perf_counter()
+        response = self.inner.generate_content(prompt)
+        latency = time.perf_counter() - start
+        self._append({
+            "type": "llm",
+            "hash": prompt_hash(prompt),
+            "prompt": prompt,
+            "response": response.text,
+            "latency_s": latency,
+            "recorded_at": datetime.now().isoformat(),
+        })
+        return response
+
+    def record_turn(self, session: str, message: str) -> None:
+        """Record a user message so whole conversations can be replayed"""
+        self._append({
+            "type": "turn",
+            "session": session,
+            "message": message,
+            "recorded_at": datetime.now().isoformat(),
+        })
+
+
+class ReplayModel:
+    """
+    Offline model serving recorded responses by canonical prompt hash.
+
+    Responses recorded more than once for the same prompt are served in
+    recording order, cycling when exhausted. ``latency_scale`` multiplies the
+    recorded latency (0 disables sleeping). Unknown prompts raise
+    ``CassetteMissError`` unless a ``fallback`` model is given.
+    """
+
+    def __init__(self, cassette_path: str, latency_scale: float = 1.0, fallback: Any = None):
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._positions: Dict[str, int] = defaultdict(int)
+        for entry in read_cassette(cassette_path):
+            if entry.get("type", "llm") == "llm":
+                self._entries[entry["hash"]].append(entry)
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        """Serve the recorded response for ``prompt``"""
+        key = prompt_hash(prompt)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                entry = None
+            else:
+                self.hits += 1
+                entry = entries[self._positions[key] % len(entries)]
+                self._positions[key] += 1
+
+        if entry is None:
+            if self.fallback is not None:
+                return self.fallback.generate_content(prompt)
+            raise CassetteMissError(f"No recorded response for prompt {key[:12]}")
+
+        delay = entry.get("latency_s", 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return StubResponse(entry["response"])
@@ -4,9 +4,12 @@ Implements async processing, caching, and performance monitoring
 """
 
 import asyncio
+import bisect
+import threading
 import time
 import json
-from typing import Dict, Any, Optional, List, Callable
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Callable, Iterator
 from dataclasses import dataclass, asdict
 from functools import wraps
 import hashlib
@@ -21,6 +24,146 @@ class PerformanceMetrics:
     timestamp: datetime
     operation_type: str
 
+# Upper bounds (seconds) of the latency histogram buckets; roughly logarithmic
+# from 1ms to 60s so storage calls and LLM calls share one layout.
+LATENCY_BUCKETS = [
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; O(1) to record, O(buckets) to summarize"""
+    
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = buckets or LATENCY_BUCKETS
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+    
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100) by interpolating within a bucket"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                fraction = (rank - seen) / bucket_count
+                estimate = lower + (upper - lower) * fraction
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+    
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, min/max and p50/p90/p99 in seconds"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99)
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide, thread-safe store of pre-aggregated metrics.
+    
+    Writers pay a lock plus a bucket increment; readers (the performance
+    dashboard) only summarize the aggregates, so monitoring never walks
+    per-request records.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Dict[str, float]] = {}
+    
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a latency observation under ``name``"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a monotonic counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    def set_gauge(self, name: str, value: float, label: str = "") -> None:
+        """Set a point-in-time value, optionally per label (e.g. per session)"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[label] = value
+    
+    def add_to_gauge(self, name: str, amount: float, label: str = "") -> None:
+        """Adjust a gauge relative to its current value"""
+        with self._lock:
+            values = self._gauges.setdefault(name, {})
+            values[label] = values.get(label, 0) + amount
+    
+    def remove_gauge(self, name: str, label: str = "") -> None:
+        """Drop a labelled gauge value (e.g. when its session ends)"""
+        with self._lock:
+            self._gauges.get(name, {}).pop(label, None)
+    
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Context manager recording the wall time of its block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def timed(self, name: str) -> Callable:
+        """Decorator recording the wall time of every call"""
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of every aggregate"""
+        with self._lock:
+            return {
+                'histograms': {name: h.summary() for name, h in self._histograms.items()},
+                'counters': dict(self._counters),
+                'gauges': {name: dict(values) for name, values in self._gauges.items()}
+            }
+    
+    def reset(self) -> None:
+        """Clear all metrics (used by benchmarks between runs)"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+# Shared registry for the whole process; every Streamlit session reports here
+metrics = MetricsRegistry()
+
+
 class ResponseCache:
     """Intelligent caching system for common responses and questions"""
     
@@ -41,6 +184,7 @@ class ResponseCache:
     def get(self, key: str) -> Optional[Any]:
         """Get item from cache if not expired"""
         if key not in self.cache:
+            metrics.increment('cache.misses')
             return None
             
         access_time = self.access_times.get(key, datetime.min)
@@ -48,10 +192,12 @@ class ResponseCache:
             # Expired, remove from cache
             del self.cache[key]
             del self.access_times[key]
+            metrics.increment('cache.misses')
             return None
             
         # Update access time
         self.access_times[key] = datetime.now()
+        metrics.increment('cache.hits')
         return self.cache[key]
     
     def set(self, key: str, value: Any) -> None:
@@ -176,14 +322,17 @@ class AsyncChatbot:
     
     def _record_metrics(self, response_time: float, cache_hit: bool, operation_type: str) -> None:
         """Record performance metrics"""
-        metrics = PerformanceMetrics(
+        metric = PerformanceMetrics(
             response_time=response_time,
             cache_hit=cache_hit,
             memory_usage=0.0,  # Could implement actual memory monitoring
             timestamp=datetime.now(),
             operation_type=operation_type
         )
-        self.performance_metrics.append(metrics)
+        self.performance_metrics.append(metric)
+        
+        # Feed the shared registry so the dashboard sees async calls as well
+        metrics.observe(f"async.{operation_type}", response_time)
         
         # Keep only recent metrics (last 100)
         if len(self.performance_metrics) > 100:
@@ -0,0 +1,242 @@
+"""
+Privacy operations for TalentScout Hiring Assistant
+Bulk anonymization and purging as resumable background jobs, and retention
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .config import PRIVACY_BATCH_SIZE, PRIVACY_JOBS_DIR
+from .performance_optimizer import metrics
+from .storage import atomic_write_json
+
+PRIVACY_ACTIONS = ("anonymize", "purge")
+
+
+def anonymized_fields(candidate_id: str, anonymized_date: str = None) -> Dict[str, Any]:
+    """Replacement values for a candidate's personal fields"""
+    return {
+        'name': f"Candidate_{candidate_id}",
+        'email': f"candidate_{candidate_id}@anonymous.com",
+        'phone': "XXX-XXX-XXXX",
+        'anonymized': True,
+        'anonymized_date': anonymized_date or datetime.now().isoformat()
+    }
+
+
+class PrivacyJob:
+    """
+    Anonymize or purge a fixed list of candidates in batches on a background thread.
+
+    Target ids are resolved once, up front, and saved to a checkpoint file
+    together with how many have been processed; the checkpoint is updated
+    after every batch and removed when the job completes. Both actions are
+    idempotent, so a job interrupted mid-batch can be resumed from its
+    checkpoint with ``PrivacyJob.resume``. Poll ``status``, ``processed``,
+    ``progress`` and ``throughput`` from the UI.
+    """
+
+    def __init__(self, data_handler, action: str, candidate_ids: List[str], checkpoint_path: str,
+                 batch_size: int = PRIVACY_BATCH_SIZE, processed: int = 0, affected: int = 0,
+                 job_id: str = None, start: bool = True):
+        if action not in PRIVACY_ACTIONS:
+            raise ValueError(f"Unknown privacy action: {action} (expected one of {PRIVACY_ACTIONS})")
+        self.data_handler = data_handler
+        self.action = action
+        self.candidate_ids = list(candidate_ids)
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.processed = processed  # Ids handled so far, including earlier runs
+        self.affected = affected    # Records actually anonymized or removed
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._processed_at_start = processed
+        self._cancel = threading.Event()
+        self._save_checkpoint()
+        self._thread = threading.Thread(target=self._run, name=f"privacy-{action}", daemon=True)
+        if start:
+            self._thread.start()
+
+    @classmethod
+    def resume(cls, data_handler, checkpoint_path: str, start: bool = True) -> "PrivacyJob":
+        """Continue a job from its checkpoint file"""
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return cls(data_handler, state['action'], state['candidate_ids'], checkpoint_path,
+                   batch_size=state.get('batch_size', PRIVACY_BATCH_SIZE),
+                   processed=state.get('processed', 0), affected=state.get('affected', 0),
+                   job_id=state.get('job_id'), start=start)
+
+    def _save_checkpoint(self) -> None:
+        atomic_write_json(self.checkpoint_path, {
+            'job_id': self.job_id,
+            'action': self.action,
+            'batch_size': self.batch_size,
+            'candidate_ids': self.candidate_ids,
+            'processed': self.processed,
+            'affected': self.affected,
+            'status': self.status,
+            'updated_at': datetime.now().isoformat(),
+        })
+
+    def _apply_batch(self, batch: List[str]) -> int:
+        storage = self.data_handler.storage
+        # Transcripts hold the conversation verbatim, so both actions remove them
+        self.data_handler.transcripts.delete_many(batch)
+        if self.action == "purge":
+            return storage.delete_many(batch)
+        now = datetime.now().isoformat()
+        return storage.patch_many({candidate_id: (anonymized_fields(candidate_id, now), {})
+                                   for candidate_id in batch})
+
+    def _run(self) -> None:
+        try:
+            while self.processed < len(self.candidate_ids):
+                if self._cancel.is_set():
+                    self.status = "cancelled"
+                    break
+                batch = self.candidate_ids[self.processed:self.processed + self.batch_size]
+                # Queued completion writes must not land after (or resurrect) these records
+                self.data_handler.flush_pending_writes()
+                with metrics.timer(f"privacy.{self.action}_batch"):
+                    self.affected += self._apply_batch(batch)
+                self.processed += len(batch)
+                metrics.set_gauge(f"privacy.{self.action}_per_second", self.throughput)
+                self._save_checkpoint()
+            else:
+                self.status = "done"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+            if self.status == "done":
+                os.remove(self.checkpoint_path)
+            else:
+                self._save_checkpoint()
+
+    def run(self) -> "PrivacyJob":
+        """Run on the calling thread (for a job created with ``start=False``)"""
+        self._run()
+        return self
+
+    def cancel(self) -> None:
+        """Stop after the current batch; the checkpoint allows resuming later"""
+        self._cancel.set()
+
+    @property
+    def total(self) -> int:
+        return len(self.candidate_ids)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of target ids processed"""
+        return self.processed / self.total if self.total else 1.0
+
+    @property
+    def throughput(self) -> float:
+        """Candidates processed per second in this run"""
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        done = self.processed - self._processed_at_start
+        return done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job finishes; returns True if it has"""
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        return self.done
+
+
+class PrivacyManager:
+    """
+    Entry point for privacy requests and scheduled retention.
+
+    Every request resolves its target ids in one scan and runs as a
+    ``PrivacyJob`` with a checkpoint under ``<data_dir>/privacy_jobs``.
+    Retention is a single ``delete_older_than`` call instead, so engines
+    can drop expired data whole.
+    """
+
+    def __init__(self, data_handler):
+        self.data_handler = data_handler
+        self.jobs_dir = os.path.join(data_handler.data_dir, PRIVACY_JOBS_DIR)
+
+    def _select(self, candidate_ids: Iterable[str] = None,
+                where: Callable[[Dict], bool] = None, records: Iterable[Dict] = None) -> List[str]:
+        """Ids matching both the id list and the predicate (either may be omitted, not both)"""
+        if where is None and candidate_ids is None:
+            raise ValueError("Select candidates by id list, predicate or both")
+        if where is None:
+            return list(dict.fromkeys(candidate_ids))
+        wanted = set(candidate_ids) if candidate_ids is not None else None
+        if records is None:
+            records = self.data_handler.iter_candidates()
+        return [record['id'] for record in records
+                if (wanted is None or record['id'] in wanted) and (where is None or where(record))]
+
+    def _start(self, action: str, candidate_ids: List[str], background: bool,
+               batch_size: int) -> PrivacyJob:
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex[:12]
+        checkpoint = os.path.join(self.jobs_dir, f"{action}_{job_id}.json")
+        job = PrivacyJob(self.data_handler, action, candidate_ids, checkpoint,
+                         batch_size=batch_size, job_id=job_id, start=background)
+        return job if background else job.run()
+
+    def anonymize(self, candidate_ids: Iterable[str] = None, where: Callable[[Dict], bool] = None,
+                  background: bool = True, batch_size: int = PRIVACY_BATCH_SIZE) -> PrivacyJob:
+        """Anonymize candidates selected by id list and/or predicate"""
+        return self._start("anonymize", self._select(candidate_ids, where), background, batch_size)
+
+    def purge(self, candidate_ids: Iterable[str] = None, where: Callable[[Dict], bool] = None,
+              background: bool = True, batch_size: int = PRIVACY_BATCH_SIZE) -> PrivacyJob:
+        """Permanently delete candidates selected by id list and/or predicate"""
+        return self._start("purge", self._select(candidate_ids, where), background, batch_size)
+
+    @metrics.timed("privacy.retention")
+    def apply_retention(self, days_old: int = 30) -> int:
+        """
+        Purge candidates whose ``timestamp`` is at least ``days_old`` days old
+
+        One ``delete_older_than`` call: the JSON engine rewrites its file
+        once and the partitioned engine drops expired partitions whole.
+        Deleting is idempotent, so an interrupted run is simply run again.
+
+        Returns:
+            int: Number of candidates removed
+        """
+        cutoff = datetime.now() - timedelta(days=days_old)
+        # Queued completion writes must not land after (or resurrect) expired records
+        self.data_handler.flush_pending_writes()
+        transcripts = self.data_handler.transcripts
+        if os.path.isdir(transcripts.directory):
+            # Time-partitioned engines only read partitions that start before the cutoff
+            transcripts.delete_many(
+                record['id'] for record in self.data_handler.iter_candidates(end_date=cutoff)
+                if record.get('timestamp') and datetime.fromisoformat(record['timestamp']) <= cutoff)
+        return self.data_handler.storage.delete_older_than(cutoff)
+
+    def unfinished_jobs(self) -> List[str]:
+        """Checkpoint paths of jobs not completed yet (running, failed, cancelled or interrupted)"""
+        if not os.path.isdir(self.jobs_dir):
+            return []
+        # Completed jobs remove their checkpoint
+        return [os.path.join(self.jobs_dir, name) for name in sorted(os.listdir(self.jobs_dir))
+                if name.endswith(".json")]
+
+    def resume(self, checkpoint_path: str, background: bool = True) -> PrivacyJob:
+        """Continue an interrupted job from its checkpoint"""
+        job = PrivacyJob.resume(self.data_handler, checkpoint_path, start=background)
+        return job if background else job.run()
@@ -0,0 +1,137 @@
+"""
+On-demand profiling for TalentScout Hiring Assistant
+Profiles the next N chatbot turns or Streamlit reruns with cProfile
+
+Usage:
+    TALENTSCOUT_PROFILE_TURNS=5 streamlit run app.py
+    python -m src.core.profiler --top 25
+"""
+
+import argparse
+import cProfile
+import glob
+import os
+import pstats
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from .config import PROFILES_DIR, PROFILE_TURNS, PROFILE_SCOPE
+
+PROFILE_SCOPES = ("turn", "rerun")
+
+
+class TurnProfiler:
+    """
+    Countdown-armed profiler shared by every session in the process.
+
+    Callers guard with ``if profiler.remaining`` before touching anything
+    else, so when profiling is off the cost is a single attribute read.
+    """
+
+    def __init__(self, output_dir: str = PROFILES_DIR, turns: int = 0, scope: str = "turn"):
+        self.output_dir = output_dir
+        self.remaining = 0
+        self.scope = "turn"
+        self._lock = threading.Lock()
+        self.arm(turns, scope)
+
+    def arm(self, turns: int, scope: str = "turn") -> None:
+        """Profile the next ``turns`` calls of the given scope"""
+        if scope not in PROFILE_SCOPES:
+            raise ValueError(f"Unknown profile scope: {scope}")
+        with self._lock:
+            self.scope = scope
+            self.remaining = max(0, int(turns))
+
+    def disarm(self) -> None:
+        """Stop profiling immediately"""
+        with self._lock:
+            self.remaining = 0
+
+    def _claim(self, scope: str) -> bool:
+        """Atomically take one profiling slot for ``scope``"""
+        with self._lock:
+            if self.remaining <= 0 or self.scope != scope:
+                return False
+            self.remaining -= 1
+            return True
+
+    def profile(self, func: Callable, *args, scope: str, session_id: Optional[str],
+                stage: str, **kwargs) -> Any:
+        """
+        Run ``func`` under cProfile if a slot is available, otherwise run it plainly
+
+        The profile is written to ``<output_dir>/<time>_<session>_<stage>.prof``.
+        """
+        if not self._claim(scope):
+            return func(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            self._dump(profile, session_id, stage)
+
+    def _dump(self, profile: cProfile.Profile, session_id: Optional[str], stage: str) -> None:
+        """Write a finished profile to disk; never let this break the turn"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            name = f"{stamp}_{_safe_name(session_id or 'anonymous')}_{_safe_name(stage)}.prof"
+            profile.dump_stats(os.path.join(self.output_dir, name))
+        except Exception as e:
+            print(f"Error saving profile: {e}")
+
+
+def _safe_name(value: str) -> str:
+    """Make a value safe to embed in a file name"""
+    return re.sub(r'[^A-Za-z0-9.-]+', '-', str(value)).strip('-') or 'unknown'
+
+
+def find_profiles(profile_dir: str = PROFILES_DIR, session_id: str = None,
+                  stage: str = None) -> List[str]:
+    """List saved profiles, optionally filtered by session id and stage"""
+    paths = sorted(glob.glob(os.path.join(profile_dir, "*.prof")))
+    if session_id:
+        paths = [p for p in paths if f"_{_safe_name(session_id)}_" in os.path.basename(p)]
+    if stage:
+        paths = [p for p in paths if os.path.basename(p).endswith(f"_{_safe_name(stage)}.prof")]
+    return paths
+
+
+def aggregate_profiles(paths: List[str], top: int = 20, sort_by: str = "cumulative") -> pstats.Stats:
+    """Merge profiles and print the ``top`` hottest functions"""
+    stats = pstats.Stats(*paths)
+    stats.strip_dirs().sort_stats(sort_by).print_stats(top)
+    return stats
+
+
+# Shared profiler, armed from the environment at import time
+profiler = TurnProfiler(turns=PROFILE_TURNS, scope=PROFILE_SCOPE)
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI: aggregate saved profiles into a top-N hot function report"""
+    parser = argparse.ArgumentParser(description="Aggregate TalentScout turn profiles")
+    parser.add_argument("--dir", default=PROFILES_DIR, help="Directory holding .prof files")
+    parser.add_argument("--session", help="Only include profiles for this session id")
+    parser.add_argument("--stage", help="Only include profiles for this stage")
+    parser.add_argument("--top", type=int, default=20, help="Number of functions to show")
+    parser.add_argument("--sort", default="cumulative",
+                        choices=["cumulative", "tottime", "ncalls"], help="Sort key")
+    args = parser.parse_args(argv)
+
+    paths = find_profiles(args.dir, args.session, args.stage)
+    if not paths:
+        print(f"No profiles found in {args.dir}")
+        return 1
+
+    print(f"Aggregating {len(paths)} profile(s) from {args.dir}")
+    aggregate_profiles(paths, args.top, args.sort)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""
+Candidate storage backends for TalentScout Hiring Assistant
+
+``DataHandler`` delegates all persistence to a ``StorageEngine`` created
+here, selected by name (``STORAGE_BACKEND`` in config). Engines are shared
+per data directory within a process, so every session's DataHandler sees
+the same in-memory state for stateful backends. Every engine is also safe
+to share between processes (several app workers on one data directory).
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..config import (CANDIDATES_FILE, EMAIL_INDEX_FILE, LOG_COMPACT_THRESHOLD, LOG_FSYNC,
+                      PARTITION_GRANULARITY, PARTITIONS_DIR, READ_CACHE, READ_CACHE_MAX_MB, SEARCH_INDEX,
+                      SEARCH_INDEX_FILE, SKILL_INDEX, SKILL_INDEX_FILE, SNAPSHOT_FILE,
+                      SNAPSHOT_INTERVAL_SECONDS, SQLITE_FILE, WRITE_BEHIND_FLUSH_SECONDS,
+                      WRITE_BEHIND_MAX_PENDING)
+from .base import Patch, StorageEngine
+from .columnar_snapshot import (CandidateSnapshot, SnapshotPublisher, publish_snapshot,
+                                read_snapshot_header)
+from .email_index import EmailIndex, normalize_email
+from .indexed_store import IndexedStore, RecordIndex
+from .json_store import CorruptStoreError, JsonFileStore
+from .json_stream import iter_json_array
+from .locking import FileLock, atomic_write_bytes, atomic_write_json
+from .log_store import AppendOnlyLogStore
+from .memory_store import MemoryStore
+from .partitioned_store import PartitionedStore, partition_bounds, partition_key
+from .read_cache import CachedStore, candidate_stage, count_candidates
+from .search_index import SearchHit, SearchIndex, build_match_query, fts5_available
+from .skill_index import SkillIndex, canonical_tech
+from .sqlite_store import SqliteStore, migrate_json_to_sqlite
+from .transcripts import TRANSCRIPT_CODECS, TranscriptStore
+from .vocabulary import POSITIONS, TECHNOLOGIES, CanonicalTerms, Vocabulary
+from .write_behind import WriteBehindBuffer, combine_patches
+
+
+def _json_engine(data_dir: str) -> StorageEngine:
+    return JsonFileStore(os.path.join(data_dir, CANDIDATES_FILE))
+
+
+def _log_engine(data_dir: str) -> StorageEngine:
+    return AppendOnlyLogStore(data_dir, compact_threshold=LOG_COMPACT_THRESHOLD, fsync=LOG_FSYNC,
+                              legacy_file=os.path.join(data_dir, CANDIDATES_FILE))
+
+
+def _sqlite_engine(data_dir: str) -> StorageEngine:
+    return SqliteStore(os.path.join(data_dir, SQLITE_FILE),
+                       legacy_file=os.path.join(data_dir, CANDIDATES_FILE))
+
+
+def _partitioned_engine(data_dir: str) -> StorageEngine:
+    return PartitionedStore(os.path.join(data_dir, PARTITIONS_DIR), granularity=PARTITION_GRANULARITY,
+                            legacy_file=os.path.join(data_dir, CANDIDATES_FILE))
+
+
+def _memory_engine(data_dir: str) -> StorageEngine:
+    return MemoryStore()
+
+
+# Backend name -> factory taking the data directory
+STORAGE_ENGINES: Dict[str, Callable[[str], StorageEngine]] = {
+    "json": _json_engine,
+    "log": _log_engine,
+    "sqlite": _sqlite_engine,
+    "partitioned": _partitioned_engine,
+    "memory": _memory_engine,
+}
+STORAGE_BACKENDS = tuple(STORAGE_ENGINES)
+
+# Backends whose version() survives restarts, so an index snapshot can be validated
+# against it (the log engine's version is an in-memory operation counter)
+SNAPSHOT_BACKENDS = ("json", "sqlite", "partitioned")
+
+
+def _make_indexes(backend: str, data_dir: str) -> List[RecordIndex]:
+    """Secondary indexes maintained on every write"""
+    # Always on: saves resolve a candidate's existing id through it
+    indexes: List[RecordIndex] = [
+        EmailIndex(None if backend == "memory" else os.path.join(data_dir, EMAIL_INDEX_FILE))]
+    if SEARCH_INDEX and fts5_available():
+        # The memory backend gets an in-memory index so nothing outlives the store
+        db_path = None if backend == "memory" else os.path.join(data_dir, SEARCH_INDEX_FILE)
+        indexes.append(SearchIndex(db_path))
+    if SKILL_INDEX:
+        snapshot = os.path.join(data_dir, SKILL_INDEX_FILE) if backend in SNAPSHOT_BACKENDS else None
+        indexes.append(SkillIndex(snapshot))
+    return indexes
+
+
+_stores: Dict[Tuple[str, str], StorageEngine] = {}
+_indexed: Dict[Tuple[str, str], IndexedStore] = {}
+_buffers: Dict[Tuple[str, str], WriteBehindBuffer] = {}
+_publishers: Dict[Tuple[str, str], SnapshotPublisher] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(backend: str, data_dir: str) -> StorageEngine:
+    """Return the process-wide engine for ``backend`` in ``data_dir`` (indexed, behind the read cache)"""
+    if backend not in STORAGE_ENGINES:
+        raise ValueError(f"Unknown storage backend: {backend} (expected one of {STORAGE_BACKENDS})")
+    key = (backend, os.path.abspath(data_dir))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = STORAGE_ENGINES[backend](data_dir)
+            indexes = _make_indexes(backend, data_dir)
+            if indexes:
+                store = _indexed[key] = IndexedStore(store, indexes)
+            if READ_CACHE:
+                store = CachedStore(store, max_bytes=READ_CACHE_MAX_MB * 1024 * 1024)
+            _stores[key] = store
+        return store
+
+
+def get_write_buffer(backend: str, data_dir: str) -> WriteBehindBuffer:
+    """Return the process-wide write-behind buffer in front of ``get_store(backend, data_dir)``"""
+    store = get_store(backend, data_dir)
+    key = (backend, os.path.abspath(data_dir))
+    with _stores_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = _buffers[key] = WriteBehindBuffer(
+                store, max_pending=WRITE_BEHIND_MAX_PENDING, flush_interval=WRITE_BEHIND_FLUSH_SECONDS)
+        return buffer
+
+
+def get_snapshot_publisher(backend: str, data_dir: str) -> SnapshotPublisher:
+    """Return the process-wide dashboard snapshot publisher for ``get_store(backend, data_dir)``"""
+    store = get_store(backend, data_dir)
+    key = (backend, os.path.abspath(data_dir))
+    with _stores_lock:
+        publisher = _publishers.get(key)
+        if publisher is None:
+            publisher = _publishers[key] = SnapshotPublisher(
+                store, os.path.join(data_dir, SNAPSHOT_FILE), SNAPSHOT_INTERVAL_SECONDS)
+        return publisher
+
+
+def get_index(backend: str, data_dir: str, name: str) -> Optional[RecordIndex]:
+    """Return a secondary index of ``get_store(backend, data_dir)`` by name, or None if disabled"""
+    get_store(backend, data_dir)
+    with _stores_lock:
+        indexed = _indexed.get((backend, os.path.abspath(data_dir)))
+    if indexed is None:
+        return None
+    index = indexed.index(name)
+    # In-process indexes catch up with other workers' writes here; shared ones already have them
+    if index is not None and not index.shared:
+        indexed.refresh()
+    return index
+
+
+def release_store(backend: str, data_dir: str) -> None:
+    """Drain, close and forget the shared engine (used by tools working on temp dirs)"""
+    key = (backend, os.path.abspath(data_dir))
+    with _stores_lock:
+        buffer = _buffers.pop(key, None)
+        publisher = _publishers.pop(key, None)
+        store = _stores.pop(key, None)
+        _indexed.pop(key, None)
+    if buffer is not None:
+        buffer.close()
+    if publisher is not None:
+        publisher.close()
+    if store is not None:
+        store.close()
+
+
+__all__ = [
+    "StorageEngine", "JsonFileStore", "AppendOnlyLogStore", "SqliteStore", "MemoryStore",
+    "STORAGE_ENGINES", "STORAGE_BACKENDS", "get_store", "release_store", "migrate_json_to_sqlite",
+    "CorruptStoreError", "FileLock", "atomic_write_bytes", "atomic_write_json",
+    "WriteBehindBuffer", "combine_patches", "get_write_buffer",
+    "CachedStore", "candidate_stage", "count_candidates",
+    "PartitionedStore", "partition_bounds", "partition_key",
+    "Patch", "IndexedStore", "RecordIndex", "get_index",
+    "SearchHit", "SearchIndex", "build_match_query", "fts5_available",
+    "SkillIndex", "canonical_tech",
+    "EmailIndex", "normalize_email",
+    "iter_json_array",
+    "CandidateSnapshot", "SnapshotPublisher", "get_snapshot_publisher", "publish_snapshot",
+    "read_snapshot_header",
+    "TranscriptStore", "TRANSCRIPT_CODECS",
+    "Vocabulary", "CanonicalTerms", "POSITIONS", "TECHNOLOGIES",
+]
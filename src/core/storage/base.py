@@ -0,0 +1,168 @@
+"""
+Storage engine interface shared by every candidate backend
+"""
+
+import contextlib
+import heapq
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import (Any, Callable, Collection, ContextManager, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from .records import matches_filters, project
+
+# Field-level change to one record: (set_fields, merge_fields), as taken by ``patch``
+Patch = Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]
+
+
+class StorageEngine(ABC):
+    """
+    Interface ``DataHandler`` delegates all persistence to.
+
+    Records are plain dicts keyed by ``id``. Business rules (ids, timestamps,
+    anonymization, validation) stay in ``DataHandler``; engines only store.
+    """
+
+    @abstractmethod
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """Return the record with ``candidate_id`` or None"""
+
+    @abstractmethod
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert ``record`` or merge its fields into the existing record with the same id"""
+
+    @abstractmethod
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        """
+        Update fields of an existing record; returns False if it does not exist
+
+        Args:
+            set_fields: Fields replaced outright
+            merge_fields: Dict-valued fields whose keys are merged into the existing dict
+        """
+
+    @abstractmethod
+    def scan(self) -> Iterator[Dict]:
+        """Iterate over all records in insertion order"""
+
+    @abstractmethod
+    def delete(self, candidate_id: str) -> bool:
+        """Remove one record; returns False if it does not exist"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored records"""
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        """Remove every record matching ``predicate``; returns how many were removed"""
+        doomed = [record['id'] for record in self.scan() if predicate(record)]
+        for candidate_id in doomed:
+            self.delete(candidate_id)
+        return len(doomed)
+
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        """
+        Apply ``{candidate_id: (set_fields, merge_fields)}`` in one pass
+
+        Missing ids are skipped. Engines override this to write the whole
+        batch in one transaction, rewrite or append.
+
+        Returns:
+            int: Number of records patched
+        """
+        return sum(1 for candidate_id, (set_fields, merge_fields) in patches.items()
+                   if self.patch(candidate_id, set_fields, merge_fields))
+
+    def delete_many(self, candidate_ids: Collection[str]) -> int:
+        """Remove every record whose id is in ``candidate_ids``; returns how many were removed"""
+        ids = set(candidate_ids)
+        return self.delete_where(lambda record: record.get('id') in ids)
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Remove records whose ``timestamp`` is at or before ``cutoff`` (retention)"""
+        now = datetime.now().isoformat()
+        return self.delete_where(
+            lambda record: datetime.fromisoformat(record.get('timestamp', now)) <= cutoff)
+
+    def scan_range(self, start: datetime = None, end: datetime = None) -> Iterator[Dict]:
+        """
+        Iterate over records that may fall in ``[start, end)`` by ``timestamp``
+
+        A superset is allowed; callers apply the exact bounds. Engines that
+        partition by time override this to skip whole partitions.
+        """
+        return self.scan()
+
+    def scan_page(self, after: Optional[str] = None, limit: int = 100,
+                  fields: Optional[Collection[str]] = None,
+                  filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """
+        Up to ``limit`` records with ``id > after`` in id order (keyset pagination)
+
+        Pass the last id of a page as ``after`` to get the next one; pages stay
+        consistent while records are added or removed elsewhere.
+
+        Args:
+            fields: Fields to return besides ``id`` (all if None)
+            filters: ``{field: value}`` equality filters; a list, tuple or set
+                value accepts any of its members
+        """
+        page = heapq.nsmallest(limit, (record for record in self.scan()
+                                       if (after is None or record['id'] > after)
+                                       and matches_filters(record, filters)),
+                               key=lambda record: record['id'])
+        return [project(record, fields) for record in page]
+
+    def history(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the changes behind the stored records, oldest first
+
+        Items are change-log operations (``{'op': 'upsert', 'record': ...}``,
+        ``patch`` or ``delete``). Engines that keep no history yield one
+        upsert per stored record.
+        """
+        return ({'op': 'upsert', 'record': record} for record in self.scan())
+
+    def keeps_history(self) -> bool:
+        """True if ``history`` replays past changes, False if it only lists the current records"""
+        return False
+
+    def insert_many(self, records: Iterable[Dict]) -> int:
+        """Bulk upsert; returns how many records were written"""
+        written = 0
+        for record in records:
+            self.upsert(record)
+            written += 1
+        return written
+
+    @abstractmethod
+    def replace_all(self, records: List[Dict]) -> None:
+        """Replace the whole store with ``records`` (bulk load)"""
+
+    def version(self) -> Any:
+        """
+        Cheap token that changes whenever the stored data changes
+
+        Also reflects writes made by other processes. None means the engine
+        cannot tell, so callers must assume the data changed.
+        """
+        return None
+
+    def data_size(self) -> Optional[int]:
+        """Bytes the stored records occupy on disk, or None if the engine cannot tell cheaply"""
+        return None
+
+    def write_lock(self) -> ContextManager:
+        """
+        Hold off writes from other threads and processes for a block
+
+        Re-entrant, so the engine's own writes inside the block proceed.
+        Caches use it to read ``version()`` before and after a write knowing
+        nobody else wrote in between. Engines with no shared lock return a
+        no-op context.
+        """
+        return contextlib.nullcontext()
+
+    def close(self) -> None:
+        """Release files, connections or threads held by the engine"""
@@ -0,0 +1,360 @@
+"""
+Read-only columnar snapshot of the candidate store for dashboards
+
+A background publisher periodically writes every candidate into one
+immutable binary file, replaced atomically. Readers memory-map it, so
+processes on one host share its pages, and dashboards never touch the
+write path. Numeric columns come back as zero-copy numpy views.
+
+File layout (little-endian)::
+
+    b"TSCSNAP2"                magic
+    uint32                     header length
+    header (JSON)              rows, store version, creation time and, per
+                               column, its type and blocks (offset, length),
+                               offsets counted from the first block
+    blocks (64-byte aligned)   f8 / bool (1 byte) / time (int64 microseconds,
+                               NaT as int64 min) arrays of ``rows`` values;
+                               str: int64 offsets[rows + 1] into a UTF-8 heap;
+                               dict: int32 codes[rows] (-1 if missing) plus
+                               the vocabulary as offsets and heap;
+                               dictlist: int64 row offsets[rows + 1] into
+                               int32 codes, plus the vocabulary
+
+Positions and tech names are dictionary-encoded against a per-snapshot
+vocabulary, so group-bys work on integer codes and each distinct name is
+decoded (and canonicalized) once.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..performance_optimizer import metrics
+from .base import StorageEngine
+from .locking import atomic_write_bytes
+
+MAGIC = b"TSCSNAP2"
+ALIGNMENT = 64
+
+# Column name -> type; "dict" / "dictlist" are a string / list of strings as vocabulary codes
+SNAPSHOT_COLUMNS = {
+    "id": "str",
+    "name": "str",
+    "desired_position": "dict",
+    "location": "str",
+    "tech_stack": "dictlist",
+    "experience_years": "f8",
+    "session_completed": "bool",
+    "timestamp": "time",
+    "completion_time": "time",
+}
+_NUMPY_TYPES = {"f8": np.dtype("<f8"), "bool": np.dtype("u1"), "time": np.dtype("<i8")}
+
+
+def _pad(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _encode_column(kind: str, values: List[Any]) -> List[bytes]:
+    """Blocks for one column: the array, or offsets plus heap for strings"""
+    if kind == "f8":
+        return [pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+                .to_numpy(dtype="<f8", na_value=np.nan).tobytes()]
+    if kind == "bool":
+        return [np.fromiter((bool(value) for value in values), dtype="u1", count=len(values)).tobytes()]
+    if kind == "time":
+        times = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", format="ISO8601")
+        return [times.to_numpy(dtype="datetime64[us]").view("<i8").tobytes()]
+    if kind in ("dict", "dictlist"):
+        # Term -> code in order of first appearance; a plain dict, as this runs per value
+        vocabulary: Dict[str, int] = {}
+        intern = lambda term: vocabulary.setdefault(str(term), len(vocabulary))
+        if kind == "dict":
+            codes = np.fromiter((-1 if value is None else intern(value) for value in values),
+                                dtype="<i4", count=len(values))
+            return [codes.tobytes(), *_string_blocks(list(vocabulary))]
+        lists = [value if isinstance(value, list) else [] for value in values]
+        offsets = np.zeros(len(lists) + 1, dtype="<i8")
+        np.cumsum([len(terms) for terms in lists], out=offsets[1:])
+        codes = np.fromiter((intern(term) for terms in lists for term in terms),
+                            dtype="<i4", count=offsets[-1])
+        return [offsets.tobytes(), codes.tobytes(), *_string_blocks(list(vocabulary))]
+    return _string_blocks(["" if value is None else str(value) for value in values])
+
+
+def _string_blocks(values: List[str]) -> List[bytes]:
+    """int64 offsets[len + 1] and the UTF-8 heap they index"""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return [offsets.tobytes(), b"".join(encoded)]
+
+
+@metrics.timed("storage.snapshot_publish")
+def publish_snapshot(records: Iterable[Dict[str, Any]], path: str, store_version: Any = None) -> int:
+    """
+    Write ``records`` as a new snapshot at ``path`` (atomic replace)
+
+    Readers that have the old file mapped keep reading it until they refresh.
+
+    Returns:
+        int: Number of rows written
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in SNAPSHOT_COLUMNS}
+    for record in records:
+        for name, values in columns.items():
+            values.append(record.get(name))
+    rows = len(columns["id"])
+
+    blocks: Dict[str, List[bytes]] = {name: _encode_column(kind, columns.pop(name))
+                                      for name, kind in SNAPSHOT_COLUMNS.items()}
+    header = {"rows": rows, "store_version": None if store_version is None else str(store_version),
+              "created_at": datetime.now().isoformat(), "columns": {}}
+    position = 0
+    for name, column_blocks in blocks.items():
+        spans = []
+        for block in column_blocks:
+            spans.append([position, len(block)])
+            position += len(block) + _pad(len(block))
+        header["columns"][name] = {"type": SNAPSHOT_COLUMNS[name], "blocks": spans}
+
+    encoded = json.dumps(header).encode("utf-8")
+    prefix = len(MAGIC) + 4 + len(encoded)
+    parts = [MAGIC, struct.pack("<I", len(encoded)), encoded, b"\0" * _pad(prefix)]
+    for column_blocks in blocks.values():
+        for block in column_blocks:
+            parts.extend((block, b"\0" * _pad(len(block))))
+    atomic_write_bytes(path, parts)
+    return rows
+
+
+def read_snapshot_header(path: str) -> Optional[Dict[str, Any]]:
+    """Header of the snapshot at ``path`` without mapping the data, or None if there is none"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = struct.unpack("<I", f.read(4))
+            return json.loads(f.read(length))
+    except FileNotFoundError:
+        return None
+
+
+class CandidateSnapshot:
+    """
+    Memory-mapped, read-only view of a published snapshot.
+
+    ``column()`` and ``codes()`` return numpy arrays backed by the mapping
+    (no copy, not writeable); strings are decoded on request. ``refresh()``
+    switches to a newer file once the publisher has replaced it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._identity: Optional[Tuple[int, int]] = None
+        self._map: Optional[mmap.mmap] = None
+        self._data_start = 0
+        self.header: Dict[str, Any] = {}
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(MAGIC)] != MAGIC:
+            mapped.close()
+            raise ValueError(f"{self.path} is not a candidate snapshot")
+        (length,) = struct.unpack_from("<I", mapped, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(mapped[start:start + length])
+        self._data_start = start + length + _pad(start + length)
+        # Views handed out earlier keep the previous mapping alive until released
+        self._map = mapped
+        self._identity = (stat.st_dev, stat.st_ino)
+
+    def refresh(self) -> bool:
+        """Map the current file if it was replaced; returns True if it was"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if (stat.st_dev, stat.st_ino) == self._identity:
+            return False
+        self._open()
+        return True
+
+    @property
+    def version(self) -> Tuple[str, Optional[str]]:
+        """Identifies the published data: (creation time, store version)"""
+        return self.header["created_at"], self.header["store_version"]
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromisoformat(self.header["created_at"])
+
+    def __len__(self) -> int:
+        return self.header["rows"]
+
+    def _blocks(self, name: str) -> Tuple[str, List[List[int]]]:
+        if name not in self.header["columns"]:
+            raise KeyError(f"Snapshot has no column {name!r} (columns: {', '.join(self.header['columns'])})")
+        column = self.header["columns"][name]
+        return column["type"], column["blocks"]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Zero-copy array for a numeric column
+
+        ``experience_years`` is float64 (NaN if unknown), ``session_completed``
+        bool and timestamps ``datetime64[us]`` (NaT if missing).
+        """
+        kind, blocks = self._blocks(name)
+        if kind not in _NUMPY_TYPES:
+            raise TypeError(f"Column {name!r} holds strings; use strings()")
+        offset, _ = blocks[0]
+        array = np.frombuffer(self._map, dtype=_NUMPY_TYPES[kind], count=len(self),
+                              offset=self._data_start + offset)
+        if kind == "bool":
+            return array.view(np.bool_)
+        if kind == "time":
+            return array.view("datetime64[us]")
+        return array
+
+    def _array(self, block: List[int], dtype: str, count: int) -> np.ndarray:
+        return np.frombuffer(self._map, dtype=dtype, count=count, offset=self._data_start + block[0])
+
+    def _heap_strings(self, offsets_block: List[int], heap_block: List[int], count: int) -> List[str]:
+        bounds = self._array(offsets_block, "<i8", count + 1).tolist()
+        heap_at = self._data_start + heap_block[0]
+        heap = memoryview(self._map)[heap_at:heap_at + heap_block[1]]
+        text = str(heap, "utf-8")
+        if len(text) != len(heap):
+            # Multi-byte characters: byte offsets are not character offsets
+            return [str(heap[start:end], "utf-8") for start, end in zip(bounds, bounds[1:])]
+        return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    def dictionary(self, name: str) -> List[str]:
+        """Vocabulary of a dictionary-encoded column; ``codes()`` index into it"""
+        kind, blocks = self._blocks(name)
+        if kind not in ("dict", "dictlist"):
+            raise TypeError(f"Column {name!r} is not dictionary-encoded")
+        (offsets_at, offsets_size), heap = blocks[-2:]
+        return self._heap_strings([offsets_at], heap, offsets_size // 8 - 1)
+
+    def codes(self, name: str) -> np.ndarray:
+        """
+        Zero-copy int32 vocabulary codes of a dictionary-encoded column
+
+        One per row for ``desired_position`` (-1 if missing); for
+        ``tech_stack`` the codes of all rows back to back (see ``list_rows``).
+        """
+        kind, blocks = self._blocks(name)
+        if kind == "dict":
+            return self._array(blocks[0], "<i4", len(self))
+        if kind == "dictlist":
+            return self._array(blocks[1], "<i4", blocks[1][1] // 4)
+        raise TypeError(f"Column {name!r} is not dictionary-encoded")
+
+    def list_rows(self, name: str) -> np.ndarray:
+        """Row of each entry of ``codes(name)`` for a list column"""
+        kind, blocks = self._blocks(name)
+        if kind != "dictlist":
+            raise TypeError(f"Column {name!r} is not a list column")
+        offsets = self._array(blocks[0], "<i8", len(self) + 1)
+        return np.repeat(np.arange(len(self)), np.diff(offsets))
+
+    def strings(self, name: str) -> List[Any]:
+        """Decoded values of a string column (None if missing, lists for ``tech_stack``)"""
+        kind, blocks = self._blocks(name)
+        if kind == "str":
+            return self._heap_strings(*blocks, len(self))
+        if kind not in ("dict", "dictlist"):
+            raise TypeError(f"Column {name!r} is numeric; use column()")
+        terms = self.dictionary(name)
+        if kind == "dict":
+            return [terms[code] if code >= 0 else None for code in self.codes(name).tolist()]
+        values = [terms[code] for code in self.codes(name).tolist()]
+        bounds = self._array(blocks[0], "<i8", len(self) + 1).tolist()
+        return [values[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Arrays still reference it; it is unmapped once they are gone
+            self._map = None
+
+
+class SnapshotPublisher:
+    """
+    Republishes the snapshot on a background thread whenever the store version changed.
+
+    Engines that cannot report a version (None) are republished every interval.
+    """
+
+    def __init__(self, store: StorageEngine, path: str, interval: float, start: bool = True):
+        self.store = store
+        self.path = path
+        self.interval = interval
+        header = read_snapshot_header(path)
+        self._published: Optional[str] = header["store_version"] if header else None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="snapshot-publisher", daemon=True)
+        if start:
+            self._thread.start()
+
+    def publish_if_changed(self) -> bool:
+        """Publish now if the store changed since the last snapshot; returns True if it did"""
+        with self._lock:
+            # Read before scanning: a write during the scan only causes one extra publish
+            version = self.store.version()
+            if version is not None and str(version) == self._published and os.path.exists(self.path):
+                return False
+            publish_snapshot(self.store.scan(), self.path, version)
+            self._published = None if version is None else str(version)
+            return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish_if_changed()
+            except Exception as e:
+                print(f"Error publishing candidate snapshot: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI: publish a snapshot from a store (e.g. from cron, outside the app)"""
+    from . import STORAGE_BACKENDS, STORAGE_ENGINES
+    from ..config import DATA_DIR, SNAPSHOT_FILE, STORAGE_BACKEND
+
+    parser = argparse.ArgumentParser(description="Publish the read-only candidate snapshot")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--backend", default=STORAGE_BACKEND, choices=STORAGE_BACKENDS)
+    args = parser.parse_args(argv)
+
+    engine = STORAGE_ENGINES[args.backend](args.data_dir)
+    path = os.path.join(args.data_dir, SNAPSHOT_FILE)
+    rows = publish_snapshot(engine.scan(), path, engine.version())
+    print(f"Published {rows} candidates to {path}")
+    engine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+"""
+Email lookup for candidate saves
+
+An SQLite table in ``data/emails.db`` mapping normalized email to candidate
+id (and back), shared by every app worker and kept current by
+``IndexedStore``, so saving a candidate finds the existing record in O(1)
+whichever id scheme created it, however many workers write.
+"""
+
+import sqlite3
+import threading
+import uuid
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence
+
+from ..performance_optimizer import metrics
+from .base import Patch
+from .indexed_store import INDEX_BATCH_SIZE, RecordIndex
+
+# Rowids grow with every (re)insert, so the highest one for an email is the latest record saved with it
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS emails (candidate_id TEXT PRIMARY KEY, email TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_emails_email ON emails(email);
+CREATE TABLE IF NOT EXISTS email_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """Comparison form of an email address"""
+    return (email or "").strip().lower()
+
+
+class EmailIndex(RecordIndex):
+    """
+    ``email -> id`` and ``id -> email`` for every stored candidate.
+
+    Records saved without an email are indexed under ``""`` so their id
+    still counts as taken. When several records share an email, the one
+    saved last resolves.
+    """
+
+    name = "emails"
+
+    def __init__(self, db_path: Optional[str] = None):
+        # No path: a private in-memory database (for the memory backend)
+        self.db_path = db_path or f"file:emails_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False, uri=self.db_path.startswith("file:"))
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _write(self, statements) -> None:
+        """Run ``statements(conn)`` in one write transaction"""
+        conn = self._connection()
+        with metrics.timer("storage.email_index_write"):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                statements(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------ #
+    # RecordIndex interface
+    # ------------------------------------------------------------------ #
+    def upsert_many(self, records: Sequence[Dict[str, Any]]) -> None:
+        def statements(conn: sqlite3.Connection) -> None:
+            for record in records:
+                if 'email' in record:
+                    conn.execute("INSERT OR REPLACE INTO emails (candidate_id, email) VALUES (?, ?)",
+                                 (record['id'], normalize_email(record['email'])))
+                else:
+                    conn.execute("INSERT OR IGNORE INTO emails (candidate_id, email) VALUES (?, '')",
+                                 (record['id'],))
+        self._write(statements)
+
+    def patch_many(self, patches: Dict[str, Patch]) -> None:
+        # Anonymization replaces the email, so the real address stops resolving
+        changed = [(candidate_id, normalize_email(set_fields['email']))
+                   for candidate_id, (set_fields, _) in patches.items()
+                   if set_fields and 'email' in set_fields]
+        if not changed:
+            return
+
+        def statements(conn: sqlite3.Connection) -> None:
+            for candidate_id, email in changed:
+                if self._has_id(conn, candidate_id):
+                    conn.execute("INSERT OR REPLACE INTO emails (candidate_id, email) VALUES (?, ?)",
+                                 (candidate_id, email))
+        self._write(statements)
+
+    def delete_many(self, candidate_ids: Collection[str]) -> None:
+        self._write(lambda conn: conn.executemany(
+            "DELETE FROM emails WHERE candidate_id = ?", ((candidate_id,) for candidate_id in candidate_ids)))
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        def statements(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM emails")
+            batch = []
+            for record in records:
+                if record.get('id'):
+                    batch.append((record['id'], normalize_email(record.get('email'))))
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    conn.executemany("INSERT OR REPLACE INTO emails (candidate_id, email) VALUES (?, ?)",
+                                     batch)
+                    batch = []
+            conn.executemany("INSERT OR REPLACE INTO emails (candidate_id, email) VALUES (?, ?)", batch)
+            conn.execute("INSERT OR REPLACE INTO email_meta (key, value) VALUES ('state', 'built')")
+        with metrics.timer("storage.email_index_rebuild"):
+            self._write(statements)
+
+    def needs_rebuild(self, store_version: Any) -> bool:
+        row = self._connection().execute("SELECT value FROM email_meta WHERE key = 'state'").fetchone()
+        return row is None or row[0] != "built"
+
+    def mark_stale(self) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO email_meta (key, value) VALUES ('state', 'stale')")
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _has_id(conn: sqlite3.Connection, candidate_id: str) -> bool:
+        return conn.execute("SELECT 1 FROM emails WHERE candidate_id = ?", (candidate_id,)).fetchone() is not None
+
+    def lookup(self, email: Optional[str]) -> Optional[str]:
+        """Id of the candidate stored with ``email``, or None"""
+        row = self._connection().execute(
+            "SELECT candidate_id FROM emails WHERE email = ? ORDER BY rowid DESC LIMIT 1",
+            (normalize_email(email),)).fetchone()
+        return row[0] if row else None
+
+    def has_id(self, candidate_id: str) -> bool:
+        """True if a stored candidate already uses ``candidate_id``"""
+        return self._has_id(self._connection(), candidate_id)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM emails").fetchone()[0]
@@ -0,0 +1,257 @@
+"""
+Secondary indexes kept in step with a storage engine
+
+``IndexedStore`` wraps an engine and forwards every successful write to its
+``RecordIndex`` instances, so indexes are maintained incrementally on save
+instead of being rebuilt from a full scan.
+"""
+
+import contextlib
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import (Any, Callable, Collection, ContextManager, Dict, Iterable, Iterator, List, Optional,
+                    Sequence)
+
+from .base import Patch, StorageEngine
+
+# Records handed to indexes per call during bulk loads
+INDEX_BATCH_SIZE = 1000
+
+
+class RecordIndex(ABC):
+    """
+    Index over a subset of record fields, updated with the same operations as the store.
+
+    ``upsert_many`` receives partial records with upsert (merge) semantics and
+    ``patch_many`` the store's field-level patches, so an index keeps its own
+    copy of the fields it needs and never has to read the store back.
+    """
+
+    name = "index"
+    # Shared indexes (e.g. a database file) also receive other processes' writes;
+    # in-process ones are rebuilt when the store changes behind their back
+    shared = True
+
+    @abstractmethod
+    def upsert_many(self, records: Sequence[Dict[str, Any]]) -> None:
+        """Merge the indexed fields of each record into the index"""
+
+    @abstractmethod
+    def patch_many(self, patches: Dict[str, Patch]) -> None:
+        """Apply field-level patches to records already in the index"""
+
+    @abstractmethod
+    def delete_many(self, candidate_ids: Collection[str]) -> None:
+        """Drop records from the index"""
+
+    @abstractmethod
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Replace the index contents with ``records``"""
+
+    def needs_rebuild(self, store_version: Any) -> bool:
+        """True if the index is missing, stale or does not match ``store_version``"""
+        return False
+
+    def mark_stale(self) -> None:
+        """Flag the index for a rebuild on next start (after a failed update)"""
+
+    def persist(self, store_version: Any) -> None:
+        """Save the index for a fast next start; it matches ``store_version``"""
+
+    def close(self) -> None:
+        """Release connections or files held by the index"""
+
+
+class IndexedStore(StorageEngine):
+    """
+    ``StorageEngine`` decorator that keeps ``RecordIndex`` instances current.
+
+    Indexes that report ``needs_rebuild()`` are built from a scan on start.
+    A failed index update never fails the write that already reached the
+    store; the index is marked stale and rebuilt next time instead.
+    In-process indexes are rebuilt by ``refresh()`` once the engine version
+    shows a write this instance did not make (another worker).
+    """
+
+    def __init__(self, engine: StorageEngine, indexes: List[RecordIndex]):
+        self.engine = engine
+        self.indexes = list(indexes)
+        self._local_indexes = [index for index in self.indexes if not index.shared]
+        self._lock = threading.RLock()
+        # Under the engine lock so no other worker writes between the scan and the version
+        with engine.write_lock():
+            version = engine.version()
+            for index in self.indexes:
+                if index.needs_rebuild(version):
+                    index.rebuild(engine.scan())
+        self._synced_version = version
+
+    def index(self, name: str) -> Optional[RecordIndex]:
+        return next((index for index in self.indexes if index.name == name), None)
+
+    def refresh(self) -> None:
+        """Rebuild in-process indexes if the store changed outside this instance"""
+        if not self._local_indexes:
+            return
+        # Engines that cannot tell (version None) only change through this instance
+        version = self.engine.version()
+        if version is None or version == self._synced_version:
+            return
+        # Rebuilt under the engine lock so the scan matches the version it is stamped with
+        with self.engine.write_lock(), self._lock:
+            version = self.engine.version()
+            if version == self._synced_version:
+                return
+            for index in self._local_indexes:
+                index.rebuild(self.engine.scan())
+            self._synced_version = version
+
+    def _update(self, apply: Callable[[RecordIndex], None]) -> None:
+        for index in self.indexes:
+            try:
+                apply(index)
+            except Exception as e:
+                print(f"Error updating {index.name} index: {e}")
+                index.mark_stale()
+
+    @contextlib.contextmanager
+    def _tracked_write(self, engine_lock: bool = True) -> Iterator[None]:
+        """
+        Run a write; in-process indexes stay in sync only if nobody else wrote first
+
+        The engine's write lock is held across the version checks and the
+        write, so another worker's write cannot slip in between unnoticed.
+        """
+        if not self._local_indexes:
+            yield
+            return
+        # Global order is CachedStore lock -> engine write lock -> IndexedStore lock (refresh() too);
+        # never take a lock to the left of one already held
+        with (self.engine.write_lock() if engine_lock else contextlib.nullcontext()), self._lock:
+            in_sync = self.engine.version() == self._synced_version
+            try:
+                yield
+            finally:
+                self._synced_version = self.engine.version() if in_sync else object()
+
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        return self.engine.get(candidate_id)
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        with self._tracked_write():
+            self.engine.upsert(record)
+            self._update(lambda index: index.upsert_many([record]))
+
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        with self._tracked_write():
+            patched = self.engine.patch(candidate_id, set_fields, merge_fields)
+            if patched:
+                self._update(lambda index: index.patch_many({candidate_id: (set_fields or {},
+                                                                             merge_fields or {})}))
+        return patched
+
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        with self._tracked_write():
+            patched = self.engine.patch_many(patches)
+            self._update(lambda index: index.patch_many(patches))
+        return patched
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._tracked_write():
+            deleted = self.engine.delete(candidate_id)
+            self._update(lambda index: index.delete_many([candidate_id]))
+        return deleted
+
+    def delete_many(self, candidate_ids: Collection[str]) -> int:
+        with self._tracked_write():
+            removed = self.engine.delete_many(candidate_ids)
+            self._update(lambda index: index.delete_many(candidate_ids))
+        return removed
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        matched = set()
+
+        def tracking(record: Dict) -> bool:
+            if predicate(record):
+                matched.add(record.get('id'))
+                return True
+            return False
+
+        with self._tracked_write():
+            removed = self.engine.delete_where(tracking)
+            self._update(lambda index: index.delete_many(matched))
+        return removed
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        now = datetime.now().isoformat()
+        with self._tracked_write():
+            expired = [record['id'] for record in self.engine.scan_range(None, cutoff)
+                       if datetime.fromisoformat(record.get('timestamp', now)) <= cutoff]
+            removed = self.engine.delete_older_than(cutoff)
+            self._update(lambda index: index.delete_many(expired))
+        return removed
+
+    def insert_many(self, records: Iterable[Dict]) -> int:
+        batch: List[Dict] = []
+
+        def indexed(records: Iterable[Dict]) -> Iterator[Dict]:
+            for record in records:
+                yield record
+                if record.get('id'):
+                    batch.append(record)
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    self._update(lambda index: index.upsert_many(batch))
+                    batch.clear()
+
+        with self._tracked_write():
+            written = self.engine.insert_many(indexed(records))
+            if batch:
+                self._update(lambda index: index.upsert_many(batch))
+        return written
+
+    def replace_all(self, records: List[Dict]) -> None:
+        # Not under the engine lock: the log engine waits for a running compaction, which needs it
+        with self._tracked_write(engine_lock=False):
+            self.engine.replace_all(records)
+            self._update(lambda index: index.rebuild(records))
+
+    def scan_page(self, after: Optional[str] = None, limit: int = 100,
+                  fields: Optional[Collection[str]] = None,
+                  filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        return self.engine.scan_page(after, limit, fields, filters)
+
+    def history(self) -> Iterator[Dict[str, Any]]:
+        return self.engine.history()
+
+    def keeps_history(self) -> bool:
+        return self.engine.keeps_history()
+
+    def scan(self) -> Iterator[Dict]:
+        return self.engine.scan()
+
+    def scan_range(self, start: datetime = None, end: datetime = None) -> Iterator[Dict]:
+        return self.engine.scan_range(start, end)
+
+    def count(self) -> int:
+        return self.engine.count()
+
+    def version(self) -> Any:
+        return self.engine.version()
+
+    def data_size(self) -> Optional[int]:
+        return self.engine.data_size()
+
+    def write_lock(self) -> ContextManager:
+        return self.engine.write_lock()
+
+    def close(self) -> None:
+        """Persist in-sync indexes for a fast next start, then close everything"""
+        with self._lock:
+            version = self.engine.version()
+            for index in self.indexes:
+                if version is not None and (index.shared or version == self._synced_version):
+                    index.persist(version)
+                index.close()
+        self.engine.close()
@@ -0,0 +1,159 @@
+"""
+Whole-file JSON storage backend (the original ``candidates.json`` format)
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..performance_optimizer import metrics
+from .base import Patch, StorageEngine
+from .json_stream import iter_json_array
+from .locking import FileLock, atomic_write_json
+from .records import apply_patch, merge_record
+
+
+class CorruptStoreError(RuntimeError):
+    """Raised when the candidates file exists but cannot be parsed"""
+
+
+class JsonFileStore(StorageEngine):
+    """
+    Stores every candidate in one indented JSON array.
+
+    Simple and human-readable, but every mutation reads and rewrites the
+    whole file, so writes are O(total candidates). Mutations run
+    load-modify-write under an advisory ``<file>.lock`` so several app
+    workers can share one data directory without losing updates, and the
+    file is replaced atomically so a crash never leaves it truncated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = FileLock(path + ".lock")
+
+    @metrics.timed("storage.read_file")
+    def _load(self) -> List[Dict]:
+        """Load existing candidate data from the JSON file"""
+        if not os.path.exists(self.path):
+            return []
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError as e:
+            # Never treat an unreadable store as empty: the next save would wipe it
+            raise CorruptStoreError(f"Cannot parse {self.path}: {e}") from e
+
+    @metrics.timed("storage.write_file")
+    def _save(self, candidates: List[Dict]) -> None:
+        """Atomically replace the JSON file"""
+        atomic_write_json(self.path, candidates, indent=2, ensure_ascii=False)
+
+    def _stream(self) -> Iterator[Dict]:
+        """Yield records one at a time without holding the whole file in memory"""
+        try:
+            # The open handle keeps reading the file it started on if a writer replaces it
+            yield from iter_json_array(self.path)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            raise CorruptStoreError(f"Cannot parse {self.path}: {e}") from e
+
+    @contextmanager
+    def _modify(self) -> Iterator[List[Dict]]:
+        """Load-modify-write under the store lock; saves the yielded list on success"""
+        with self._lock:
+            candidates = self._load()
+            yield candidates
+            self._save(candidates)
+
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """Return the record with ``candidate_id`` or None"""
+        for candidate in self._stream():
+            if candidate.get('id') == candidate_id:
+                return candidate
+        return None
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert ``record`` or merge it into the existing record with the same id"""
+        with self._modify() as candidates:
+            for i, candidate in enumerate(candidates):
+                if candidate.get('id') == record['id']:
+                    candidates[i] = merge_record(candidate, record)
+                    break
+            else:
+                candidates.append(dict(record))
+
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        """Update fields of an existing record; returns False if it does not exist"""
+        with self._lock:
+            candidates = self._load()
+            for i, candidate in enumerate(candidates):
+                if candidate.get('id') == candidate_id:
+                    candidates[i] = apply_patch(candidate, set_fields, merge_fields)
+                    self._save(candidates)
+                    return True
+        return False
+
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        """Apply every patch in one load-modify-write"""
+        patched = 0
+        with self._lock:
+            candidates = self._load()
+            for i, candidate in enumerate(candidates):
+                change = patches.get(candidate.get('id'))
+                if change is not None:
+                    candidates[i] = apply_patch(candidate, *change)
+                    patched += 1
+            if patched:
+                self._save(candidates)
+        return patched
+
+    def delete(self, candidate_id: str) -> bool:
+        """Remove one record; returns False if it does not exist"""
+        return self.delete_where(lambda candidate: candidate.get('id') == candidate_id) > 0
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        """Remove every record matching ``predicate``; returns how many were removed"""
+        with self._lock:
+            candidates = self._load()
+            kept = [candidate for candidate in candidates if not predicate(candidate)]
+            if len(kept) != len(candidates):
+                self._save(kept)
+        return len(candidates) - len(kept)
+
+    def scan(self) -> Iterator[Dict]:
+        """Stream all records in insertion order"""
+        return self._stream()
+
+    def count(self) -> int:
+        """Number of stored records"""
+        return sum(1 for _ in self._stream())
+
+    def data_size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def write_lock(self) -> FileLock:
+        """The store's re-entrant cross-process lock"""
+        return self._lock
+
+    def version(self) -> Any:
+        """File identity, mtime and size; every save replaces the file with a new inode"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def replace_all(self, records: List[Dict]) -> None:
+        """Replace the whole store with ``records`` (bulk load)"""
+        with self._lock:
+            self._save(records)
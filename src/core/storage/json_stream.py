@@ -0,0 +1,107 @@
+"""
+Streaming reader for large JSON array files
+
+``json.load`` holds the whole document, and every object in it, in memory
+at once. ``iter_json_array`` yields the elements of a top-level array one
+at a time while reading the file in fixed-size chunks, so memory stays at
+one chunk plus the largest element however big the file is.
+"""
+
+import json
+from typing import IO, Any, Iterator, Union
+
+# Characters read from the file per refill
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+
+def _iter_array(f: IO[str], chunk_size: int) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def refill() -> bool:
+        """Drop consumed text and append the next chunk; False at end of file"""
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        eof = not chunk
+        return not eof
+
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or not refill():
+                return
+
+    skip_whitespace()
+    if buffer[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Expected a top-level JSON array", buffer, pos)
+    pos += 1
+    expect_value = True  # Right after "[" or ","
+    first = True
+
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+        char = buffer[pos]
+        if char == "]" and (first or not expect_value):
+            pos += 1
+            skip_whitespace()
+            if pos < len(buffer):
+                raise json.JSONDecodeError("Extra data after the array", buffer, pos)
+            return
+        if not expect_value:
+            if char != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos)
+            pos += 1
+            expect_value = True
+            continue
+
+        # Decode the next element, reading more until it is complete. The element
+        # only counts once the "," or "]" after it is in the buffer: a number cut
+        # off by the chunk boundary ("1." of "1.5") decodes without error
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                follow = end
+                while follow < len(buffer) and buffer[follow] in _WHITESPACE:
+                    follow += 1
+                if follow < len(buffer) and buffer[follow] in ",]" or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            refill()  # At end of file the next attempt raises or accepts for good
+        yield value
+        pos = end
+        expect_value = False
+        first = False
+        if pos >= chunk_size:
+            buffer = buffer[pos:]
+            pos = 0
+
+
+def iter_json_array(source: Union[str, IO[str]], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of the top-level JSON array in ``source`` one at a time
+
+    Args:
+        source: File path or text file object positioned at the document start
+        chunk_size: Characters read per refill
+
+    Raises:
+        json.JSONDecodeError: The document is not a well-formed array (raised
+            when the bad part is reached, after earlier elements were yielded)
+    """
+    if not isinstance(source, str):
+        yield from _iter_array(source, chunk_size)
+        return
+    with open(source, "r", encoding="utf-8") as f:
+        yield from _iter_array(f, chunk_size)
@@ -0,0 +1,384 @@
+"""
+Append-only change-log storage backend
+
+Each mutation appends one JSON line to ``candidates.log.jsonl``. State lives
+in memory, rebuilt at startup from the last snapshot plus the log, and a
+background thread periodically compacts the log into a new snapshot.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Tuple
+
+from ..performance_optimizer import metrics
+from .base import Patch, StorageEngine
+from .json_stream import iter_json_array
+from .locking import FileLock
+from .records import apply_patch, merge_record
+
+
+class AppendOnlyLogStore(StorageEngine):
+    """
+    Candidate store whose writes cost O(size of the change), not O(store).
+
+    Files in ``data_dir``:
+        candidates.snapshot.jsonl      compacted state, one record per line
+        candidates.log.jsonl           live change log
+        candidates.log.<n>.jsonl       logs rotated out for a running compaction
+
+    Compaction rotates the live log, snapshots the in-memory state captured at
+    that instant on a background thread, then deletes the rotated logs. Replay
+    is idempotent, so a crash at any point recovers by replaying whatever logs
+    remain on top of the latest snapshot.
+
+    Several processes may share one directory: appends happen under an
+    advisory lock after catching up on lines other processes appended, and a
+    rotated log (different inode) is followed into its rotated file.
+    """
+
+    def __init__(self, data_dir: str, name: str = "candidates", compact_threshold: int = 5000,
+                 fsync: bool = False, legacy_file: Optional[str] = None):
+        self.snapshot_path = os.path.join(data_dir, f"{name}.snapshot.jsonl")
+        self.log_path = os.path.join(data_dir, f"{name}.log.jsonl")
+        self._rotated_pattern = os.path.join(data_dir, f"{name}.log.*.jsonl")
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = FileLock(os.path.join(data_dir, f"{name}.log.lock"))
+        self._compaction_lock = FileLock(os.path.join(data_dir, f"{name}.compact.lock"))
+        self._compaction_guard = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._ops_since_compaction = 0
+        self._version = 0
+
+        self._log = None
+        self._log_identity: Optional[Tuple[int, int]] = None
+        self._log_offset = 0
+
+        with self._lock:
+            self._load(legacy_file)
+            self._open_log()
+
+    # ------------------------------------------------------------------ #
+    # Startup and cross-process catch-up
+    # ------------------------------------------------------------------ #
+    def _load(self, legacy_file: Optional[str] = None) -> None:
+        """Rebuild in-memory state from snapshot and logs (caller holds the lock)"""
+        start = time.perf_counter()
+        self._records = {}
+        self._ops_since_compaction = 0
+        self._version += 1
+        rotated = sorted(glob.glob(self._rotated_pattern))
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records[record['id']] = record
+        elif legacy_file and os.path.exists(legacy_file) and not rotated \
+                and not os.path.exists(self.log_path):
+            # First start in log mode: import the whole-file JSON store once
+            for record in iter_json_array(legacy_file):
+                self._records[record['id']] = record
+            self._write_snapshot(list(self._records.values()))
+
+        for path in rotated:
+            self._replay(path, 0)
+        self._log_offset = 0
+        if os.path.exists(self.log_path):
+            self._log_offset = self._replay(self.log_path, 0)
+            if os.path.getsize(self.log_path) > self._log_offset:
+                # Drop a torn final line left by a crash so new appends start cleanly
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(self._log_offset)
+
+        metrics.observe("storage.log_replay", time.perf_counter() - start)
+
+    def _replay(self, path: str, offset: int) -> int:
+        """Apply complete lines of ``path`` from byte ``offset``; returns the new offset"""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                    self._ops_since_compaction += 1
+                except json.JSONDecodeError:
+                    print(f"Skipping corrupt line in {path}")
+        return offset
+
+    def _open_log(self) -> None:
+        """Open the live log for appending and remember which file it is"""
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, "ab")
+        stat = os.fstat(self._log.fileno())
+        self._log_identity = (stat.st_dev, stat.st_ino)
+
+    def _disk_state(self) -> Optional[Tuple[Tuple[int, int], int]]:
+        """(identity, size) of the live log on disk, or None if it is missing"""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_dev, stat.st_ino), stat.st_size
+
+    def _catch_up(self) -> None:
+        """Apply changes other processes made since we last looked (caller holds the lock)"""
+        disk = self._disk_state()
+        if disk and disk[0] == self._log_identity and disk[1] >= self._log_offset:
+            if disk[1] > self._log_offset:
+                self._log_offset = self._replay(self.log_path, self._log_offset)
+            return
+
+        # The log was rotated (or replaced) by another process: follow our old
+        # file into the rotated set if it still exists, otherwise reload
+        rotated = sorted(glob.glob(self._rotated_pattern))
+        ours = next((i for i, path in enumerate(rotated) if self._identity(path) == self._log_identity),
+                    None)
+        if ours is None:
+            self._load()
+        else:
+            self._replay(rotated[ours], self._log_offset)
+            for path in rotated[ours + 1:]:
+                self._replay(path, 0)
+            self._log_offset = self._replay(self.log_path, 0) if disk else 0
+        self._open_log()
+
+    @staticmethod
+    def _identity(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _refresh(self) -> None:
+        """Cheap pre-read check: catch up only if the log changed on disk"""
+        disk = self._disk_state()
+        if disk is None or disk[0] != self._log_identity or disk[1] != self._log_offset:
+            with self._lock:
+                self._catch_up()
+
+    # ------------------------------------------------------------------ #
+    # Mutations
+    # ------------------------------------------------------------------ #
+    def _apply(self, op: Dict[str, Any]) -> bool:
+        """Apply one change-log operation to memory (copy-on-write)"""
+        self._version += 1
+        kind = op['op']
+        if kind == 'upsert':
+            record = op['record']
+            self._records[record['id']] = merge_record(self._records.get(record['id']), record)
+            return True
+        if kind == 'patch':
+            existing = self._records.get(op['id'])
+            if existing is None:
+                return False
+            self._records[op['id']] = apply_patch(existing, op.get('set'), op.get('merge'))
+            return True
+        if kind == 'delete':
+            return self._records.pop(op['id'], None) is not None
+        raise ValueError(f"Unknown log operation: {kind}")
+
+    def _commit(self, op: Dict[str, Any]) -> bool:
+        """Append ``op`` to the log and apply it; returns the apply result"""
+        return self._commit_many([op]) == 1
+
+    def _commit_many(self, ops: List[Dict[str, Any]]) -> int:
+        """Append the ops that apply in one write; returns how many applied"""
+        lines = [json.dumps(op, ensure_ascii=False) for op in ops]
+        with self._lock:
+            self._catch_up()
+            # Apply the parsed lines so memory holds exactly what a replay would;
+            # ops that do not apply (missing ids) are not logged
+            applied = [line for line in lines if self._apply(json.loads(line))]
+            if not applied:
+                return 0
+            data = "".join(line + "\n" for line in applied).encode("utf-8")
+            with metrics.timer("storage.log_append"):
+                self._log.write(data)
+                self._log.flush()
+                if self.fsync:
+                    os.fsync(self._log.fileno())
+            self._log_offset += len(data)
+            self._ops_since_compaction += len(applied)
+            if self._ops_since_compaction >= self.compact_threshold:
+                self._ops_since_compaction = 0
+                self.compact()
+        return len(applied)
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert ``record`` or merge it into the existing record with the same id"""
+        self._commit({'op': 'upsert', 'record': record})
+
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        """Update fields of an existing record; returns False if it does not exist"""
+        return self._commit({'op': 'patch', 'id': candidate_id,
+                             'set': set_fields or {}, 'merge': merge_fields or {}})
+
+    def delete(self, candidate_id: str) -> bool:
+        """Remove one record; returns False if it does not exist"""
+        return self._commit({'op': 'delete', 'id': candidate_id})
+
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        """Append every patch in one write"""
+        return self._commit_many([{'op': 'patch', 'id': candidate_id, 'set': set_fields or {},
+                                   'merge': merge_fields or {}}
+                                  for candidate_id, (set_fields, merge_fields) in patches.items()])
+
+    def delete_many(self, candidate_ids: Collection[str]) -> int:
+        """Append every delete in one write"""
+        return self._commit_many([{'op': 'delete', 'id': candidate_id}
+                                  for candidate_id in dict.fromkeys(candidate_ids)])
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        """Remove every record matching ``predicate``; returns how many were removed"""
+        with self._lock:
+            self._catch_up()
+            return self.delete_many([cid for cid, record in self._records.items() if predicate(record)])
+
+    def replace_all(self, records: List[Dict]) -> None:
+        """Replace the whole store with ``records`` by writing a fresh snapshot"""
+        self._wait_for_compaction()
+        with self._compaction_lock, self._lock:
+            self._records = {record['id']: dict(record) for record in records}
+            self._version += 1
+            self._write_snapshot(list(self._records.values()))
+            for path in glob.glob(self._rotated_pattern):
+                os.remove(path)
+            # Swap in a new empty log file so other processes see a new inode and reload
+            empty_path = self.log_path + ".new"
+            open(empty_path, "wb").close()
+            os.replace(empty_path, self.log_path)
+            self._log_offset = 0
+            self._ops_since_compaction = 0
+            self._open_log()
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """Return a copy of the record with ``candidate_id`` or None"""
+        self._refresh()
+        record = self._records.get(candidate_id)
+        return dict(record) if record is not None else None
+
+    def scan(self) -> Iterator[Dict]:
+        """Iterate over copies of all records in insertion order"""
+        self._refresh()
+        records = list(self._records.values())
+        return (dict(record) for record in records)
+
+    def history(self) -> Iterator[Dict[str, Any]]:
+        """Snapshot records as upserts, then every logged operation in order"""
+        ops: List[Dict[str, Any]] = []
+        with self._lock:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, "rb") as f:
+                    ops.extend({'op': 'upsert', 'record': json.loads(line)}
+                               for line in f if line.strip())
+            for path in sorted(glob.glob(self._rotated_pattern)) + [self.log_path]:
+                if not os.path.exists(path):
+                    continue
+                with open(path, "rb") as f:
+                    for line in f:
+                        if not line.endswith(b"\n") or not line.strip():
+                            continue
+                        try:
+                            ops.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            print(f"Skipping corrupt line in {path}")
+        return iter(ops)
+
+    def count(self) -> int:
+        """Number of stored records"""
+        self._refresh()
+        return len(self._records)
+
+    def write_lock(self) -> FileLock:
+        """The store's re-entrant cross-process lock"""
+        return self._lock
+
+    def keeps_history(self) -> bool:
+        return True
+
+    def version(self) -> int:
+        """Counter of applied operations, including ones caught up from other processes"""
+        self._refresh()
+        return self._version
+
+    # ------------------------------------------------------------------ #
+    # Compaction
+    # ------------------------------------------------------------------ #
+    def compact(self, wait: bool = False) -> None:
+        """Start a background compaction unless one is already running"""
+        with self._compaction_guard:
+            thread = self._compaction_thread
+            if not (thread and thread.is_alive()):
+                thread = self._compaction_thread = threading.Thread(
+                    target=self._run_compaction, name="candidate-log-compaction", daemon=True)
+                thread.start()
+        if wait:
+            self._wait_for_compaction()
+
+    def _run_compaction(self) -> None:
+        """Rotate the log, write the snapshot, then drop the logs it supersedes"""
+        # Only one compaction at a time across all processes sharing the directory
+        if not self._compaction_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._catch_up()
+                rotated = f"{self.log_path[:-len('.jsonl')]}.{time.time_ns()}.jsonl"
+                self._log.close()
+                self._log = None
+                os.replace(self.log_path, rotated)
+                self._log_offset = 0
+                self._open_log()
+                # Records are never mutated in place, so this list is a stable view
+                state = list(self._records.values())
+                obsolete = sorted(glob.glob(self._rotated_pattern))
+
+            with metrics.timer("storage.log_compaction"):
+                self._write_snapshot(state)
+                for path in obsolete:
+                    os.remove(path)
+        except Exception as e:
+            print(f"Error compacting candidate log: {e}")
+        finally:
+            self._compaction_lock.release()
+
+    def _write_snapshot(self, records: List[Dict]) -> None:
+        """Atomically replace the snapshot file"""
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _wait_for_compaction(self) -> None:
+        """Block until a running compaction has finished"""
+        thread = self._compaction_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join()
+
+    def close(self) -> None:
+        """Finish any compaction and close the log"""
+        self._wait_for_compaction()
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
@@ -0,0 +1,71 @@
+"""
+In-memory storage backend for tests and benchmarks
+"""
+
+import copy
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base import StorageEngine
+from .records import apply_patch, merge_record
+
+
+class MemoryStore(StorageEngine):
+    """
+    Dict-backed store with no persistence.
+
+    Records are deep-copied on the way in and out so callers can never
+    mutate stored state, matching what a serializing backend would do.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._version = 0
+
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        with self._lock:
+            record = self._records.get(candidate_id)
+            return copy.deepcopy(record) if record is not None else None
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        record = copy.deepcopy(record)
+        with self._lock:
+            self._records[record['id']] = merge_record(self._records.get(record['id']), record)
+            self._version += 1
+
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        set_fields, merge_fields = copy.deepcopy(set_fields), copy.deepcopy(merge_fields)
+        with self._lock:
+            existing = self._records.get(candidate_id)
+            if existing is None:
+                return False
+            self._records[candidate_id] = apply_patch(existing, set_fields, merge_fields)
+            self._version += 1
+            return True
+
+    def scan(self) -> Iterator[Dict]:
+        with self._lock:
+            records = list(self._records.values())
+        return (copy.deepcopy(record) for record in records)
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._lock:
+            self._version += 1
+            return self._records.pop(candidate_id, None) is not None
+
+    def count(self) -> int:
+        return len(self._records)
+
+    def write_lock(self) -> threading.RLock:
+        return self._lock
+
+    def version(self) -> int:
+        return self._version
+
+    def replace_all(self, records: List[Dict]) -> None:
+        records = copy.deepcopy(records)
+        with self._lock:
+            self._records = {record['id']: record for record in records}
+            self._version += 1
@@ -0,0 +1,436 @@
+"""
+Time-partitioned storage backend
+
+Candidates are grouped by the day (or ISO week) of their ``timestamp`` into
+small JSON files, so retention drops whole partitions and date-range reads
+open only the partitions that overlap the range.
+"""
+
+import glob
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..performance_optimizer import metrics
+from .base import Patch, StorageEngine
+from .json_stream import iter_json_array
+from .locking import FileLock, atomic_write_json
+from .records import apply_patch, merge_record
+
+PARTITION_GRANULARITIES = ("day", "week")
+UNDATED = "undated"
+_DELETED = "-"
+
+
+def partition_key(timestamp: Optional[str], granularity: str = "day") -> str:
+    """Partition holding a record with this ISO ``timestamp``"""
+    if not timestamp:
+        return UNDATED
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return UNDATED
+    if granularity == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    return moment.date().isoformat()
+
+
+def partition_bounds(key: str) -> Optional[Tuple[datetime, datetime]]:
+    """``[start, end)`` covered by a partition key, or None for undated records"""
+    if key == UNDATED:
+        return None
+    if "-W" in key:
+        year, week = key.split("-W")
+        start = date.fromisocalendar(int(year), int(week), 1)
+        length = timedelta(days=7)
+    else:
+        start = date.fromisoformat(key)
+        length = timedelta(days=1)
+    start = datetime.combine(start, datetime.min.time())
+    return start, start + length
+
+
+class PartitionedStore(StorageEngine):
+    """
+    Candidate store split into per-day or per-week partitions.
+
+    Files in ``root``:
+        manifest.json     granularity and record count per partition
+        <key>.json        records of one partition (JSON array)
+        ids.log           append-only ``<id>\\t<partition>`` lines; last one wins
+
+    The id index lives in memory and is caught up from ``ids.log`` by byte
+    offset, so other processes' writes are picked up incrementally. Index
+    entries pointing at a dropped partition are treated as absent, which is
+    what makes dropping a partition O(1).
+    """
+
+    def __init__(self, root: str, granularity: str = "day", legacy_file: Optional[str] = None):
+        if granularity not in PARTITION_GRANULARITIES:
+            raise ValueError(f"Unknown partition granularity: {granularity}")
+        self.root = root
+        self.granularity = granularity
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.ids_path = os.path.join(root, "ids.log")
+        os.makedirs(root, exist_ok=True)
+        self._lock = FileLock(os.path.join(root, ".lock"))
+
+        self._partitions: Dict[str, int] = {}
+        self._manifest_version: Any = None
+        self._ids: Dict[str, str] = {}
+        self._ids_identity: Any = None
+        self._ids_offset = 0
+        self._ids_lines = 0
+
+        with self._lock:
+            self._sync()
+            if not os.path.exists(self.manifest_path):
+                self._save_manifest()
+                if legacy_file and os.path.exists(legacy_file):
+                    self.insert_many(iter_json_array(legacy_file))
+
+    # ------------------------------------------------------------------ #
+    # Manifest and id index
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _stat(path: str) -> Any:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _sync(self) -> None:
+        """Pick up manifest and index changes made by other processes"""
+        manifest_version = self._stat(self.manifest_path)
+        if manifest_version != self._manifest_version:
+            if manifest_version is not None:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                self.granularity = manifest.get('granularity', self.granularity)
+                self._partitions = manifest.get('partitions', {})
+            self._manifest_version = manifest_version
+
+        ids_stat = self._stat(self.ids_path)
+        if ids_stat is None:
+            self._ids, self._ids_identity, self._ids_offset, self._ids_lines = {}, None, 0, 0
+            return
+        if ids_stat[0] != self._ids_identity or ids_stat[2] < self._ids_offset:
+            # Rewritten by a compaction: reload from scratch
+            self._ids, self._ids_offset, self._ids_lines = {}, 0, 0
+            self._ids_identity = ids_stat[0]
+        if ids_stat[2] > self._ids_offset:
+            with open(self.ids_path, 'rb') as f:
+                f.seek(self._ids_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    self._ids_offset += len(line)
+                    self._ids_lines += 1
+                    candidate_id, _, key = line.decode('utf-8').rstrip("\n").partition("\t")
+                    if key == _DELETED:
+                        self._ids.pop(candidate_id, None)
+                    else:
+                        self._ids[candidate_id] = key
+
+    def _refresh(self) -> None:
+        """Cheap pre-read check: sync only if the manifest or index changed"""
+        ids_stat = self._stat(self.ids_path)
+        if (self._stat(self.manifest_path) != self._manifest_version
+                or (ids_stat and (ids_stat[0] != self._ids_identity or ids_stat[2] != self._ids_offset))):
+            with self._lock:
+                self._sync()
+
+    def _save_manifest(self) -> None:
+        atomic_write_json(self.manifest_path, {'granularity': self.granularity,
+                                               'partitions': self._partitions})
+        self._manifest_version = self._stat(self.manifest_path)
+
+    def _record_locations(self, changes: Dict[str, str]) -> None:
+        """Append id -> partition changes to the index (``_DELETED`` for removals)"""
+        if not changes:
+            return
+        data = "".join(f"{cid}\t{key}\n" for cid, key in changes.items()).encode('utf-8')
+        with open(self.ids_path, 'ab') as f:
+            f.write(data)
+        for candidate_id, key in changes.items():
+            if key == _DELETED:
+                self._ids.pop(candidate_id, None)
+            else:
+                self._ids[candidate_id] = key
+        self._ids_identity = self._stat(self.ids_path)[0]
+        self._ids_offset += len(data)
+        self._ids_lines += len(changes)
+        if self._ids_lines > 2 * len(self._ids) + 1000:
+            self._compact_index()
+
+    def _compact_index(self) -> None:
+        """Rewrite the index with only live entries"""
+        live = {cid: key for cid, key in self._ids.items() if key in self._partitions}
+        tmp_path = self.ids_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{cid}\t{key}\n" for cid, key in live.items())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.ids_path)
+        stat = self._stat(self.ids_path)
+        self._ids, self._ids_identity, self._ids_offset = live, stat[0], stat[2]
+        self._ids_lines = len(live)
+
+    def _location(self, candidate_id: str) -> Optional[str]:
+        key = self._ids.get(candidate_id)
+        return key if key in self._partitions else None
+
+    # ------------------------------------------------------------------ #
+    # Partition files
+    # ------------------------------------------------------------------ #
+    def _partition_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    @metrics.timed("storage.read_partition")
+    def _read_partition(self, key: str) -> List[Dict]:
+        try:
+            with open(self._partition_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    @metrics.timed("storage.write_partition")
+    def _write_partition(self, key: str, records: List[Dict]) -> None:
+        """Write one partition (removing it when empty) and update its manifest entry"""
+        if records:
+            atomic_write_json(self._partition_path(key), records, ensure_ascii=False)
+            self._partitions[key] = len(records)
+        else:
+            self._partitions.pop(key, None)
+            if os.path.exists(self._partition_path(key)):
+                os.remove(self._partition_path(key))
+
+    def _key_for(self, record: Dict[str, Any]) -> str:
+        return partition_key(record.get('timestamp'), self.granularity)
+
+    def _put(self, new_record: Dict[str, Any], old_key: Optional[str],
+             loaded: Dict[str, List[Dict]]) -> Optional[str]:
+        """Place ``new_record`` into ``loaded`` partitions; returns its key if it moved"""
+        candidate_id = new_record['id']
+        new_key = self._key_for(new_record)
+        if old_key is not None and old_key != new_key:
+            loaded[old_key] = [r for r in loaded[old_key] if r.get('id') != candidate_id]
+        if new_key not in loaded:
+            loaded[new_key] = self._read_partition(new_key)
+        target = loaded[new_key]
+        if old_key == new_key:
+            for i, record in enumerate(target):
+                if record.get('id') == candidate_id:
+                    target[i] = new_record
+                    return None
+        # The id index says the record is not in this partition yet
+        target.append(new_record)
+        return new_key if new_key != old_key else None
+
+    def _find(self, candidate_id: str) -> Tuple[Optional[str], Dict[str, List[Dict]], Optional[Dict]]:
+        """Locate a record: (partition key, {key: loaded records}, record)"""
+        key = self._location(candidate_id)
+        if key is None:
+            return None, {}, None
+        records = self._read_partition(key)
+        record = next((r for r in records if r.get('id') == candidate_id), None)
+        return key, {key: records}, record
+
+    def _commit(self, loaded: Dict[str, List[Dict]], moved: Dict[str, str]) -> None:
+        for key, records in loaded.items():
+            self._write_partition(key, records)
+        self._save_manifest()
+        self._record_locations(moved)
+
+    # ------------------------------------------------------------------ #
+    # StorageEngine interface
+    # ------------------------------------------------------------------ #
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """Read only the partition the id index points at"""
+        self._refresh()
+        return self._find(candidate_id)[2]
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._sync()
+            old_key, loaded, existing = self._find(record['id'])
+            moved_to = self._put(merge_record(existing, record), old_key, loaded)
+            self._commit(loaded, {record['id']: moved_to} if moved_to else {})
+
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        with self._lock:
+            self._sync()
+            old_key, loaded, existing = self._find(candidate_id)
+            if existing is None:
+                return False
+            moved_to = self._put(apply_patch(existing, set_fields, merge_fields), old_key, loaded)
+            self._commit(loaded, {candidate_id: moved_to} if moved_to else {})
+            return True
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._lock:
+            self._sync()
+            key, loaded, existing = self._find(candidate_id)
+            if existing is None:
+                return False
+            loaded[key] = [r for r in loaded[key] if r.get('id') != candidate_id]
+            self._commit(loaded, {candidate_id: _DELETED})
+            return True
+
+    def _group_by_partition(self, candidate_ids: Iterable[str]) -> Dict[str, List[str]]:
+        groups: Dict[str, List[str]] = {}
+        for candidate_id in candidate_ids:
+            key = self._location(candidate_id)
+            if key is not None:
+                groups.setdefault(key, []).append(candidate_id)
+        return groups
+
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        """Apply patches partition by partition, reading and writing each touched one once"""
+        patched = 0
+        with self._lock:
+            self._sync()
+            loaded: Dict[str, List[Dict]] = {}
+            moved: Dict[str, str] = {}
+            for key, candidate_ids in self._group_by_partition(patches).items():
+                if key not in loaded:
+                    loaded[key] = self._read_partition(key)
+                wanted = set(candidate_ids)
+                for record in [r for r in loaded[key] if r.get('id') in wanted]:
+                    moved_to = self._put(apply_patch(record, *patches[record['id']]), key, loaded)
+                    if moved_to:
+                        moved[record['id']] = moved_to
+                    patched += 1
+            self._commit(loaded, moved)
+        return patched
+
+    def delete_many(self, candidate_ids: Collection[str]) -> int:
+        """Rewrite only the partitions holding the ids; emptied partitions are dropped"""
+        removed: Dict[str, str] = {}
+        with self._lock:
+            self._sync()
+            for key, ids in self._group_by_partition(set(candidate_ids)).items():
+                ids = set(ids)
+                records = self._read_partition(key)
+                kept = [record for record in records if record.get('id') not in ids]
+                removed.update((r['id'], _DELETED) for r in records if r.get('id') in ids)
+                if len(kept) != len(records):
+                    self._write_partition(key, kept)
+            self._commit({}, removed)
+        return len(removed)
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        """Filter every partition; only partitions that lose records are rewritten"""
+        removed: Dict[str, str] = {}
+        with self._lock:
+            self._sync()
+            for key in sorted(self._partitions):
+                records = self._read_partition(key)
+                kept = [record for record in records if not predicate(record)]
+                if len(kept) != len(records):
+                    removed.update((r['id'], _DELETED) for r in records if predicate(r))
+                    self._write_partition(key, kept)
+            self._commit({}, removed)
+        return len(removed)
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Drop partitions that end before ``cutoff`` whole; filter only the one straddling it"""
+        removed = 0
+        dropped: Dict[str, str] = {}
+        with self._lock:
+            self._sync()
+            for key in sorted(self._partitions):
+                bounds = partition_bounds(key)
+                if bounds is None or bounds[0] > cutoff:
+                    continue
+                if bounds[1] <= cutoff:
+                    removed += self._partitions[key]
+                    self._write_partition(key, [])
+                    continue
+                records = self._read_partition(key)
+                expired = [datetime.fromisoformat(r['timestamp']) <= cutoff for r in records]
+                if any(expired):
+                    removed += sum(expired)
+                    dropped.update((r['id'], _DELETED) for r, gone in zip(records, expired) if gone)
+                    self._write_partition(key, [r for r, gone in zip(records, expired) if not gone])
+            self._commit({}, dropped)
+        return removed
+
+    def _keys_between(self, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+        keys = []
+        for key in sorted(self._partitions):
+            bounds = partition_bounds(key)
+            if start is None and end is None:
+                keys.append(key)
+            elif bounds is not None and (start is None or bounds[1] > start) \
+                    and (end is None or bounds[0] < end):
+                keys.append(key)
+        return keys
+
+    def scan(self) -> Iterator[Dict]:
+        """Stream every partition, oldest first, one partition in memory at a time"""
+        return self.scan_range()
+
+    def scan_range(self, start: datetime = None, end: datetime = None) -> Iterator[Dict]:
+        """Stream records of partitions overlapping ``[start, end)``; callers filter exact bounds"""
+        self._refresh()
+        for key in self._keys_between(start, end):
+            yield from self._read_partition(key)
+
+    def count(self) -> int:
+        """Sum of partition sizes from the manifest"""
+        self._refresh()
+        return sum(self._partitions.values())
+
+    def partitions(self) -> Dict[str, int]:
+        """Partition key -> record count"""
+        self._refresh()
+        return dict(self._partitions)
+
+    def write_lock(self) -> FileLock:
+        """The store's re-entrant cross-process lock"""
+        return self._lock
+
+    def version(self) -> Any:
+        """Every mutation rewrites the manifest, so its identity is the version"""
+        return self._stat(self.manifest_path)
+
+    def insert_many(self, records: Iterable[Dict]) -> int:
+        """Group records by partition and write each touched partition once"""
+        written = 0
+        with self._lock:
+            self._sync()
+            loaded: Dict[str, List[Dict]] = {}
+            moved: Dict[str, str] = {}
+            for record in records:
+                if not record.get('id'):
+                    continue
+                old_key = self._location(record['id'])
+                if old_key is not None and old_key not in loaded:
+                    loaded[old_key] = self._read_partition(old_key)
+                existing = next((r for r in loaded.get(old_key, []) if r.get('id') == record['id']),
+                                None)
+                moved_to = self._put(merge_record(existing, record), old_key, loaded)
+                if moved_to:
+                    moved[record['id']] = moved_to
+                    self._ids[record['id']] = moved_to
+                    self._partitions.setdefault(moved_to, 0)
+                written += 1
+            self._commit(loaded, moved)
+        return written
+
+    def replace_all(self, records: List[Dict]) -> None:
+        with self._lock:
+            for path in glob.glob(os.path.join(self.root, "*.json")):
+                if path != self.manifest_path:
+                    os.remove(path)
+            self._partitions = {}
+            if os.path.exists(self.ids_path):
+                os.remove(self.ids_path)
+            self._ids, self._ids_identity, self._ids_offset, self._ids_lines = {}, None, 0, 0
+            self._save_manifest()
+            self.insert_many(records)
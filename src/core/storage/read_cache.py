@@ -0,0 +1,300 @@
+"""
+Version-aware read cache in front of a storage engine
+
+``CachedStore`` keeps every record in memory together with running counts
+(total, completed, per interview stage). Writes made through it update the
+cache and counts incrementally; changes made elsewhere (another process,
+another store instance) show up as a new ``engine.version()`` and trigger a
+full reload on the next read. Steady-state reads cost one version check.
+A store larger than ``max_bytes`` on disk is not cached at all: reads then
+stream from the engine, so memory stays bounded.
+"""
+
+import bisect
+import copy
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Collection, ContextManager, Dict, Iterable, Iterator, List, Optional
+
+from ..performance_optimizer import metrics
+from .base import Patch, StorageEngine
+from .records import apply_patch, matches_filters, merge_record, project
+
+
+def candidate_stage(record: Dict[str, Any]) -> str:
+    """Interview stage a stored record has reached"""
+    if record.get('session_completed'):
+        return "completion"
+    if record.get('technical_responses'):
+        return "technical_questions"
+    return "tech_stack"
+
+
+def count_candidates(records: Iterable[Dict]) -> Dict[str, Any]:
+    """Count records in one pass: ``{'total', 'completed', 'stages': {stage: n}}``"""
+    stages = Counter(candidate_stage(record) for record in records)
+    return {
+        'total': sum(stages.values()),
+        'completed': stages.get("completion", 0),
+        'stages': dict(stages),
+    }
+
+
+def copy_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a cached record whose lists and dicts can be changed without touching the cache"""
+    return {key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()}
+
+
+class CachedStore(StorageEngine):
+    """
+    Caching decorator implementing the ``StorageEngine`` interface.
+
+    Each write holds the engine's write lock while it compares the engine
+    version before and after; if nothing else changed the store before the
+    write, the cache applies the same change locally, otherwise it is
+    invalidated.
+    """
+
+    def __init__(self, engine: StorageEngine, max_bytes: Optional[int] = None):
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._stages: Counter = Counter()
+        self._version: Any = None
+        # Ids in sorted order for keyset pages, valid for the records dict it was built from
+        self._sorted_ids: List[str] = []
+        self._sorted_source: Optional[Dict[str, Dict[str, Any]]] = None
+
+    # ------------------------------------------------------------------ #
+    # Cache maintenance
+    # ------------------------------------------------------------------ #
+    def _is_fresh(self) -> bool:
+        """True if the cache matches the engine (caller holds the lock)"""
+        if self._records is None:
+            return False
+        version = self.engine.version()
+        return version is not None and version == self._version
+
+    def _too_large(self) -> bool:
+        """True if the store is over ``max_bytes``; it is then read from the engine, never cached"""
+        if self.max_bytes is None:
+            return False
+        size = self.engine.data_size()
+        return size is not None and size > self.max_bytes
+
+    def _ensure_fresh(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Reload everything if the engine changed behind our back; None if the store is too large"""
+        if self._is_fresh():
+            metrics.increment("storage.read_cache.hits")
+            return self._records
+        metrics.increment("storage.read_cache.misses")
+        if self._too_large():
+            self._records = None
+            metrics.increment("storage.read_cache.bypassed")
+            return None
+        with metrics.timer("storage.read_cache_reload"):
+            version = self.engine.version()
+            records = {record['id']: record for record in self.engine.scan()}
+        self._records = records
+        self._stages = Counter(candidate_stage(record) for record in records.values())
+        self._version = version
+        return records
+
+    def _put(self, record: Dict[str, Any]) -> None:
+        old = self._records.get(record['id'])
+        if old is not None:
+            self._stages[candidate_stage(old)] -= 1
+        elif self._sorted_source is self._records:
+            bisect.insort(self._sorted_ids, record['id'])
+        self._records[record['id']] = record
+        self._stages[candidate_stage(record)] += 1
+
+    def _remove(self, candidate_id: str) -> None:
+        old = self._records.pop(candidate_id, None)
+        if old is not None:
+            self._stages[candidate_stage(old)] -= 1
+            if self._sorted_source is self._records:
+                del self._sorted_ids[bisect.bisect_left(self._sorted_ids, candidate_id)]
+
+    @contextmanager
+    def _tracked_write(self) -> Iterator[bool]:
+        """
+        Run an engine write; yields whether the cache may apply it locally
+
+        The caller applies its change to the cache only if the yielded flag
+        is True and the engine write succeeded. The engine's write lock is
+        held throughout, so no other worker can write between the version
+        checks and the write.
+        """
+        with self._lock, self.engine.write_lock():
+            before = self.engine.version() if self._records is not None else None
+            in_sync = before is not None and before == self._version
+            try:
+                yield in_sync
+            except BaseException:
+                self._records = None
+                raise
+            if in_sync and self._records is not None:
+                self._version = self.engine.version()
+            else:
+                self._records = None
+
+    # ------------------------------------------------------------------ #
+    # StorageEngine interface
+    # ------------------------------------------------------------------ #
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """Serve from the cache when it is current, otherwise ask the engine"""
+        with self._lock:
+            if self._is_fresh():
+                record = self._records.get(candidate_id)
+                return copy_record(record) if record is not None else None
+        return self.engine.get(candidate_id)
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        record = copy.deepcopy(record)
+        with self._tracked_write() as in_sync:
+            self.engine.upsert(record)
+            if in_sync:
+                self._put(merge_record(self._records.get(record['id']), record))
+
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        set_fields, merge_fields = copy.deepcopy(set_fields), copy.deepcopy(merge_fields)
+        with self._tracked_write() as in_sync:
+            patched = self.engine.patch(candidate_id, set_fields, merge_fields)
+            if in_sync and patched:
+                self._put(apply_patch(self._records[candidate_id], set_fields, merge_fields))
+        return patched
+
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        patches = copy.deepcopy(patches)
+        with self._tracked_write() as in_sync:
+            patched = self.engine.patch_many(patches)
+            if in_sync:
+                for candidate_id, change in patches.items():
+                    if candidate_id in self._records:
+                        self._put(apply_patch(self._records[candidate_id], *change))
+        return patched
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._tracked_write() as in_sync:
+            deleted = self.engine.delete(candidate_id)
+            if in_sync and deleted:
+                self._remove(candidate_id)
+        return deleted
+
+    def delete_many(self, candidate_ids: Collection[str]) -> int:
+        candidate_ids = set(candidate_ids)
+        with self._tracked_write() as in_sync:
+            removed = self.engine.delete_many(candidate_ids)
+            if in_sync:
+                for candidate_id in candidate_ids:
+                    self._remove(candidate_id)
+        return removed
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        with self._tracked_write() as in_sync:
+            removed = self.engine.delete_where(predicate)
+            if in_sync:
+                for candidate_id in [cid for cid, r in self._records.items() if predicate(r)]:
+                    self._remove(candidate_id)
+        return removed
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        now = datetime.now().isoformat()
+        with self._tracked_write() as in_sync:
+            removed = self.engine.delete_older_than(cutoff)
+            if in_sync:
+                for candidate_id in [cid for cid, r in self._records.items()
+                                     if datetime.fromisoformat(r.get('timestamp', now)) <= cutoff]:
+                    self._remove(candidate_id)
+        return removed
+
+    def scan_range(self, start: datetime = None, end: datetime = None) -> Iterator[Dict]:
+        """Served by the engine so time-partitioned engines can skip partitions"""
+        return self.engine.scan_range(start, end)
+
+    def insert_many(self, records: Iterable[Dict]) -> int:
+        with self._lock:
+            self._records = None
+            return self.engine.insert_many(records)
+
+    def replace_all(self, records: List[Dict]) -> None:
+        records = copy.deepcopy(records)
+        with self._lock:
+            self.engine.replace_all(records)
+            self._records = {record['id']: record for record in records}
+            self._stages = Counter(candidate_stage(record) for record in records)
+            self._version = self.engine.version()
+
+    def history(self) -> Iterator[Dict[str, Any]]:
+        return self.engine.history()
+
+    def keeps_history(self) -> bool:
+        return self.engine.keeps_history()
+
+    def scan(self) -> Iterator[Dict]:
+        """Iterate over copies of the cached records"""
+        with self._lock:
+            records = self._ensure_fresh()
+            if records is None:
+                return self.engine.scan()
+            records = list(records.values())
+        return (copy_record(record) for record in records)
+
+    def scan_page(self, after: Optional[str] = None, limit: int = 100,
+                  fields: Optional[Collection[str]] = None,
+                  filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Keyset page from a sorted id list kept alongside the cache: O(log n + page)"""
+        with self._lock:
+            records = self._ensure_fresh()
+            if records is None:
+                return self.engine.scan_page(after, limit, fields, filters)
+            if self._sorted_source is not records:
+                self._sorted_ids = sorted(records)
+                self._sorted_source = records
+            ids = self._sorted_ids
+            page: List[Dict] = []
+            position = 0 if after is None else bisect.bisect_right(ids, after)
+            while position < len(ids) and len(page) < limit:
+                record = records[ids[position]]
+                if matches_filters(record, filters):
+                    page.append(copy_record(project(record, fields)))
+                position += 1
+            return page
+
+    def count(self) -> int:
+        with self._lock:
+            records = self._ensure_fresh()
+            return self.engine.count() if records is None else len(records)
+
+    def counts(self) -> Dict[str, Any]:
+        """Total, completed and per-stage counts, maintained incrementally"""
+        with self._lock:
+            records = self._ensure_fresh()
+            if records is None:
+                return count_candidates(self.engine.scan())
+            stages = {stage: n for stage, n in self._stages.items() if n}
+            return {
+                'total': len(records),
+                'completed': stages.get("completion", 0),
+                'stages': stages,
+            }
+
+    def version(self) -> Any:
+        return self.engine.version()
+
+    def data_size(self) -> Optional[int]:
+        return self.engine.data_size()
+
+    def write_lock(self) -> ContextManager:
+        return self.engine.write_lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._records = None
+        self.engine.close()
@@ -0,0 +1,56 @@
+"""
+Record-level helpers shared by the candidate storage backends
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+def merge_record(existing: Optional[Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Upsert semantics: fields in ``record`` overwrite those of ``existing``"""
+    if existing is None:
+        return dict(record)
+    merged = dict(existing)
+    merged.update(record)
+    return merged
+
+
+def apply_patch(record: Dict[str, Any], set_fields: Optional[Dict[str, Any]] = None,
+                merge_fields: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Return a patched copy of ``record``
+
+    Args:
+        set_fields: Fields replaced outright
+        merge_fields: Dict-valued fields whose keys are merged into the existing dict
+    """
+    patched = dict(record)
+    if set_fields:
+        patched.update(set_fields)
+    for field, values in (merge_fields or {}).items():
+        patched[field] = {**(patched.get(field) or {}), **values}
+    return patched
+
+
+def project(record: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Copy of ``record`` with only ``id`` and ``fields`` (all fields if None)"""
+    if fields is None:
+        return dict(record)
+    projected = {'id': record['id']}
+    projected.update((field, record[field]) for field in fields if field in record)
+    return projected
+
+
+def matches_filters(record: Dict[str, Any], filters: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    True if ``record`` passes every equality filter
+
+    A list, tuple or set value accepts any of its members.
+    """
+    for field, expected in (filters or {}).items():
+        value = record.get(field)
+        if isinstance(expected, (list, tuple, set, frozenset)):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
@@ -0,0 +1,263 @@
+"""
+Full-text search over candidate tech stacks and interview answers
+
+An SQLite FTS5 index in ``data/search.db`` (shared by every app worker),
+kept current by ``IndexedStore`` on every save. Each candidate is one
+document with three weighted columns: skills (``tech_stack`` plus the raw
+tech-stack answer), position and answers (``technical_responses``).
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..performance_optimizer import metrics
+from .base import Patch
+from .indexed_store import INDEX_BATCH_SIZE, RecordIndex
+from .records import apply_patch, merge_record
+
+# Record fields the index keeps its own copy of
+SEARCH_FIELDS = ("tech_stack", "tech_stack_raw", "desired_position", "technical_responses")
+
+# bm25 weights for the skills, position and answers columns
+COLUMN_WEIGHTS = (3.0, 2.0, 1.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    rowid INTEGER PRIMARY KEY,
+    candidate_id TEXT NOT NULL UNIQUE,
+    fields TEXT NOT NULL,
+    skills TEXT,
+    position TEXT,
+    answers TEXT
+);
+-- "+" and "#" are part of a token so C++ and C# stay searchable
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    skills, position, answers,
+    content='search_docs', content_rowid='rowid',
+    tokenize="unicode61 tokenchars '+#'"
+);
+CREATE TRIGGER IF NOT EXISTS trg_search_docs_insert AFTER INSERT ON search_docs BEGIN
+    INSERT INTO search_fts(rowid, skills, position, answers)
+    VALUES (new.rowid, new.skills, new.position, new.answers);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_search_docs_delete AFTER DELETE ON search_docs BEGIN
+    INSERT INTO search_fts(search_fts, rowid, skills, position, answers)
+    VALUES ('delete', old.rowid, old.skills, old.position, old.answers);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_search_docs_update AFTER UPDATE ON search_docs BEGIN
+    INSERT INTO search_fts(search_fts, rowid, skills, position, answers)
+    VALUES ('delete', old.rowid, old.skills, old.position, old.answers);
+    INSERT INTO search_fts(rowid, skills, position, answers)
+    VALUES (new.rowid, new.skills, new.position, new.answers);
+END;
+CREATE TABLE IF NOT EXISTS search_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_UPSERT_SQL = """
+INSERT INTO search_docs (candidate_id, fields, skills, position, answers) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(candidate_id) DO UPDATE SET
+    fields = excluded.fields, skills = excluded.skills,
+    position = excluded.position, answers = excluded.answers
+"""
+
+_TOKEN_RE = re.compile(r"[\w+#]+\*?")
+
+
+@dataclass
+class SearchHit:
+    """One ranked result: higher ``score`` is a better match"""
+    candidate_id: str
+    score: float
+    snippet: str
+
+
+def fts5_available() -> bool:
+    """True if this Python's SQLite was built with FTS5"""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def build_match_query(text: str, match_all: bool = True) -> str:
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word is quoted, so FTS5 operators in user input are plain terms;
+    a trailing ``*`` keeps prefix matching (``pyth*``).
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+def _project(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: record[field] for field in SEARCH_FIELDS if field in record}
+
+
+def _document_row(candidate_id: str, fields: Dict[str, Any]) -> Tuple:
+    """Row for ``search_docs`` built from the indexed fields of one candidate"""
+    stack = fields.get('tech_stack') or []
+    skills = " ".join([str(tech) for tech in stack] + [str(fields.get('tech_stack_raw') or "")])
+    responses = fields.get('technical_responses') or {}
+    answers = "\n".join(str(answer) for answer in responses.values())
+    return (candidate_id, json.dumps(fields, ensure_ascii=False), skills.strip(),
+            str(fields.get('desired_position') or ""), answers)
+
+
+class SearchIndex(RecordIndex):
+    """
+    Ranked keyword search (BM25) over an FTS5 external-content table.
+
+    ``search_docs`` holds one row per candidate with the JSON of its indexed
+    fields, so patches (e.g. one more interview answer) are applied to that
+    copy without reading the candidate store. Triggers keep the FTS table in
+    step with ``search_docs``.
+    """
+
+    name = "search"
+
+    def __init__(self, db_path: Optional[str] = None):
+        # No path: a private in-memory database (for the memory backend)
+        self.db_path = db_path or f"file:search_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False, uri=self.db_path.startswith("file:"))
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _write(self, statements) -> None:
+        """Run ``statements(conn)`` in one write transaction"""
+        conn = self._connection()
+        with metrics.timer("storage.search_index_write"):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                statements(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _fields(conn: sqlite3.Connection, candidate_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT fields FROM search_docs WHERE candidate_id = ?",
+                           (candidate_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # ------------------------------------------------------------------ #
+    # RecordIndex interface
+    # ------------------------------------------------------------------ #
+    def upsert_many(self, records: Sequence[Dict[str, Any]]) -> None:
+        def statements(conn: sqlite3.Connection) -> None:
+            for record in records:
+                fields = merge_record(self._fields(conn, record['id']), _project(record))
+                conn.execute(_UPSERT_SQL, _document_row(record['id'], fields))
+        self._write(statements)
+
+    def patch_many(self, patches: Dict[str, Patch]) -> None:
+        relevant = {candidate_id: (_project(set_fields or {}), _project(merge_fields or {}))
+                    for candidate_id, (set_fields, merge_fields) in patches.items()}
+        relevant = {candidate_id: change for candidate_id, change in relevant.items() if any(change)}
+        if not relevant:
+            return  # Nothing searchable changed (completion flags, anonymized contact details)
+
+        def statements(conn: sqlite3.Connection) -> None:
+            for candidate_id, (set_fields, merge_fields) in relevant.items():
+                fields = self._fields(conn, candidate_id)
+                if fields is not None:
+                    fields = apply_patch(fields, set_fields, merge_fields)
+                    conn.execute(_UPSERT_SQL, _document_row(candidate_id, fields))
+        self._write(statements)
+
+    def delete_many(self, candidate_ids: Collection[str]) -> None:
+        self._write(lambda conn: conn.executemany(
+            "DELETE FROM search_docs WHERE candidate_id = ?",
+            ((candidate_id,) for candidate_id in candidate_ids)))
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        def statements(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM search_docs")
+            batch = []
+            for record in records:
+                if record.get('id'):
+                    batch.append(_document_row(record['id'], _project(record)))
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    conn.executemany(_UPSERT_SQL, batch)
+                    batch = []
+            conn.executemany(_UPSERT_SQL, batch)
+            conn.execute("INSERT INTO search_fts(search_fts) VALUES ('optimize')")
+            conn.execute("INSERT OR REPLACE INTO search_meta (key, value) VALUES ('state', 'built')")
+        with metrics.timer("storage.search_index_rebuild"):
+            self._write(statements)
+
+    def needs_rebuild(self, store_version: Any) -> bool:
+        row = self._connection().execute(
+            "SELECT value FROM search_meta WHERE key = 'state'").fetchone()
+        return row is None or row[0] != "built"
+
+    def mark_stale(self) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO search_meta (key, value) VALUES ('state', 'stale')")
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    @metrics.timed("storage.search")
+    def search(self, text: str, limit: int = 20, match_all: bool = True) -> List[SearchHit]:
+        """
+        Candidates matching the words in ``text``, best first
+
+        Args:
+            match_all: Require every word (AND); otherwise any word ranks (OR)
+        """
+        query = build_match_query(text, match_all)
+        if not query:
+            return []
+        weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+        conn = self._connection()
+        # Rank on rowids alone first: snippets are only built for the rows returned
+        ranked = conn.execute(f"""
+            SELECT rowid, bm25(search_fts, {weights}) AS rank FROM search_fts
+            WHERE search_fts MATCH ? ORDER BY rank LIMIT ?""", (query, limit)).fetchall()
+        if not ranked:
+            return []
+        placeholders = ", ".join("?" for _ in ranked)
+        details = {rowid: (candidate_id, snippet) for rowid, candidate_id, snippet in conn.execute(f"""
+            SELECT search_fts.rowid, d.candidate_id, snippet(search_fts, -1, '**', '**', '...', 12)
+            FROM search_fts JOIN search_docs d ON d.rowid = search_fts.rowid
+            WHERE search_fts MATCH ? AND search_fts.rowid IN ({placeholders})""",
+            (query, *(rowid for rowid, _ in ranked)))}
+        # bm25() is lower-is-better; flip it so scores read naturally
+        return [SearchHit(details[rowid][0], -rank, details[rowid][1])
+                for rowid, rank in ranked if rowid in details]
+
+    def document_count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
@@ -0,0 +1,360 @@
+"""
+Bitmap index over candidate skills, positions, experience and completion
+
+One bitmap per canonical technology, desired position, experience year and
+for completed interviews, so multi-criteria filters ("Kubernetes AND Go AND
+5+ years AND completed") are word-wise ANDs over packed ``uint64`` arrays
+instead of a scan over every record.
+
+Usage (offline rebuild, picked up on next start if the store is unchanged):
+    python -m src.core.storage.skill_index --data-dir data --backend json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..config import EXPERIENCE_BUCKETS
+from ..performance_optimizer import metrics
+from .base import Patch
+from .indexed_store import RecordIndex
+from .vocabulary import POSITIONS, TECHNOLOGIES
+
+UNKNOWN_EXPERIENCE = "unknown"
+_SNAPSHOT_FORMAT = 2  # 2: technologies fold TECH_ALIASES
+_FIELDS = ("skill", "position", "experience", "completed")
+
+
+def canonical_tech(name: Any) -> Optional[str]:
+    """Spelling used in ``TECH_CATEGORIES`` for ``name`` or one of its aliases (case-insensitive), or None"""
+    return TECHNOLOGIES.known_name(name)
+
+
+def normalize_position(position: Any) -> str:
+    """Canonical key of a desired position ("" if blank)"""
+    return POSITIONS.key(position)
+
+
+def experience_year(value: Any) -> str:
+    """Whole years of experience as a bitmap key, or ``UNKNOWN_EXPERIENCE``"""
+    try:
+        years = int(float(str(value).strip()))
+    except (TypeError, ValueError):
+        return UNKNOWN_EXPERIENCE
+    return str(years) if years >= 0 else UNKNOWN_EXPERIENCE
+
+
+def _field_values(field: str, record: Dict[str, Any]) -> Optional[List[str]]:
+    """Bitmap keys of one indexed field, or None if ``record`` does not carry it"""
+    if field == "skill":
+        if 'tech_stack' not in record:
+            return None
+        stack = record['tech_stack'] if isinstance(record['tech_stack'], list) else []
+        return sorted({tech for tech in map(TECHNOLOGIES.known_name, stack) if tech})
+    if field == "position":
+        if 'desired_position' not in record:
+            return None
+        position = normalize_position(record['desired_position'] or "")
+        return [position] if position else []
+    if field == "experience":
+        if 'experience_years' not in record:
+            return None
+        return [experience_year(record['experience_years'])]
+    if 'session_completed' not in record:
+        return None
+    return ["true"] if record['session_completed'] else []
+
+
+class _BitMatrix:
+    """Bitmaps for the values of one field: one row of packed uint64 words per value"""
+
+    def __init__(self, words: int, values: Sequence[str] = (), bits: np.ndarray = None):
+        self.rows: Dict[str, int] = {value: row for row, value in enumerate(values)}
+        self.bits = bits if bits is not None else np.zeros((len(self.rows), words), dtype=np.uint64)
+
+    def resize(self, words: int) -> None:
+        grown = np.zeros((self.bits.shape[0], words), dtype=np.uint64)
+        grown[:, :self.bits.shape[1]] = self.bits
+        self.bits = grown
+
+    def row(self, value: str) -> Optional[np.ndarray]:
+        row = self.rows.get(value)
+        return self.bits[row] if row is not None else None
+
+    def clear(self, word: int, mask: np.uint64) -> None:
+        self.bits[:, word] &= ~mask
+
+    def set(self, value: str, word: int, mask: np.uint64) -> None:
+        row = self.rows.get(value)
+        if row is None:
+            row = self.rows[value] = self.bits.shape[0]
+            self.bits = np.vstack([self.bits, np.zeros((1, self.bits.shape[1]), dtype=np.uint64)])
+        self.bits[row, word] |= mask
+
+
+class SkillIndex(RecordIndex):
+    """
+    In-memory bitmap index, rebuilt from the store when another worker writes.
+
+    Candidates get dense ordinals; bit ``n`` of every bitmap belongs to
+    ordinal ``n``. Deleted ordinals are cleared and reused only by a rebuild.
+    """
+
+    name = "skills"
+    shared = False
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self, words: int = 1) -> None:
+        self._ids: List[Optional[str]] = []
+        self._ordinals: Dict[str, int] = {}
+        self._live = np.zeros(words, dtype=np.uint64)
+        self._fields = {field: _BitMatrix(words) for field in _FIELDS}
+
+    @staticmethod
+    def _position(ordinal: int):
+        return ordinal >> 6, np.uint64(1 << (ordinal & 63))
+
+    def _ordinal(self, candidate_id: str) -> int:
+        """Ordinal of ``candidate_id``, allocating a new one (and growing bitmaps) if needed"""
+        ordinal = self._ordinals.get(candidate_id)
+        if ordinal is None:
+            ordinal = self._ordinals[candidate_id] = len(self._ids)
+            self._ids.append(candidate_id)
+            if (ordinal >> 6) >= len(self._live):
+                words = len(self._live) * 2
+                self._live = np.concatenate([self._live, np.zeros(words - len(self._live),
+                                                                  dtype=np.uint64)])
+                for matrix in self._fields.values():
+                    matrix.resize(words)
+            word, mask = self._position(ordinal)
+            self._live[word] |= mask
+        return ordinal
+
+    def _apply(self, ordinal: int, record: Dict[str, Any]) -> None:
+        word, mask = self._position(ordinal)
+        for field, matrix in self._fields.items():
+            values = _field_values(field, record)
+            if values is None:
+                continue
+            matrix.clear(word, mask)
+            for value in values:
+                matrix.set(value, word, mask)
+
+    # ------------------------------------------------------------------ #
+    # RecordIndex interface
+    # ------------------------------------------------------------------ #
+    def upsert_many(self, records: Sequence[Dict[str, Any]]) -> None:
+        with self._lock:
+            for record in records:
+                self._apply(self._ordinal(record['id']), record)
+
+    def patch_many(self, patches: Dict[str, Patch]) -> None:
+        with self._lock:
+            for candidate_id, (set_fields, _) in patches.items():
+                ordinal = self._ordinals.get(candidate_id)
+                # Indexed fields are scalars or lists, so only set_fields can change them
+                if ordinal is not None and set_fields:
+                    self._apply(ordinal, set_fields)
+
+    def delete_many(self, candidate_ids: Collection[str]) -> None:
+        with self._lock:
+            for candidate_id in candidate_ids:
+                ordinal = self._ordinals.pop(candidate_id, None)
+                if ordinal is None:
+                    continue
+                word, mask = self._position(ordinal)
+                self._live[word] &= ~mask
+                for matrix in self._fields.values():
+                    matrix.clear(word, mask)
+                self._ids[ordinal] = None
+
+    @metrics.timed("storage.skill_index_rebuild")
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Collect ordinals per value, then pack each bitmap in one go"""
+        ids: List[str] = []
+        ordinals: Dict[str, int] = {}
+        members: Dict[str, Dict[str, List[int]]] = {field: {} for field in _FIELDS}
+        for record in records:
+            candidate_id = record.get('id')
+            if not candidate_id:
+                continue
+            ordinal = ordinals.get(candidate_id)
+            if ordinal is None:
+                ordinal = ordinals[candidate_id] = len(ids)
+                ids.append(candidate_id)
+            for field in _FIELDS:
+                for value in _field_values(field, record) or ():
+                    members[field].setdefault(value, []).append(ordinal)
+
+        words = max(1, -(-len(ids) // 64))
+        live = np.zeros(words * 64, dtype=bool)
+        live[:len(ids)] = True
+
+        def pack(flags: np.ndarray) -> np.ndarray:
+            return np.packbits(flags, bitorder='little').view(np.uint64)
+
+        fields = {}
+        for field, values in members.items():
+            bits = np.zeros((len(values), words), dtype=np.uint64)
+            for row, value_ordinals in enumerate(values.values()):
+                flags = np.zeros(words * 64, dtype=bool)
+                flags[value_ordinals] = True
+                bits[row] = pack(flags)
+            fields[field] = _BitMatrix(words, list(values), bits)
+        with self._lock:
+            self._ids, self._ordinals = ids, ordinals
+            self._live, self._fields = pack(live), fields
+
+    def needs_rebuild(self, store_version: Any) -> bool:
+        """False only if a snapshot taken at ``store_version`` was loaded"""
+        return not (store_version is not None and self._load_snapshot(store_version))
+
+    def persist(self, store_version: Any) -> None:
+        """Write the bitmaps to ``snapshot_path`` (atomically), tagged with the store version"""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            arrays = {
+                'format': np.array(_SNAPSHOT_FORMAT),
+                'version': np.array(json.dumps(store_version)),
+                'ids': np.array([candidate_id or "" for candidate_id in self._ids], dtype=str),
+                'live': self._live,
+            }
+            for field, matrix in self._fields.items():
+                arrays[f"{field}.values"] = np.array(list(matrix.rows), dtype=str)
+                arrays[f"{field}.bits"] = matrix.bits
+            directory = os.path.dirname(self.snapshot_path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez_compressed(f, **arrays)
+                os.replace(tmp_path, self.snapshot_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    def _load_snapshot(self, store_version: Any) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with np.load(self.snapshot_path, allow_pickle=False) as snapshot:
+                if (int(snapshot['format']) != _SNAPSHOT_FORMAT
+                        or str(snapshot['version']) != json.dumps(store_version)):
+                    return False
+                with self._lock:
+                    self._ids = [candidate_id or None for candidate_id in snapshot['ids'].tolist()]
+                    self._ordinals = {cid: n for n, cid in enumerate(self._ids) if cid is not None}
+                    self._live = snapshot['live'].copy()
+                    self._fields = {field: _BitMatrix(len(self._live),
+                                                      snapshot[f"{field}.values"].tolist(),
+                                                      snapshot[f"{field}.bits"].copy())
+                                    for field in _FIELDS}
+            return True
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable skill index snapshot: {e}")
+            return False
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    def _union(self, field: str, values: Iterable[str]) -> np.ndarray:
+        result = np.zeros_like(self._live)
+        for value in values:
+            row = self._fields[field].row(value)
+            if row is not None:
+                result |= row
+        return result
+
+    @metrics.timed("storage.skill_filter")
+    def match(self, skills: Iterable[str] = (), positions: Iterable[str] = (),
+              min_experience: int = None, max_experience: int = None,
+              levels: Iterable[str] = (), completed: Optional[bool] = None) -> np.ndarray:
+        """
+        Bitmap of candidates matching every given criterion
+
+        Args:
+            skills: Technologies the candidate must all have (canonicalized)
+            positions: Desired positions, any of which matches (case-insensitive)
+            min_experience, max_experience: Inclusive range of whole years
+            levels: ``EXPERIENCE_BUCKETS`` names, any of which matches
+            completed: Only completed (True) or unfinished (False) interviews
+        """
+        with self._lock:
+            result = self._live.copy()
+            for skill in skills:
+                row = self._fields['skill'].row(canonical_tech(skill) or "")
+                if row is None:
+                    return np.zeros_like(self._live)
+                result &= row
+            positions = [normalize_position(position) for position in positions]
+            if positions:
+                result &= self._union('position', positions)
+            years = [value for value in self._fields['experience'].rows if value != UNKNOWN_EXPERIENCE]
+            if min_experience is not None or max_experience is not None:
+                low = min_experience if min_experience is not None else 0
+                high = max_experience if max_experience is not None else float("inf")
+                result &= self._union('experience', [y for y in years if low <= int(y) <= high])
+            levels = list(levels)
+            if levels:
+                bounds = [EXPERIENCE_BUCKETS[level] for level in levels]
+                result &= self._union('experience', [
+                    y for y in years
+                    if any(low <= int(y) and (high is None or int(y) < high) for low, high in bounds)])
+            if completed is not None:
+                done = self._union('completed', ["true"])
+                result &= done if completed else ~done
+            return result
+
+    def ids(self, bitmap: np.ndarray) -> List[str]:
+        """Candidate ids of the set bits, in ordinal (first indexed) order"""
+        ordinals = np.flatnonzero(np.unpackbits(bitmap.view(np.uint8), bitorder='little'))
+        with self._lock:
+            return [self._ids[ordinal] for ordinal in ordinals if ordinal < len(self._ids)]
+
+    @staticmethod
+    def count(bitmap: np.ndarray) -> int:
+        return int(np.unpackbits(bitmap.view(np.uint8)).sum())
+
+    def filter(self, **criteria) -> List[str]:
+        """Ids of candidates matching ``criteria`` (see ``match``)"""
+        return self.ids(self.match(**criteria))
+
+    def values(self, field: str) -> Dict[str, int]:
+        """Indexed values of a field ("skill", "position", "experience") and their candidate counts"""
+        with self._lock:
+            matrix = self._fields[field]
+            counts = {value: self.count(matrix.bits[row] & self._live)
+                      for value, row in matrix.rows.items()}
+        return {value: n for value, n in counts.items() if n}
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI: rebuild the skill index snapshot from a store without running the app"""
+    from . import SNAPSHOT_BACKENDS, STORAGE_ENGINES
+    from ..config import DATA_DIR, SKILL_INDEX_FILE, STORAGE_BACKEND
+
+    parser = argparse.ArgumentParser(description="Rebuild the candidate skill index")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--backend", default=STORAGE_BACKEND, choices=SNAPSHOT_BACKENDS)
+    args = parser.parse_args(argv)
+
+    engine = STORAGE_ENGINES[args.backend](args.data_dir)
+    index = SkillIndex(os.path.join(args.data_dir, SKILL_INDEX_FILE))
+    index.rebuild(engine.scan())
+    index.persist(engine.version())
+    print(f"Indexed {index.count(index.match())} candidates into {index.snapshot_path}")
+    engine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,585 @@
+"""
+SQLite storage backend with indexed candidate lookups
+
+Scalar fields live in typed, indexed columns; ``desired_position`` and
+``tech_stack`` are stored as ids into an interned ``vocabulary`` table (an
+integer and a compact JSON array of integers), ``technical_responses`` is a
+JSON column, and anything else a record carries is kept in an ``extra`` JSON
+column so records round-trip unchanged. Databases written before the
+vocabulary are converted when first opened.
+
+Usage (one-off migration from the JSON store):
+    python -m src.core.storage.sqlite_store --source data/candidates.json --db data/candidates.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import (Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple)
+
+from ..performance_optimizer import metrics
+from .base import Patch, StorageEngine
+from .json_stream import iter_json_array
+from .records import apply_patch, matches_filters, merge_record, project
+from .vocabulary import VOCABULARY_FIELDS, Vocabulary, interned_values
+
+# Column name -> SQL type; experience_years has no affinity so values round-trip as stored
+SCALAR_COLUMNS = {
+    "email": "TEXT",
+    "name": "TEXT",
+    "phone": "TEXT",
+    "experience_years": "",
+    "location": "TEXT",
+    "timestamp": "TEXT",
+    "session_completed": "INTEGER",
+}
+# Record field -> column holding its vocabulary id(s)
+VOCABULARY_COLUMNS = {"desired_position": "position_id", "tech_stack": "tech_ids"}
+JSON_COLUMNS = ("technical_responses",)
+ALL_COLUMNS = (("id",) + tuple(SCALAR_COLUMNS) + tuple(VOCABULARY_COLUMNS.values()) + JSON_COLUMNS
+               + ("extra",))
+# Column -> record field it holds
+COLUMN_FIELDS = {**{name: name for name in ALL_COLUMNS[:-1]},
+                 **{column: field for field, column in VOCABULARY_COLUMNS.items()}}
+
+_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {{table}} (
+    id TEXT PRIMARY KEY,
+    {", ".join(f"{name} {sql_type}".strip() for name, sql_type in SCALAR_COLUMNS.items())},
+    position_id INTEGER,
+    tech_ids TEXT,
+    {", ".join(f"{name} TEXT" for name in JSON_COLUMNS)},
+    extra TEXT
+);
+"""
+
+SCHEMA = _TABLE_SQL.format(table="candidates") + """
+-- Interned desired positions and tech names; append-only, ids are never reused
+CREATE TABLE IF NOT EXISTS vocabulary (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+CREATE INDEX IF NOT EXISTS idx_candidates_timestamp ON candidates(timestamp);
+CREATE INDEX IF NOT EXISTS idx_candidates_completed ON candidates(session_completed);
+
+-- Change counter shared by every connection, for cache invalidation
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+CREATE TRIGGER IF NOT EXISTS trg_candidates_insert AFTER INSERT ON candidates
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'version'; END;
+CREATE TRIGGER IF NOT EXISTS trg_candidates_update AFTER UPDATE ON candidates
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'version'; END;
+CREATE TRIGGER IF NOT EXISTS trg_candidates_delete AFTER DELETE ON candidates
+    BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'version'; END;
+"""
+
+_INSERT_SQL = (f"INSERT INTO candidates ({', '.join(ALL_COLUMNS)}) "
+               f"VALUES ({', '.join('?' for _ in ALL_COLUMNS)})")
+_UPDATE_SQL = (f"UPDATE candidates SET {', '.join(f'{c} = ?' for c in ALL_COLUMNS[1:])} "
+               f"WHERE id = ?")
+_SELECT_SQL = f"SELECT {', '.join(ALL_COLUMNS)} FROM candidates"
+
+# BEGIN IMMEDIATE taking longer than this (seconds) means it waited on another writer
+LOCK_WAIT_THRESHOLD = 0.001
+
+
+def record_to_row(record: Dict[str, Any], vocabulary: Vocabulary) -> Tuple:
+    """
+    Flatten a candidate dict into a row tuple ordered like ``ALL_COLUMNS``
+
+    Every position and tech name must already be in ``vocabulary``; values
+    that are not strings (or lists of strings) go to ``extra`` unencoded.
+    """
+    row = [record['id']]
+    for name in SCALAR_COLUMNS:
+        value = record.get(name)
+        row.append(int(value) if name == "session_completed" and value is not None else value)
+    known = set(ALL_COLUMNS)
+    for field in VOCABULARY_COLUMNS:
+        value = record.get(field)
+        terms = interned_values(field, value)
+        if terms is None:
+            row.append(None)
+            if value is None:
+                known.add(field)
+            continue
+        known.add(field)
+        ids = [vocabulary.id(term) for term in terms]
+        if None in ids:
+            raise KeyError(f"{field} value not in the vocabulary: {value!r}")
+        row.append(ids[0] if field == "desired_position" else json.dumps(ids, separators=(",", ":")))
+    for name in JSON_COLUMNS:
+        value = record.get(name)
+        row.append(json.dumps(value, ensure_ascii=False) if value is not None else None)
+    extra = {key: value for key, value in record.items() if key not in known}
+    row.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+    return tuple(row)
+
+
+def row_to_record(row: Tuple, vocabulary: Vocabulary,
+                  columns: Sequence[str] = ALL_COLUMNS) -> Dict[str, Any]:
+    """
+    Rebuild a candidate dict from a row tuple selected as ``columns``
+
+    Raises:
+        KeyError: A vocabulary id is not in ``vocabulary`` (added by another connection)
+    """
+    record: Dict[str, Any] = {}
+    for name, value in zip(columns, row):
+        if value is None:
+            continue
+        if name == "extra":
+            record.update(json.loads(value))
+        elif name == "position_id":
+            record['desired_position'] = vocabulary.decode((value,))[0]
+        elif name == "tech_ids":
+            record['tech_stack'] = vocabulary.decode(json.loads(value))
+        elif name in JSON_COLUMNS or name == "tech_stack":
+            record[name] = json.loads(value)
+        elif name == "session_completed":
+            record[name] = bool(value)
+        else:
+            record[name] = value
+    return record
+
+
+def _json_path(key: str) -> Optional[str]:
+    """JSON path of a top-level ``extra`` key, or None if the key would need escaping"""
+    return None if '"' in key or "\\" in key else f'$."{key}"'
+
+
+def column_update(set_fields: Optional[Dict[str, Any]], merge_fields: Optional[Dict[str, Dict[str, Any]]],
+                  vocabulary: Vocabulary) -> Optional[Tuple[str, List[Any]]]:
+    """
+    ``SET`` clause and parameters writing only the columns a patch touches
+
+    Fields kept in ``extra`` are changed in place with ``json_set`` /
+    ``json_remove``; merges into ``technical_responses`` use ``json_patch``.
+    Returns None when the patch cannot be expressed per column (an empty
+    patch, other merges, merge values that are dicts or None, a field also
+    merged, or a key needing escaping); the caller then rewrites the row.
+    """
+    set_fields, merge_fields = set_fields or {}, merge_fields or {}
+    if not set_fields and not merge_fields:
+        return None
+    assignments: List[str] = []
+    params: List[Any] = []
+    extra, extra_params = "COALESCE(extra, '{}')", []
+    for field, value in set_fields.items():
+        if field in merge_fields or (field in ALL_COLUMNS and field not in SCALAR_COLUMNS
+                                     and field not in JSON_COLUMNS):
+            return None  # Merged as well, or a column name (id, position_id, ...) used as a key
+        path = _json_path(field)
+        if path is None:
+            return None
+        if field in SCALAR_COLUMNS:
+            assignments.append(f"{field} = ?")
+            params.append(int(value) if field == "session_completed" and value is not None else value)
+        elif field in VOCABULARY_COLUMNS:
+            column = VOCABULARY_COLUMNS[field]
+            terms = interned_values(field, value)
+            if terms is None:
+                assignments.append(f"{column} = NULL")
+                if value is None:
+                    extra, extra_params = f"json_remove({extra}, ?)", extra_params + [path]
+                else:
+                    extra = f"json_set({extra}, ?, json(?))"
+                    extra_params += [path, json.dumps(value, ensure_ascii=False)]
+                continue
+            ids = [vocabulary.id(term) for term in terms]
+            if None in ids:
+                raise KeyError(f"{field} value not in the vocabulary: {value!r}")
+            assignments.append(f"{column} = ?")
+            params.append(ids[0] if field == "desired_position" else json.dumps(ids, separators=(",", ":")))
+            extra, extra_params = f"json_remove({extra}, ?)", extra_params + [path]
+        elif field in JSON_COLUMNS:
+            assignments.append(f"{field} = ?")
+            params.append(json.dumps(value, ensure_ascii=False) if value is not None else None)
+        else:
+            extra = f"json_set({extra}, ?, json(?))"
+            extra_params += [path, json.dumps(value, ensure_ascii=False)]
+    for field, values in merge_fields.items():
+        if field not in JSON_COLUMNS or any(v is None or isinstance(v, dict) for v in values.values()):
+            return None  # json_patch would delete (None) or merge (dict) where apply_patch replaces
+        assignments.append(f"{field} = json_patch(COALESCE({field}, '{{}}'), ?)")
+        params.append(json.dumps(values, ensure_ascii=False))
+    if extra_params:
+        assignments.append(f"extra = nullif({extra}, '{{}}')")
+        params += extra_params
+    return ", ".join(assignments), params
+
+
+def _all_strings(expected: Any) -> bool:
+    values = expected if isinstance(expected, (list, tuple, set, frozenset)) else [expected]
+    return all(isinstance(value, str) for value in values)
+
+
+class SqliteStore(StorageEngine):
+    """
+    Candidate store backed by SQLite in WAL mode.
+
+    Each thread gets its own connection; WAL lets readers proceed while a
+    writer commits, and every mutation touches a single indexed row.
+    """
+
+    def __init__(self, db_path: str, legacy_file: Optional[str] = None, batch_size: int = 1000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        is_new = not os.path.exists(db_path)
+        self.vocabulary = Vocabulary()
+        self._connection().executescript(SCHEMA)
+        self._migrate_to_vocabulary()
+        self._sync_vocabulary()
+        self._json_functions = self._has_json_functions()
+        if is_new and legacy_file and os.path.exists(legacy_file):
+            migrate_json_to_sqlite(legacy_file, self)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside one write transaction (a savepoint when nested in ``write_lock``)"""
+        conn = self._connection()
+        if conn.in_transaction:
+            conn.execute("SAVEPOINT nested_write")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK TO nested_write")
+                conn.execute("RELEASE nested_write")
+                raise
+            conn.execute("RELEASE nested_write")
+            return
+        start = time.perf_counter()
+        # Blocks (up to the connect timeout) while another thread or process holds the write lock
+        conn.execute("BEGIN IMMEDIATE")
+        waited = time.perf_counter() - start
+        if waited > LOCK_WAIT_THRESHOLD:
+            metrics.increment("storage.lock_contention")
+            metrics.observe("storage.lock_wait", waited)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """
+        Hold SQLite's write lock for a block; writes inside commit with it
+
+        Writes in the block run as savepoints of one ``BEGIN IMMEDIATE``
+        transaction, so other connections cannot write until it ends.
+        """
+        try:
+            with self._transaction():
+                yield
+        except BaseException:
+            # Terms interned in the block were rolled back with it
+            self.vocabulary = Vocabulary()
+            self._sync_vocabulary()
+            raise
+
+    def _sync_vocabulary(self) -> None:
+        """Load terms added since the last sync, by this or any other connection"""
+        self.vocabulary.update(self._connection().execute(
+            "SELECT id, term FROM vocabulary WHERE id > ? ORDER BY id", (self.vocabulary.max_id,)))
+
+    def _has_json_functions(self) -> bool:
+        """Whether this SQLite build has the JSON1 functions used for column-level patches"""
+        try:
+            self._connection().execute("SELECT json_patch('{}', '{}'), json_set('{}', '$.a', json('1'))")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _patch_row(self, conn: sqlite3.Connection, candidate_id: str, set_fields: Optional[Dict[str, Any]],
+                   merge_fields: Optional[Dict[str, Dict[str, Any]]]) -> bool:
+        """Apply one patch inside ``conn``'s transaction; only the touched columns are written"""
+        update = column_update(set_fields, merge_fields, self.vocabulary) if self._json_functions else None
+        if update is not None:
+            assignments, params = update
+            return conn.execute(f"UPDATE candidates SET {assignments} WHERE id = ?",
+                                params + [candidate_id]).rowcount > 0
+        existing = self._get(conn, candidate_id)
+        if existing is None:
+            return False
+        row = self._row(apply_patch(existing, set_fields, merge_fields))
+        conn.execute(_UPDATE_SQL, row[1:] + row[:1])
+        return True
+
+    def _intern(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add the positions and tech names of ``records`` to the vocabulary
+
+        Committed on their own, before the rows that use them: a term whose
+        row write then fails stays unused, which is harmless.
+        """
+        new = {term for record in records for field in VOCABULARY_FIELDS
+               for term in interned_values(field, record.get(field)) or ()
+               if term not in self.vocabulary}
+        if new:
+            with self._transaction() as conn:
+                conn.executemany("INSERT OR IGNORE INTO vocabulary (term) VALUES (?)",
+                                 ((term,) for term in new))
+            self._sync_vocabulary()
+
+    def _record(self, row: Tuple, columns: Sequence[str] = ALL_COLUMNS) -> Dict[str, Any]:
+        try:
+            return row_to_record(row, self.vocabulary, columns)
+        except KeyError:
+            self._sync_vocabulary()
+            return row_to_record(row, self.vocabulary, columns)
+
+    def _row(self, record: Dict[str, Any]) -> Tuple:
+        return record_to_row(record, self.vocabulary)
+
+    def _migrate_to_vocabulary(self) -> None:
+        """Convert a table with text positions and JSON tech stacks to vocabulary ids"""
+        conn = self._connection()
+        legacy = [row[1] for row in conn.execute("PRAGMA table_info(candidates)")]
+        if "tech_stack" not in legacy:
+            return
+        with metrics.timer("storage.sqlite_vocabulary_migration"):
+            def legacy_records() -> Iterator[Dict[str, Any]]:
+                cursor = self._connection().execute(
+                    f"SELECT {', '.join(legacy)} FROM candidates ORDER BY rowid")
+                while True:
+                    rows = cursor.fetchmany(self.batch_size)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield row_to_record(row, self.vocabulary, legacy)
+
+            self._intern(legacy_records())
+            with self._transaction() as conn:
+                conn.execute(_TABLE_SQL.format(table="candidates_vocab"))
+                conn.executemany(f"INSERT INTO candidates_vocab ({', '.join(ALL_COLUMNS)}) "
+                                 f"VALUES ({', '.join('?' for _ in ALL_COLUMNS)})",
+                                 (self._row(record) for record in legacy_records()))
+                # Drops the old table's indexes and triggers too; SCHEMA recreates them
+                conn.execute("DROP TABLE candidates")
+                conn.execute("ALTER TABLE candidates_vocab RENAME TO candidates")
+                conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+            conn.executescript(SCHEMA)
+
+    def _get(self, conn: sqlite3.Connection, candidate_id: str) -> Optional[Dict]:
+        row = conn.execute(f"{_SELECT_SQL} WHERE id = ?", (candidate_id,)).fetchone()
+        return self._record(row) if row else None
+
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """Return the record with ``candidate_id`` or None (primary-key lookup)"""
+        return self._get(self._connection(), candidate_id)
+
+    @metrics.timed("storage.sqlite_write")
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert ``record`` or merge it into the existing record with the same id"""
+        self._intern([record])
+        with self._transaction() as conn:
+            existing = self._get(conn, record['id'])
+            if existing is None:
+                conn.execute(_INSERT_SQL, self._row(record))
+            else:
+                row = self._row(merge_record(existing, record))
+                conn.execute(_UPDATE_SQL, row[1:] + row[:1])
+
+    @metrics.timed("storage.sqlite_write")
+    def patch(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+              merge_fields: Dict[str, Dict[str, Any]] = None) -> bool:
+        """Update fields of an existing record; returns False if it does not exist"""
+        self._intern([set_fields or {}])
+        with self._transaction() as conn:
+            return self._patch_row(conn, candidate_id, set_fields, merge_fields)
+
+    @metrics.timed("storage.sqlite_write")
+    def patch_many(self, patches: Dict[str, Patch]) -> int:
+        """Apply every patch in one transaction"""
+        self._intern(set_fields or {} for set_fields, _ in patches.values())
+        with self._transaction() as conn:
+            return sum(self._patch_row(conn, candidate_id, set_fields, merge_fields)
+                       for candidate_id, (set_fields, merge_fields) in patches.items())
+
+    def delete_many(self, candidate_ids: Collection[str]) -> int:
+        """Delete every id in one transaction"""
+        with self._transaction() as conn:
+            return sum(conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,)).rowcount
+                       for candidate_id in set(candidate_ids))
+
+    def delete(self, candidate_id: str) -> bool:
+        """Remove one record; returns False if it does not exist"""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,)).rowcount > 0
+
+    def delete_where(self, predicate: Callable[[Dict], bool]) -> int:
+        """Remove every record matching ``predicate``; returns how many were removed"""
+        return self.delete_many([record['id'] for record in self.scan() if predicate(record)])
+
+    def scan(self) -> Iterator[Dict]:
+        """Stream all records in insertion order, ``batch_size`` rows at a time"""
+        cursor = self._connection().execute(f"{_SELECT_SQL} ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._record(row)
+
+    def scan_page(self, after: Optional[str] = None, limit: int = 100,
+                  fields: Optional[Collection[str]] = None,
+                  filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """
+        Keyset page on the primary key, selecting only the needed columns
+
+        Filters on typed columns run in SQL; filters on fields kept in
+        ``extra`` are applied to the rows read, fetching on until the page is full.
+        """
+        filters = filters or {}
+        pushed = {field: value for field, value in filters.items()
+                  if field == "id" or field in SCALAR_COLUMNS
+                  or field == "desired_position" and _all_strings(value)}
+        residual = {field: value for field, value in filters.items() if field not in pushed}
+        if fields is None:
+            columns = ALL_COLUMNS
+        else:
+            wanted = set(fields) | set(residual)
+            columns = ("id",) + tuple(name for name in ALL_COLUMNS[1:-1] if COLUMN_FIELDS[name] in wanted)
+            # Values the vocabulary does not encode are kept in extra
+            if wanted - set(COLUMN_FIELDS.values()) or wanted & set(VOCABULARY_COLUMNS):
+                columns += ("extra",)
+
+        clauses, params = [], []
+        for field, expected in pushed.items():
+            values = list(expected) if isinstance(expected, (list, tuple, set, frozenset)) else [expected]
+            present = [int(value) if field == "session_completed" else value
+                       for value in values if value is not None]
+            if field == "desired_position":
+                if any(value not in self.vocabulary for value in present):
+                    self._sync_vocabulary()
+                # A position no candidate has ever had matches nothing
+                present = [term_id for term_id in map(self.vocabulary.id, present) if term_id is not None]
+                field = VOCABULARY_COLUMNS[field]
+            # Unary + keeps SQLite walking the primary key in page order instead of
+            # using (and then sorting) the low-cardinality completion index
+            column = f"+{field}" if field == "session_completed" else field
+            condition = f"{column} IN ({', '.join('?' for _ in present)})" if present else "0"
+            if len(present) < len(values):
+                condition = f"({column} IS NULL OR {condition})"
+            clauses.append(condition)
+            params.extend(present)
+        batch = max(limit, self.batch_size) if residual else limit
+        sql = (f"SELECT {', '.join(columns)} FROM candidates "
+               f"WHERE {' AND '.join(clauses + ['id > ?'])} ORDER BY id LIMIT ?")
+
+        conn = self._connection()
+        page: List[Dict] = []
+        while len(page) < limit:
+            rows = conn.execute(sql, (*params, "" if after is None else after, batch)).fetchall()
+            for row in rows:
+                record = self._record(row, columns)
+                if matches_filters(record, residual):
+                    page.append(project(record, fields))
+                    if len(page) == limit:
+                        break
+            if len(rows) < batch:
+                break
+            after = rows[-1][0]
+        return page
+
+    def count(self) -> int:
+        """Number of stored records"""
+        return self._connection().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def version(self) -> int:
+        """Change counter bumped by triggers on every row change, from any process"""
+        return self._connection().execute(
+            "SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+    def insert_many(self, records: Iterable[Dict]) -> int:
+        """Bulk insert/merge records in batched transactions; returns how many were written"""
+        written = 0
+        batch: List[Dict] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                written += self._insert_batch(batch)
+                batch = []
+        if batch:
+            written += self._insert_batch(batch)
+        return written
+
+    def _insert_batch(self, batch: List[Dict]) -> int:
+        self._intern(batch)
+        with self._transaction() as conn:
+            for record in batch:
+                existing = self._get(conn, record['id'])
+                if existing is None:
+                    conn.execute(_INSERT_SQL, self._row(record))
+                else:
+                    row = self._row(merge_record(existing, record))
+                    conn.execute(_UPDATE_SQL, row[1:] + row[:1])
+        return len(batch)
+
+    def replace_all(self, records: List[Dict]) -> None:
+        """Replace the whole store with ``records``"""
+        self._intern(records)
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM candidates")
+            conn.executemany(_INSERT_SQL, (self._row(record) for record in records))
+
+    def close(self) -> None:
+        """Close every thread's connection"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def iter_json_candidates(json_path: str) -> Iterator[Dict]:
+    """Stream candidate records from a ``candidates.json`` file of any size"""
+    return iter_json_array(json_path)
+
+
+def migrate_json_to_sqlite(json_path: str, store: SqliteStore) -> int:
+    """Copy every record of a JSON store into ``store`` in batched transactions"""
+    with metrics.timer("storage.sqlite_migration"):
+        return store.insert_many(
+            record for record in iter_json_candidates(json_path) if record.get('id'))
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI: migrate ``candidates.json`` into a SQLite database"""
+    parser = argparse.ArgumentParser(description="Migrate candidates.json to SQLite")
+    parser.add_argument("--source", default=os.path.join("data", "candidates.json"))
+    parser.add_argument("--db", default=os.path.join("data", "candidates.db"))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    store = SqliteStore(args.db, batch_size=args.batch_size)
+    migrated = migrate_json_to_sqlite(args.source, store)
+    print(f"Migrated {migrated} candidates into {args.db} ({store.count()} total)")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
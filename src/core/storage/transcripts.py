@@ -0,0 +1,114 @@
+"""
+Compressed per-session conversation transcripts, one file per candidate id
+
+Transcripts are kept out of the candidate store so records stay small:
+each session's full message list is written once, when it completes or
+the candidate leaves, as ``<dir>/<id[:2]>/<id>.json.gz`` (or ``.json.zst``
+with the optional ``zstandard`` package). They are only read when a
+reviewer asks for one.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..performance_optimizer import metrics
+from .locking import atomic_write_bytes
+
+TRANSCRIPT_CODECS = ("gzip", "zstd")
+_EXTENSIONS = {"gzip": ".json.gz", "zstd": ".json.zst"}
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd transcripts require zstandard (pip install zstandard)") from e
+    return zstandard
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=9).compress(data)
+    # mtime=0 keeps the output a function of the content alone
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class TranscriptStore:
+    """
+    Write-once, compressed transcripts keyed by candidate id.
+
+    Files are replaced atomically; reading detects the codec from the
+    extension, so changing ``codec`` keeps older transcripts readable.
+    """
+
+    def __init__(self, directory: str, codec: str = "gzip"):
+        if codec not in TRANSCRIPT_CODECS:
+            raise ValueError(f"Unknown transcript codec: {codec} (expected one of {TRANSCRIPT_CODECS})")
+        if codec == "zstd":
+            _zstd()
+        self.directory = directory
+        self.codec = codec
+
+    def _path(self, candidate_id: str, codec: str) -> str:
+        return os.path.join(self.directory, candidate_id[:2], candidate_id + _EXTENSIONS[codec])
+
+    def _existing(self, candidate_id: str) -> Optional[tuple]:
+        """(path, codec) of the stored transcript, or None"""
+        for codec in (self.codec, *(c for c in TRANSCRIPT_CODECS if c != self.codec)):
+            path = self._path(candidate_id, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    @metrics.timed("storage.save_transcript")
+    def save(self, candidate_id: str, messages: List[Dict[str, Any]]) -> int:
+        """
+        Store the transcript for ``candidate_id``, replacing an earlier one
+
+        Returns:
+            int: Compressed size in bytes
+        """
+        document = {'candidate_id': candidate_id, 'saved_at': datetime.now().isoformat(),
+                    'messages': messages}
+        data = _compress(self.codec, json.dumps(document, ensure_ascii=False).encode("utf-8"))
+        path = self._path(candidate_id, self.codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous = self._existing(candidate_id)
+        atomic_write_bytes(path, [data])
+        if previous and previous[0] != path:
+            os.remove(previous[0])
+        return len(data)
+
+    @metrics.timed("storage.load_transcript")
+    def load(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """The stored ``{'candidate_id', 'saved_at', 'messages'}``, or None if there is none"""
+        found = self._existing(candidate_id)
+        if found is None:
+            return None
+        path, codec = found
+        with open(path, "rb") as f:
+            return json.loads(_decompress(codec, f.read()))
+
+    def exists(self, candidate_id: str) -> bool:
+        return self._existing(candidate_id) is not None
+
+    def delete_many(self, candidate_ids: Iterable[str]) -> int:
+        """Remove the transcripts of ``candidate_ids``; returns how many existed"""
+        removed = 0
+        for candidate_id in candidate_ids:
+            for codec in TRANSCRIPT_CODECS:
+                try:
+                    os.remove(self._path(candidate_id, codec))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
@@ -0,0 +1,143 @@
+"""
+Interned vocabulary for repetitive candidate strings
+
+Tech stacks and desired positions repeat the same few hundred values
+across every candidate. The SQLite engine stores them as small integer
+ids into its ``vocabulary`` table; ``Vocabulary`` is each connection's
+in-memory copy of that table, used to encode on write and decode on
+read. Terms are kept exactly as entered ("python" and "Python" are
+separate entries) so records round-trip unchanged.
+
+``CanonicalTerms`` is the canonical side, shared by every backend: it folds
+case, whitespace and aliases ("golang", "Go ") to one code per
+technology or position, which the skill index and analytics group on.
+Each distinct spelling is folded once, however many records repeat it.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import TECH_ALIASES, TECH_CATEGORIES
+
+# Record field -> terms are interned when it holds a string (or a list of strings)
+VOCABULARY_FIELDS = ("desired_position", "tech_stack")
+
+
+def interned_values(field: str, value) -> Optional[List[str]]:
+    """Terms of ``value`` to intern, or None if it is stored as-is (not a string / list of strings)"""
+    if field == "tech_stack":
+        if isinstance(value, list) and all(isinstance(term, str) for term in value):
+            return value
+        return None
+    return [value] if isinstance(value, str) else None
+
+
+class Vocabulary:
+    """
+    Append-only mapping between terms and integer ids.
+
+    Ids are assigned by the database and never reused or reassigned, so a
+    copy that is behind only lacks newer terms; ``update`` adds those.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[int, str]] = ()):
+        self._terms: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._max_id = -1
+        self._lock = threading.Lock()
+        self.update(terms)
+
+    def update(self, terms: Iterable[Tuple[int, str]]) -> None:
+        """Add ``(id, term)`` pairs"""
+        with self._lock:
+            for term_id, term in terms:
+                self._terms[term_id] = term
+                self._ids[term] = term_id
+                self._max_id = max(self._max_id, term_id)
+
+    def id(self, term: str) -> Optional[int]:
+        return self._ids.get(term)
+
+    @property
+    def max_id(self) -> int:
+        """Largest assigned id, -1 when empty"""
+        return self._max_id
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def decode(self, ids: Sequence[int]) -> List[str]:
+        return [self._terms[term_id] for term_id in ids]
+
+
+def fold_term(term: Any) -> str:
+    """Comparison form of a term: whitespace collapsed, case folded"""
+    return " ".join(str(term).split()).casefold()
+
+
+class CanonicalTerms:
+    """
+    Canonical codes for the spellings of one field.
+
+    Spellings that fold to the same key (or are aliases of the same known
+    name) share a code. A code's label is the known name, or else the first
+    spelling seen for it with its whitespace collapsed. Codes are assigned
+    per process and never persisted; ``key`` is the stable form to store.
+    """
+
+    def __init__(self, known: Dict[str, str] = None):
+        self._known = {fold_term(spelling): name for spelling, name in (known or {}).items()}
+        # Spelling as given -> (code, known name or None, key); code -1 and key "" when blank
+        self._spellings: Dict[str, Tuple[int, Optional[str], str]] = {}
+        self._by_key: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+
+    def _entry(self, term: Any) -> Tuple[int, Optional[str], str]:
+        spelling = term if isinstance(term, str) else str(term)
+        entry = self._spellings.get(spelling)
+        if entry is None:
+            with self._lock:
+                name = self._known.get(fold_term(spelling))
+                key = fold_term(name if name is not None else spelling)
+                code = self._by_key.get(key, -1)
+                if code < 0 and key:
+                    code = self._by_key[key] = len(self._labels)
+                    self._labels.append(name if name is not None else " ".join(spelling.split()))
+                entry = self._spellings[spelling] = (code, name, key)
+        return entry
+
+    def code(self, term: Any) -> int:
+        """Code of ``term``, -1 if it is blank"""
+        return self._entry(term)[0]
+
+    def codes(self, terms: Sequence[Any]) -> np.ndarray:
+        """``code`` of every term as an int32 array"""
+        return np.fromiter((self._entry(term)[0] for term in terms), dtype=np.int32, count=len(terms))
+
+    def known_name(self, term: Any) -> Optional[str]:
+        """Known name ``term`` is a spelling or alias of, or None"""
+        return self._entry(term)[1]
+
+    def key(self, term: Any) -> str:
+        """Stable comparison key of ``term`` ("" if blank)"""
+        return self._entry(term)[2]
+
+    def labels(self) -> List[str]:
+        """Labels indexed by code"""
+        with self._lock:
+            return list(self._labels)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+
+# Technologies fold to their TECH_CATEGORIES spelling; positions only by case and whitespace
+TECHNOLOGIES = CanonicalTerms({**{tech: tech for techs in TECH_CATEGORIES.values() for tech in techs},
+                               **TECH_ALIASES})
+POSITIONS = CanonicalTerms()
@@ -0,0 +1,165 @@
+"""
+Write-behind buffer for candidate patches
+
+Turns that only need their data to be durable "soon" queue patches here
+instead of waiting on disk. Pending patches for the same candidate coalesce
+into one, and a background thread writes the whole batch with a single
+``patch_many`` call (one transaction, rewrite or append for all of them)
+when the buffer fills up or the flush interval elapses.
+"""
+
+import atexit
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..performance_optimizer import metrics
+from .base import StorageEngine
+from .records import apply_patch
+
+# Pending change for one candidate: (set_fields, merge_fields)
+PendingPatch = Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]
+
+_live_buffers: "weakref.WeakSet[WriteBehindBuffer]" = weakref.WeakSet()
+
+
+def combine_patches(older: PendingPatch, newer: PendingPatch) -> PendingPatch:
+    """Fold two patches into one with the same effect as applying both in order"""
+    set_fields = dict(older[0])
+    merge_fields = {field: dict(values) for field, values in older[1].items()}
+    for field, value in newer[0].items():
+        set_fields[field] = value
+        merge_fields.pop(field, None)
+    for field, values in newer[1].items():
+        if field in set_fields and isinstance(set_fields[field], dict):
+            set_fields[field] = {**set_fields[field], **values}
+        else:
+            merge_fields.setdefault(field, {}).update(values)
+    return set_fields, merge_fields
+
+
+class WriteBehindBuffer:
+    """
+    Coalescing queue of patches in front of a ``StorageEngine``.
+
+    Readers that must see queued changes pass records through ``overlay``.
+    ``close`` (also run at interpreter exit) drains everything still queued.
+    """
+
+    def __init__(self, store: StorageEngine, max_pending: int = 100, flush_interval: float = 0.5):
+        self.store = store
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, PendingPatch] = {}
+        # Batch being written by ``flush``; still overlaid until the store has it
+        self._flushing: Dict[str, PendingPatch] = {}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self.enqueued = 0  # Patches accepted so far; readers use it as a change counter
+        self._thread = threading.Thread(target=self._run, name="candidate-write-behind", daemon=True)
+        self._thread.start()
+        _live_buffers.add(self)
+
+    def enqueue(self, candidate_id: str, set_fields: Dict[str, Any] = None,
+                merge_fields: Dict[str, Dict[str, Any]] = None) -> None:
+        """Queue a patch; it is merged with any patch already pending for the candidate"""
+        patch = (dict(set_fields or {}), {k: dict(v) for k, v in (merge_fields or {}).items()})
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write-behind buffer is closed")
+            existing = self._pending.get(candidate_id)
+            self._pending[candidate_id] = combine_patches(existing, patch) if existing else patch
+            self.enqueued += 1
+            metrics.set_gauge("storage.write_behind_pending", len(self._pending))
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+
+    def pending_count(self) -> int:
+        """Number of candidates with changes queued or being written"""
+        with self._condition:
+            return len(self._pending) + len(self._flushing)
+
+    def pending_ids(self) -> List[str]:
+        """Ids of candidates with changes queued or being written"""
+        with self._condition:
+            return list({**self._flushing, **self._pending})
+
+    def overlay(self, record: Optional[Dict]) -> Optional[Dict]:
+        """Return ``record`` with its queued changes applied"""
+        if record is None:
+            return None
+        candidate_id = record.get('id')
+        with self._condition:
+            patches = [batch[candidate_id] for batch in (self._flushing, self._pending)
+                       if candidate_id in batch]
+        for patch in patches:
+            record = apply_patch(record, *patch)
+        return record
+
+    def overlay_all(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Apply queued changes to a stream of records"""
+        for record in records:
+            yield self.overlay(record)
+
+    def flush(self) -> int:
+        """Write every queued patch now; returns how many candidates were written"""
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+            if not batch:
+                return 0
+
+            failed: Dict[str, PendingPatch] = {}
+            with metrics.timer("storage.write_behind_flush"):
+                try:
+                    self.store.patch_many(batch)
+                except Exception as e:
+                    # Patch one by one so a single bad record does not hold back the rest
+                    print(f"Error flushing {len(batch)} queued change(s), retrying one by one: {e}")
+                    for candidate_id, (set_fields, merge_fields) in batch.items():
+                        try:
+                            self.store.patch(candidate_id, set_fields, merge_fields)
+                        except Exception as e:
+                            print(f"Error flushing queued changes for {candidate_id}: {e}")
+                            failed[candidate_id] = (set_fields, merge_fields)
+
+            with self._condition:
+                self._flushing = {}
+                # Retry failures on the next flush, ahead of anything queued since
+                for candidate_id, patch in failed.items():
+                    newer = self._pending.get(candidate_id)
+                    self._pending[candidate_id] = combine_patches(patch, newer) if newer else patch
+                metrics.set_gauge("storage.write_behind_pending", len(self._pending))
+            return len(batch) - len(failed)
+
+    def _run(self) -> None:
+        """Background loop: flush when full or when the interval elapses"""
+        while True:
+            with self._condition:
+                if not self._closed and len(self._pending) < self.max_pending:
+                    self._condition.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self) -> None:
+        """Stop the background thread after draining the queue"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        _live_buffers.discard(self)
+
+
+@atexit.register
+def _drain_all() -> None:
+    """Flush every open buffer when the interpreter shuts down"""
+    for buffer in list(_live_buffers):
+        buffer.close()
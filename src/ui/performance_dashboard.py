@@ -0,0 +1,117 @@
+"""
+Performance Dashboard for TalentScout Hiring Assistant
+Admin-only view over the shared metrics registry
+"""
+
+import streamlit as st
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+from src.core.config import PERF_DASHBOARD_REFRESH_SECONDS
+from src.core.performance_optimizer import metrics
+
+# Tile label -> (hits counter, misses counter) of each cache the app runs
+CACHE_COUNTERS = {
+    "Read Cache": ("storage.read_cache.hits", "storage.read_cache.misses"),
+    "Analytics Cache": ("analytics.cache_hits", "analytics.cache_misses"),
+}
+
+
+def _latency_table(histograms: Dict[str, Dict[str, float]], prefix: str,
+                   counters: Dict[str, int] = None) -> pd.DataFrame:
+    """Build a latency percentile table (in ms) for metrics under ``prefix``"""
+    rows = []
+    for name, summary in sorted(histograms.items()):
+        if not name.startswith(prefix):
+            continue
+        row = {
+            "Operation": name[len(prefix):],
+            "Calls": summary['count'],
+            "p50 (ms)": round(summary['p50'] * 1000, 1),
+            "p90 (ms)": round(summary['p90'] * 1000, 1),
+            "p99 (ms)": round(summary['p99'] * 1000, 1),
+            "Max (ms)": round(summary['max'] * 1000, 1),
+        }
+        if counters is not None:
+            row["Errors"] = counters.get(f"{name}.errors", 0)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _gauge_total(gauges: Dict[str, Dict[str, float]], name: str) -> float:
+    """Sum every label of a gauge"""
+    return sum(gauges.get(name, {}).values())
+
+
+def _hit_rate(counters: Dict[str, int], hits_name: str, misses_name: str) -> Tuple[str, str]:
+    """Hit rate of one cache as tile text, plus the counts behind it"""
+    hits = counters.get(hits_name, 0)
+    lookups = hits + counters.get(misses_name, 0)
+    return (f"{hits / lookups:.0%}" if lookups else "n/a"), f"{hits} hits / {lookups} lookups"
+
+
+def display_performance_summary(snapshot: Dict[str, Any]):
+    """Display the headline numbers as metric tiles"""
+    counters = snapshot['counters']
+    gauges = snapshot['gauges']
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Active Sessions", int(_gauge_total(gauges, 'sessions.active')))
+    col2.metric("LLM Queue Depth", int(_gauge_total(gauges, 'llm.in_flight')),
+                help="Model calls currently waiting on Gemini across all sessions")
+    session_memory = gauges.get('session.memory_bytes', {})
+    avg_kb = (sum(session_memory.values()) / len(session_memory) / 1024) if session_memory else 0
+    col3.metric("Avg Memory / Session", f"{avg_kb:.1f} KB")
+
+    for column, (label, (hits_name, misses_name)) in zip(st.columns(len(CACHE_COUNTERS)),
+                                                         CACHE_COUNTERS.items()):
+        hit_rate, counts = _hit_rate(counters, hits_name, misses_name)
+        column.metric(f"{label} Hit Rate", hit_rate, help=counts)
+
+
+def display_performance_tables(snapshot: Dict[str, Any]):
+    """Display latency percentiles per subsystem and memory per session"""
+    histograms = snapshot['histograms']
+    counters = snapshot['counters']
+
+    sections = [
+        ("🤖 LLM Latency by Call Type", "llm.", counters),
+        ("💬 Turn Latency by Stage", "turn.", None),
+        ("💾 Storage Operation Latency", "storage.", None),
+        ("⚡ Async Operations", "async.", None),
+    ]
+    for title, prefix, section_counters in sections:
+        st.markdown(f"#### {title}")
+        table = _latency_table(histograms, prefix, section_counters)
+        if table.empty:
+            st.caption("No data recorded yet")
+        else:
+            st.dataframe(table, use_container_width=True, hide_index=True)
+        if prefix == "storage.":
+            st.caption(f"Lock contention: {counters.get('storage.lock_contention', 0)} "
+                       f"write(s) waited for another writer")
+
+    st.markdown("#### 🧠 Memory per Session")
+    session_memory = snapshot['gauges'].get('session.memory_bytes', {})
+    if session_memory:
+        st.dataframe(pd.DataFrame([
+            {"Session": label, "Memory (KB)": round(value / 1024, 1)}
+            for label, value in sorted(session_memory.items())
+        ]), use_container_width=True, hide_index=True)
+    else:
+        st.caption("No active sessions")
+
+
+@st.fragment(run_every=PERF_DASHBOARD_REFRESH_SECONDS)
+def _display_live_metrics():
+    """Auto-refreshing body; reruns on its own without rerunning the app"""
+    snapshot = metrics.snapshot()
+    display_performance_summary(snapshot)
+    display_performance_tables(snapshot)
+    st.caption(f"Auto-refreshing every {PERF_DASHBOARD_REFRESH_SECONDS}s")
+
+
+def display_performance_dashboard():
+    """Display the complete admin performance page"""
+    st.markdown("## 📊 Performance Dashboard")
+    _display_live_metrics()
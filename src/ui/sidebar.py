@@ -4,6 +4,8 @@ Contains sidebar layout and functionality
 """
 
 import streamlit as st
+from src.core.config import ADMIN_MODE, TECH_CATEGORIES
+from src.core.profiler import profiler
 from .ui_components import display_system_status, display_stats, display_help_section
 
 
@@ -69,6 +71,154 @@ def display_control_buttons():
         st.rerun()
 
 
+def display_admin_controls():
+    """Display admin-only toggles (shown when TALENTSCOUT_ADMIN is enabled)"""
+    st.markdown("### 🛠️ Admin")
+    st.toggle("Show performance dashboard", key="show_performance_dashboard")
+    
+    # On-demand profiling of upcoming turns or whole reruns
+    col_turns, col_scope = st.columns(2)
+    with col_turns:
+        turns = st.number_input("Profile next", min_value=1, max_value=100, value=5, step=1)
+    with col_scope:
+        scope = st.selectbox("Scope", ["turn", "rerun"])
+    if st.button("Start Profiling", use_container_width=True):
+        profiler.arm(turns, scope)
+    if profiler.remaining:
+        st.caption(f"Profiling {profiler.remaining} more {profiler.scope}(s) → {profiler.output_dir}")
+    
+    display_candidate_browser()
+    display_search_controls()
+    display_filter_controls()
+    display_export_controls()
+
+
+# Columns the candidate browser shows; only these are read from the store
+BROWSER_FIELDS = ("name", "desired_position", "experience_years", "session_completed")
+
+
+def display_candidate_browser():
+    """Page through stored candidates, reading one page of the listed columns at a time"""
+    with st.expander("Browse candidates"):
+        completed_only = st.checkbox("Completed interviews only", key="browse_completed_only",
+                                     on_change=lambda: st.session_state.pop("browse_cursors", None))
+        # Cursors of the pages before the current one, for "Previous"
+        cursors = st.session_state.setdefault("browse_cursors", [None])
+        records, next_cursor = st.session_state.data_handler.get_candidates_page(
+            cursors[-1], fields=BROWSER_FIELDS,
+            filters={'session_completed': True} if completed_only else None)
+        if not records:
+            st.caption("No candidates")
+        for candidate in records:
+            status = "✅" if candidate.get('session_completed') else "⏳"
+            st.markdown(f"{status} **{candidate.get('name', candidate['id'])}** · "
+                        f"{candidate.get('desired_position', '')} · "
+                        f"{candidate.get('experience_years', '?')} yrs")
+        if records:
+            _display_transcript_viewer(records)
+        
+        col_prev, col_next = st.columns(2)
+        with col_prev:
+            if st.button("Previous", use_container_width=True, disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+        with col_next:
+            if st.button("Next", use_container_width=True, disabled=next_cursor is None):
+                cursors.append(next_cursor)
+                st.rerun()
+
+
+def _display_transcript_viewer(records):
+    """Show the stored conversation of one candidate on the page, read only once selected"""
+    labels = {candidate['id']: candidate.get('name', candidate['id']) for candidate in records}
+    selected = st.selectbox("Transcript", [None, *labels], key="browse_transcript",
+                            format_func=lambda candidate_id: "—" if candidate_id is None
+                            else labels[candidate_id])
+    if selected is None:
+        return
+    messages = st.session_state.data_handler.get_transcript(selected)
+    if messages is None:
+        st.caption("No transcript stored for this candidate")
+        return
+    for message in messages:
+        speaker = "🧑" if message['role'] == "user" else "🤖"
+        st.markdown(f"{speaker} {message['message']}")
+
+
+def display_search_controls():
+    """Ranked keyword search over tech stacks, positions and interview answers"""
+    with st.expander("Search candidates"):
+        query = st.text_input("Keywords", placeholder="e.g. kubernetes terraform", key="search_query")
+        match_any = st.checkbox("Match any keyword", key="search_match_any")
+        if not query:
+            return
+        try:
+            results = st.session_state.data_handler.search_candidates(query, limit=10,
+                                                                      match_all=not match_any)
+        except RuntimeError as e:
+            st.warning(str(e))
+            return
+        if not results:
+            st.caption("No matching candidates")
+        for candidate in results:
+            st.markdown(f"**{candidate.get('name', candidate['id'])}** · "
+                        f"{candidate.get('desired_position', '')}")
+            st.caption(candidate['search_snippet'])
+
+
+ALL_TECHNOLOGIES = sorted(tech for techs in TECH_CATEGORIES.values() for tech in techs)
+
+
+def display_filter_controls():
+    """Multi-criteria candidate filter backed by the bitmap skill index"""
+    with st.expander("Filter candidates"):
+        skills = st.multiselect("Skills (all of)", ALL_TECHNOLOGIES, key="filter_skills")
+        min_experience = st.number_input("Min. years of experience", min_value=0, max_value=50,
+                                         value=0, key="filter_min_experience")
+        completed_only = st.checkbox("Completed interviews only", key="filter_completed_only")
+        if not skills and not min_experience and not completed_only:
+            return
+        data_handler = st.session_state.data_handler
+        ids = data_handler.filter_candidate_ids(skills=skills, min_experience=min_experience or None,
+                                                completed=True if completed_only else None)
+        st.caption(f"{len(ids):,} matching candidates")
+        for candidate in filter(None, map(data_handler.get_candidate_info, ids[:10])):
+            st.markdown(f"**{candidate.get('name', candidate['id'])}** · "
+                        f"{candidate.get('experience_years', '?')} yrs · "
+                        f"{', '.join(candidate.get('tech_stack') or [])}")
+
+
+def display_export_controls():
+    """Start a background candidate export and show its progress"""
+    with st.expander("Export candidates"):
+        fmt = st.selectbox("Format", ["csv", "parquet"], key="export_format")
+        date_range = st.date_input("Interview dates", value=(), key="export_dates")
+        completed_only = st.checkbox("Completed interviews only", key="export_completed_only")
+        
+        job = st.session_state.get("export_job")
+        running = job is not None and not job.done
+        if st.button("Start Export", use_container_width=True, disabled=running):
+            start_date, end_date = (tuple(date_range) + (None, None))[:2]
+            st.session_state.export_job = job = st.session_state.data_handler.start_export(
+                fmt=fmt, start_date=start_date, end_date=end_date or start_date,
+                completed_only=completed_only)
+        _display_export_progress()
+
+
+@st.fragment(run_every=1)
+def _display_export_progress():
+    """Poll the running export once a second without rerunning the app"""
+    job = st.session_state.get("export_job")
+    if job is None:
+        return
+    if job.status == "running":
+        st.progress(job.progress, text=f"Exported {job.rows_written:,} rows...")
+    elif job.status == "done":
+        st.success(f"Exported {job.rows_written:,} rows to {job.path}")
+    else:
+        st.error(f"Export failed: {job.error}")
+
+
 def display_sidebar():
     """Display the complete sidebar"""
     with st.sidebar:
@@ -91,12 +241,16 @@ def display_sidebar():
         
         # Statistics
         try:
-            candidates = st.session_state.data_handler.get_all_candidates()
-            candidates_count = len(candidates) if candidates else 0
-            display_stats(candidates_count)
+            counts = st.session_state.data_handler.get_candidate_counts()
+            display_stats(counts['total'])
         except:
             display_stats(0)
         
+        # Admin section
+        if ADMIN_MODE:
+            st.markdown("---")
+            display_admin_controls()
+        
         # Help section
         st.markdown("---")
         st.markdown("### 💡 Need Help?")
@@ -0,0 +1,44 @@
+"""
+Tests for the offline LLM backends: recording and replaying cassettes
+"""
+
+import pytest
+
+from src.core import llm_backends
+from src.core.llm_backends import (CassetteMissError, RecordingModel, ReplayModel, StubResponse,
+                                   prompt_hash, read_cassette)
+
+
+class _CountingModel:
+    """Returns "answer N" for the Nth call"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        return StubResponse(f"answer {self.calls}")
+
+
+def test_record_and_replay_round_trip(tmp_path, monkeypatch):
+    """Recorded exchanges replay by canonical prompt, cycling repeats, without sleeping"""
+    cassette = str(tmp_path / "cassettes" / "day.jsonl")
+    recorder = RecordingModel(_CountingModel(), cassette)
+    assert recorder.generate_content("Extract the name\n    from: Jane").text == "answer 1"
+    assert recorder.generate_content("Extract the name from: Jane").text == "answer 2"
+    recorder.record_turn("s1", "Jane")
+
+    entries = list(read_cassette(cassette))
+    assert [entry["type"] for entry in entries] == ["llm", "llm", "turn"]
+    assert entries[0]["hash"] == entries[1]["hash"] == prompt_hash("  Extract the name from:\tJane ")
+
+    sleeps = []
+    monkeypatch.setattr(llm_backends.time, "sleep", sleeps.append)
+    replay = ReplayModel(cassette, latency_scale=0)
+    responses = [replay.generate_content("Extract the name from: Jane").text for _ in range(3)]
+    assert responses == ["answer 1", "answer 2", "answer 1"]
+    assert sleeps == [] and replay.hits == 3
+
+    with pytest.raises(CassetteMissError):
+        replay.generate_content("Never recorded")
+    assert replay.misses == 1
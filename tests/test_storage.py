@@ -0,0 +1,835 @@
+"""
+Tests for the candidate storage backends and DataHandler delegation
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.core import candidate_ids
+from src.core.candidate_ids import split_id_collisions
+from src.core.data_handler import DataHandler
+from src.core.data_quality import apply_fixes
+from src.core.privacy_manager import PrivacyJob
+from src.core.storage import (AppendOnlyLogStore, CorruptStoreError, JsonFileStore, PartitionedStore,
+                              SkillIndex, WriteBehindBuffer, combine_patches, iter_json_array)
+from src.core.storage.records import apply_patch
+
+
+@pytest.fixture(params=["json", "log", "sqlite", "partitioned", "memory"])
+def handler(request, tmp_path):
+    """DataHandler on a temporary directory for each backend"""
+    data_handler = DataHandler(data_dir=str(tmp_path), backend=request.param)
+    yield data_handler
+    data_handler.close()
+
+
+def _candidate(email="jane@example.com", **fields):
+    return {"name": "Jane", "email": email, "tech_stack": ["Python"], **fields}
+
+
+def test_save_and_get_candidate(handler):
+    """Saved candidates can be read back by id and merged on re-save"""
+    candidate = _candidate()
+    assert handler.save_candidate_info(candidate)
+    assert handler.get_candidate_info(candidate["id"])["name"] == "Jane"
+
+    handler.save_candidate_info(_candidate(location="Berlin"))
+    stored = handler.get_candidate_info(candidate["id"])
+    assert stored["location"] == "Berlin"
+    assert len(handler.get_all_candidates()) == 1
+
+
+def test_responses_and_completion(handler):
+    """Responses merge into the stored dict and completion is recorded"""
+    candidate = _candidate()
+    handler.save_candidate_info(candidate)
+    handler.update_candidate_responses(candidate["id"], {"question_1": "a"})
+    handler.update_candidate_responses(candidate["id"], {"question_2": "b"})
+    handler.mark_session_complete(candidate["id"])
+
+    stored = handler.get_candidate_info(candidate["id"])
+    assert stored["technical_responses"] == {"question_1": "a", "question_2": "b"}
+    assert stored["session_completed"] is True
+
+
+def test_cleanup_old_sessions(handler):
+    """Only records older than the cutoff are removed"""
+    handler.save_candidate_info(_candidate("new@example.com"))
+    old = _candidate("old@example.com")
+    old["id"] = handler.generate_candidate_id(old["email"])
+    old["timestamp"] = "2000-01-01T00:00:00"
+    handler.storage.upsert(old)
+    handler.save_transcript(old["id"], [{"role": "user", "content": "hi"}])
+    deletes = []
+    handler.storage.delete_many = lambda ids: deletes.append(ids)
+
+    assert handler.cleanup_old_sessions(days_old=30) == 1
+    assert [c["email"] for c in handler.get_all_candidates()] == ["new@example.com"]
+    assert handler.get_transcript(old["id"]) is None
+    assert deletes == []  # One delete_older_than, not per-id batches
+
+
+def test_log_store_replays_after_restart_and_compaction(tmp_path):
+    """State survives a restart, both before and after compaction"""
+    store = AppendOnlyLogStore(str(tmp_path), compact_threshold=3)
+    for i in range(5):
+        store.upsert({"id": f"c{i}", "n": i})
+    store.patch("c1", set_fields={"n": 10}, merge_fields={"r": {"q": "a"}})
+    store.delete("c0")
+    store.compact(wait=True)
+    store.patch("c2", set_fields={"n": 20})
+    store.close()
+
+    reopened = AppendOnlyLogStore(str(tmp_path))
+    assert reopened.count() == 4
+    assert reopened.get("c1") == {"id": "c1", "n": 10, "r": {"q": "a"}}
+    assert reopened.get("c2")["n"] == 20
+    assert reopened.get("c0") is None
+    reopened.close()
+
+
+def test_sqlite_migration_from_json(tmp_path):
+    """An existing candidates.json is imported when the database is created"""
+    json_handler = DataHandler(data_dir=str(tmp_path), backend="json")
+    for i in range(3):
+        json_handler.save_candidate_info(_candidate(f"c{i}@example.com", extra_field=i))
+    json_handler.close()
+
+    sqlite_handler = DataHandler(data_dir=str(tmp_path), backend="sqlite")
+    records = sqlite_handler.get_all_candidates()
+    assert [r["email"] for r in records] == [f"c{i}@example.com" for i in range(3)]
+    assert records[2]["extra_field"] == 2 and records[2]["tech_stack"] == ["Python"]
+    sqlite_handler.close()
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda path: JsonFileStore(str(path / "candidates.json")),
+    lambda path: AppendOnlyLogStore(str(path), compact_threshold=25),
+], ids=["json", "log"])
+def test_concurrent_writers_lose_no_updates(tmp_path, make_store):
+    """Separate store instances (as in separate workers) never overwrite each other"""
+    stores = [make_store(tmp_path) for _ in range(4)]
+
+    def write(worker, store):
+        for i in range(30):
+            store.upsert({"id": f"w{worker}-{i}", "n": i})
+
+    threads = [threading.Thread(target=write, args=(w, s)) for w, s in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for store in stores:
+        assert store.count() == 120
+    for store in stores:
+        store.close()
+    reopened = make_store(tmp_path)
+    assert reopened.count() == 120
+    reopened.close()
+
+
+def test_complete_session_is_written_behind(tmp_path):
+    """Queued completion is visible immediately and durable after close"""
+    handler = DataHandler(data_dir=str(tmp_path), backend="json", write_behind=True)
+    candidate = _candidate()
+    handler.save_candidate_info(candidate)
+    handler.complete_session(candidate["id"], {"question_1": "a"})
+    handler.complete_session(candidate["id"], {"question_2": "b"})
+
+    assert handler.get_candidate_info(candidate["id"])["session_completed"] is True
+    handler.close()
+
+    reopened = DataHandler(data_dir=str(tmp_path), backend="json", write_behind=False)
+    stored = reopened.get_candidate_info(candidate["id"])
+    assert stored["technical_responses"] == {"question_1": "a", "question_2": "b"}
+    assert stored["session_completed"] is True
+    reopened.close()
+
+
+def test_write_behind_flushes_a_batch_in_one_write(tmp_path, monkeypatch):
+    """Queued patches for many candidates reach the JSON file in one rewrite"""
+    store = JsonFileStore(str(tmp_path / "candidates.json"))
+    store.insert_many([{"id": f"c{i}", "technical_responses": {}} for i in range(20)])
+    buffer = WriteBehindBuffer(store, flush_interval=60)
+    for i in range(20):
+        buffer.enqueue(f"c{i}", {"session_completed": True}, {"technical_responses": {"q1": "a"}})
+
+    saves = []
+    save = store._save
+    monkeypatch.setattr(store, "_save", lambda records: saves.append(len(records)) or save(records))
+    assert buffer.flush() == 20
+    assert saves == [20]
+    assert all(record["session_completed"] for record in store.scan())
+
+    # A failing batch write falls back to one patch per candidate
+    def fail(patches):
+        raise OSError("disk full")
+    monkeypatch.setattr(store, "patch_many", fail)
+    buffer.enqueue("c0", {"notes": "x"})
+    buffer.enqueue("c1", {"notes": "y"})
+    assert buffer.flush() == 2 and buffer.pending_count() == 0
+    assert store.get("c1")["notes"] == "y"
+    buffer.close()
+
+
+def test_combine_patches_matches_sequential_application():
+    """A coalesced patch has the same effect as applying its parts in order"""
+    record = {"id": "c1", "r": {"q0": "x"}, "n": 1}
+    first = ({"n": 2}, {"r": {"q1": "a"}})
+    second = ({"r": {"only": "set"}}, {})
+    third = ({}, {"r": {"q2": "b"}})
+
+    sequential = apply_patch(apply_patch(apply_patch(record, *first), *second), *third)
+    combined = combine_patches(combine_patches(first, second), third)
+    assert apply_patch(record, *combined) == sequential
+
+
+def test_candidate_counts(handler):
+    """Counts track saves, responses, completion and cleanup incrementally"""
+    first, second = _candidate("a@example.com"), _candidate("b@example.com")
+    handler.save_candidate_info(first)
+    handler.save_candidate_info(second)
+    handler.update_candidate_responses(first["id"], {"question_1": "a"})
+    handler.complete_session(second["id"], {"question_1": "b"})
+
+    counts = handler.get_candidate_counts()
+    assert counts == {"total": 2, "completed": 1,
+                      "stages": {"technical_questions": 1, "completion": 1}}
+
+
+@pytest.mark.parametrize("backend", ["json", "log", "sqlite", "partitioned"])
+def test_read_cache_sees_writes_from_other_processes(tmp_path, backend):
+    """A write by a separate engine instance invalidates the shared cache"""
+    from src.core.storage import STORAGE_ENGINES
+
+    handler = DataHandler(data_dir=str(tmp_path), backend=backend)
+    handler.save_candidate_info(_candidate("a@example.com"))
+    assert handler.get_candidate_counts()["total"] == 1
+
+    other = STORAGE_ENGINES[backend](str(tmp_path))
+    other.upsert({"id": "external", "email": "x@example.com", "session_completed": True})
+    other.close()
+
+    assert handler.get_candidate_counts()["completed"] == 1
+    assert handler.get_candidate_info("external")["email"] == "x@example.com"
+    assert len(handler.get_all_candidates()) == 2
+    handler.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "log", "sqlite", "partitioned"])
+def test_read_cache_write_is_not_raced_by_other_workers(tmp_path, backend):
+    """Another worker's write cannot land between a cached write's version checks"""
+    import time
+
+    from src.core.storage import STORAGE_ENGINES
+    from src.core.storage.read_cache import CachedStore
+
+    engine = STORAGE_ENGINES[backend](str(tmp_path))
+    cache = CachedStore(engine)
+    cache.upsert({"id": "a", "email": "a@example.com", "tech_stack": ["Python"]})
+    assert cache.count() == 1
+
+    other = STORAGE_ENGINES[backend](str(tmp_path))
+    writer = threading.Thread(target=other.upsert, args=({"id": "b", "email": "b@example.com"},))
+    version = engine.version
+
+    def racing_version():
+        # The other worker tries to write right after the "before" check
+        if not writer.is_alive() and writer.ident is None:
+            writer.start()
+            time.sleep(0.2)
+        return version()
+
+    engine.version = racing_version
+    cache.patch("a", {"phone": "555"})
+    engine.version = version
+    writer.join()
+    other.close()
+
+    assert cache.get("b") is not None and cache.count() == 2
+    cache.get("a")["tech_stack"].append("Go")
+    assert next(r for r in cache.scan() if r["id"] == "a")["tech_stack"] == ["Python"]
+    cache.close()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_streaming_export_filters_and_projects(tmp_path, fmt):
+    """Exports honour the projection and filters and run as a background job"""
+    import pandas as pd
+
+    handler = DataHandler(data_dir=str(tmp_path), backend="memory")
+    for i, day in enumerate(["2024-01-01", "2024-01-15", "2024-02-01"]):
+        record = _candidate(f"c{i}@example.com", timestamp=f"{day}T12:00:00",
+                            session_completed=i != 1, experience_years=i + 1)
+        record["id"] = f"c{i}"
+        handler.storage.upsert(record)
+
+    path = str(tmp_path / f"export.{fmt}")
+    job = handler.start_export(path, fmt=fmt, columns=["email", "tech_stack"],
+                               start_date="2024-01-01", end_date="2024-01-31", completed_only=True)
+    assert job.wait(timeout=10) and job.status == "done" and job.progress == 1.0
+
+    frame = pd.read_csv(path) if fmt == "csv" else pd.read_parquet(path)
+    assert list(frame.columns) == ["email", "tech_stack"]
+    assert frame["email"].tolist() == ["c0@example.com"]
+
+    if fmt == "parquet":
+        typed = str(tmp_path / "typed.parquet")
+        assert handler.export_candidates(typed, fmt="parquet", columns=["experience_years", "timestamp"]) == 3
+        frame = pd.read_parquet(typed)
+        assert frame["experience_years"].tolist() == [1.0, 2.0, 3.0]
+        assert pd.api.types.is_datetime64_any_dtype(frame["timestamp"])
+    handler.close()
+
+
+def test_export_end_date_is_inclusive(tmp_path):
+    """A datetime end includes a record stamped exactly at it; a date end covers the whole day"""
+    from datetime import datetime
+
+    handler = DataHandler(data_dir=str(tmp_path), backend="partitioned", write_behind=False)
+    handler.storage.upsert(dict(_candidate("edge@example.com", timestamp="2024-02-01T12:00:00"), id="edge"))
+    path = str(tmp_path / "edge.csv")
+    exported = lambda end_date: handler.export_candidates(path, columns=["email"], end_date=end_date)
+
+    assert exported(datetime(2024, 2, 1, 12)) == 1
+    assert exported("2024-02-01T12:00:00") == 1
+    assert exported("2024-02-01T11:59:59.999999") == 0
+    assert exported("2024-02-01") == 1 and exported("2024-01-31") == 0
+    assert exported(None) == 1
+    handler.close()
+
+
+def test_analytics_aggregations_and_invalidation(tmp_path):
+    """Aggregations are correct, cached, and rebuilt after a write"""
+    handler = DataHandler(data_dir=str(tmp_path), backend="memory")
+    rows = [("a", "Backend", "1", ["python", "Django"], True),
+            ("b", "Backend", 4, ["Python"], False),
+            ("c", "Frontend", "ten", ["React", "python"], True)]
+    for email, position, years, stack, completed in rows:
+        handler.save_candidate_info(_candidate(f"{email}@example.com", desired_position=position,
+                                               experience_years=years, tech_stack=stack))
+        if completed:
+            handler.mark_session_complete(handler.generate_candidate_id(f"{email}@example.com"))
+
+    analytics = handler.get_analytics()
+    skills = analytics.skill_frequency()
+    assert skills.iloc[0].tolist() == ["Python", 3, 1.0]
+    levels = dict(zip(*analytics.experience_distribution()[["level", "candidates"]].T.values))
+    assert levels == {"beginner": 1, "intermediate": 1, "advanced": 0, "unknown": 1}
+    rates = analytics.completion_rate_by_position().set_index("desired_position")
+    assert rates.loc["Backend", "completion_rate"] == 0.5
+    assert analytics.time_to_complete()["count"].iloc[0] == 2
+
+    handler.mark_session_complete(handler.generate_candidate_id("b@example.com"))
+    rates = analytics.completion_rate_by_position().set_index("desired_position")
+    assert rates.loc["Backend", "completion_rate"] == 1.0
+    handler.close()
+
+
+def test_partitioned_retention_and_range_scan(tmp_path):
+    """Retention drops old partitions whole; range scans skip other partitions"""
+    from datetime import datetime
+
+    store = PartitionedStore(str(tmp_path))
+    for i, day in enumerate(["2024-01-01", "2024-01-02", "2024-01-03"]):
+        store.upsert({"id": f"c{i}", "timestamp": f"{day}T10:00:00"})
+    store.upsert({"id": "c0", "timestamp": "2024-01-03T09:00:00"})
+    assert store.partitions() == {"2024-01-02": 1, "2024-01-03": 2}
+
+    in_range = store.scan_range(datetime(2024, 1, 3), datetime(2024, 1, 4))
+    assert sorted(r["id"] for r in in_range) == ["c0", "c2"]
+
+    assert store.delete_older_than(datetime(2024, 1, 3, 9, 30)) == 2
+    assert store.partitions() == {"2024-01-03": 1}
+    assert store.get("c1") is None and store.get("c2")["id"] == "c2"
+
+
+def test_bulk_privacy_jobs_and_resume(handler):
+    """Bulk anonymize/purge run in batches; an interrupted job resumes from its checkpoint"""
+    ids = []
+    for i in range(7):
+        candidate = _candidate(f"c{i}@example.com", desired_position="QA" if i % 2 else "Dev")
+        handler.save_candidate_info(candidate)
+        ids.append(candidate["id"])
+
+    job = handler.privacy.anonymize(where=lambda r: r.get("desired_position") == "QA", batch_size=2)
+    assert job.wait(10) and job.status == "done"
+    assert (job.total, job.affected, job.progress) == (3, 3, 1.0)
+    assert handler.get_candidate_info(ids[1])["email"] == f"candidate_{ids[1]}@anonymous.com"
+    assert handler.get_candidate_info(ids[0])["email"] == "c0@example.com"
+    assert handler.privacy.unfinished_jobs() == []
+
+    # Simulate a purge that stopped after its first batch
+    job = handler.privacy.purge(candidate_ids=ids[:4] + ["missing"], batch_size=2, background=False)
+    assert job.affected == 4
+    interrupted = PrivacyJob(handler, "purge", ids[4:], os.path.join(handler.privacy.jobs_dir, "purge_x.json"),
+                             batch_size=1, processed=1, start=False)
+    assert handler.privacy.unfinished_jobs() == [interrupted.checkpoint_path]
+    resumed = handler.privacy.resume(interrupted.checkpoint_path, background=False)
+    assert resumed.status == "done" and resumed.affected == 2
+    assert [c["id"] for c in handler.get_all_candidates()] == [ids[4]]
+
+
+def test_full_text_search_is_ranked_and_maintained_on_save(handler):
+    """Saves, queued answers and purges all reach the search index"""
+    ops = _candidate("ops@example.com", tech_stack=["Kubernetes", "Go"], desired_position="SRE")
+    cpp = _candidate("cpp@example.com", tech_stack=["C++"], tech_stack_raw="C++ and some Kubernetes")
+    for candidate in (ops, cpp):
+        handler.save_candidate_info(candidate)
+    handler.complete_session(cpp["id"], {"question_1": "I tuned kubernetes autoscaling for C++ services"})
+    handler.flush_pending_writes()
+
+    hits = handler.search_candidates("kubernetes")
+    assert [hit["id"] for hit in hits] == [ops["id"], cpp["id"]]
+    assert hits[0]["search_score"] > hits[1]["search_score"]
+    assert [hit["id"] for hit in handler.search_candidates("c++ autoscal*")] == [cpp["id"]]
+    assert handler.search_candidates("go autoscaling") == []
+    assert len(handler.search_candidates("go autoscaling", match_all=False)) == 2
+
+    handler.privacy.purge([ops["id"]], background=False)
+    assert [hit["id"] for hit in handler.search_candidates("kubernetes")] == [cpp["id"]]
+
+
+def test_skill_index_filters_and_updates_incrementally(handler):
+    """Bitmap filters match a scan and follow saves, completions and deletes"""
+    people = [
+        ("a@example.com", ["kubernetes", "Go"], "7", "SRE"),
+        ("b@example.com", ["Kubernetes", "Python"], "6", "Backend Developer"),
+        ("c@example.com", ["Go", "Kubernetes"], "2", "sre"),
+        ("d@example.com", ["Go"], "9", "SRE"),
+    ]
+    ids = []
+    for email, stack, years, position in people:
+        candidate = _candidate(email, tech_stack=stack, experience_years=years,
+                               desired_position=position)
+        handler.save_candidate_info(candidate)
+        ids.append(candidate["id"])
+    handler.complete_session(ids[0], {"question_1": "a"})
+    handler.complete_session(ids[2], {"question_1": "c"})
+
+    query = dict(skills=["Kubernetes", "go"], min_experience=5, completed=True)
+    assert handler.filter_candidate_ids(**query) == [ids[0]]
+    assert handler.filter_candidate_ids(skills=["Go"], positions=["SRE"]) == [ids[0], ids[2], ids[3]]
+    assert handler.filter_candidate_ids(levels=["beginner", "intermediate"]) == [ids[2]]
+    assert handler.filter_candidate_ids(completed=False, max_experience=6) == [ids[1]]
+    assert handler.filter_candidate_ids(skills=["COBOL"]) == []
+
+    handler.save_candidate_info({**handler.get_candidate_info(ids[3]), "experience_years": "4"})
+    assert handler.filter_candidate_ids(skills=["Go"], min_experience=5) == [ids[0]]
+    handler.privacy.purge([ids[0]], background=False)
+    assert handler.filter_candidates(**query) == []
+
+
+def test_canonical_terms_fold_case_and_aliases(tmp_path):
+    """Spellings and aliases share one canonical term in filters and analytics; records keep theirs"""
+    handler = DataHandler(data_dir=str(tmp_path), backend="sqlite", write_behind=False)
+    for email, stack, position in [("a@example.com", ["golang", "K8s"], "Backend  Developer"),
+                                   ("b@example.com", ["Go ", "kubernetes"], "backend developer"),
+                                   ("c@example.com", ["go", "Rustacean"], "QA"),
+                                   ("d@example.com", ["rustacean"], None)]:
+        handler.save_candidate_info(_candidate(email, tech_stack=stack, desired_position=position))
+    a_id = handler.find_candidate_id("a@example.com")
+
+    assert handler.get_candidate_info(a_id)["tech_stack"] == ["golang", "K8s"]
+    assert handler.filter_candidate_ids(skills=["Go", "kubernetes"]) == \
+        sorted([a_id, handler.find_candidate_id("b@example.com")])
+    assert handler.filter_candidate_ids(positions=["BACKEND DEVELOPER"]) == \
+        sorted([a_id, handler.find_candidate_id("b@example.com")])
+
+    analytics = handler.get_analytics()
+    skills = analytics.skill_frequency()
+    assert dict(zip(skills["skill"], skills["candidates"])) == {"Go": 3, "Kubernetes": 2, "Rustacean": 2}
+    # Unknown names are labelled with the first spelling seen, so compare those case-insensitively
+    positions = analytics.completion_rate_by_position()
+    assert dict(zip(positions["desired_position"].str.casefold(), positions["candidates"])) == \
+        {"backend developer": 2, "qa": 1, "unknown": 1}
+    handler.close()
+
+
+def test_skill_index_snapshot_and_outside_writes(tmp_path):
+    """The index reloads from its snapshot and rebuilds after another worker writes"""
+    handler = DataHandler(data_dir=str(tmp_path), backend="json", write_behind=False)
+    handler.save_candidate_info(_candidate("a@example.com", tech_stack=["Go"]))
+    handler.close()
+    assert (tmp_path / "skill_index.npz").exists()
+
+    index = SkillIndex(str(tmp_path / "skill_index.npz"))
+    assert not index.needs_rebuild(JsonFileStore(str(tmp_path / "candidates.json")).version())
+    assert len(index.filter(skills=["Go"])) == 1
+
+    handler = DataHandler(data_dir=str(tmp_path), backend="json", write_behind=False)
+    JsonFileStore(str(tmp_path / "candidates.json")).upsert(
+        {"id": "outside", "tech_stack": ["Go"], "email": "b@example.com"})
+    assert "outside" in handler.filter_candidate_ids(skills=["Go"])
+    handler.close()
+
+
+def test_candidate_ids_resolve_existing_records_by_email(handler):
+    """Saves reuse any existing id for the email; new ids are wide and never shared"""
+    handler.storage.upsert({"id": "abcd1234", "name": "Old", "email": "old@example.com"})
+    returning = _candidate(" Old@Example.com")
+    handler.save_candidate_info(returning)
+    assert returning["id"] == "abcd1234"
+    assert handler.get_candidate_info("abcd1234")["name"] == "Jane"
+
+    fresh = _candidate("new@example.com")
+    handler.save_candidate_info(fresh)
+    assert fresh["id"] == handler.generate_candidate_id("new@example.com")
+    assert len(fresh["id"]) == 16
+
+    # An anonymized record keeps its id, so the same person coming back gets a new one
+    handler.anonymize_candidate_data(fresh["id"])
+    again = _candidate("new@example.com")
+    handler.save_candidate_info(again)
+    assert again["id"] not in (fresh["id"], "abcd1234")
+    assert handler.get_candidate_info(fresh["id"])["anonymized"] is True
+
+
+@pytest.mark.parametrize("backend", ["json", "log", "sqlite", "partitioned"])
+def test_email_index_is_shared_between_workers(tmp_path, backend):
+    """One worker's saves resolve in another's email index without a rebuild"""
+    from src.core.storage import STORAGE_ENGINES, EmailIndex, IndexedStore
+
+    db_path = str(tmp_path / "emails.db")
+    first = IndexedStore(STORAGE_ENGINES[backend](str(tmp_path)), [EmailIndex(db_path)])
+    second = IndexedStore(STORAGE_ENGINES[backend](str(tmp_path)), [EmailIndex(db_path)])
+    second.upsert({"id": "c1", "email": "Jane@Example.com"})
+
+    emails = first.index("emails")
+    emails.rebuild = lambda records: pytest.fail("email index rebuilt")
+    first.refresh()
+    assert emails.lookup("jane@example.com") == "c1" and emails.has_id("c1")
+    first.delete("c1")
+    assert second.index("emails").lookup("jane@example.com") is None
+    first.close()
+    second.close()
+
+
+def test_split_legacy_id_collisions(tmp_path):
+    """Candidates merged under one legacy id are rebuilt from the log and split apart"""
+    handler = DataHandler(data_dir=str(tmp_path), backend="log", write_behind=False)
+    storage = handler.storage
+    storage.upsert({"id": "deadbeef", "name": "Ann", "email": "ann@example.com"})
+    storage.patch("deadbeef", merge_fields={"technical_responses": {"question_1": "ann"}})
+    storage.upsert({"id": "deadbeef", "name": "Bob", "email": "bob@example.com"})
+    storage.patch("deadbeef", merge_fields={"technical_responses": {"question_2": "bob"}})
+    storage.upsert({"id": "cafe0001", "name": "Cy", "email": "cy@example.com"})
+
+    dry_run = split_id_collisions(handler, dry_run=True)
+    assert dry_run.history_available
+    assert dry_run.collisions == [{"id": "deadbeef", "candidates": 2, "split_into": []}]
+    [entry] = split_id_collisions(handler).collisions
+    ann_id = entry["split_into"][0]
+
+    bob = handler.get_candidate_info("deadbeef")
+    assert (bob["name"], bob["technical_responses"]) == ("Bob", {"question_2": "bob"})
+    ann = handler.get_candidate_info(ann_id)
+    assert (ann["name"], ann["technical_responses"]) == ("Ann", {"question_1": "ann"})
+    assert ann["split_from"] == "deadbeef"
+    assert handler.find_candidate_id("ann@example.com") == ann_id
+    assert split_id_collisions(handler).collisions == []
+    handler.close()
+
+
+def test_split_collisions_reports_stores_without_history(tmp_path):
+    """On JSON a merged candidate is gone, so the report says collisions could not be checked"""
+    handler = DataHandler(data_dir=str(tmp_path), backend="json", write_behind=False)
+    handler.storage.upsert({"id": "deadbeef", "name": "Ann", "email": "ann@example.com"})
+    handler.storage.upsert({"id": "deadbeef", "name": "Bob", "email": "bob@example.com"})
+
+    report = split_id_collisions(handler, dry_run=True)
+    assert not report.history_available and report.collisions == []
+    assert candidate_ids.main(["--data-dir", str(tmp_path), "--backend", "json", "--dry-run"]) == 1
+    handler.close()
+
+
+def test_paginated_scan_with_projection_and_filters(handler):
+    """Pages follow id order from a cursor, return only requested fields and apply filters"""
+    ids = []
+    for i in range(7):
+        candidate = _candidate(f"page{i}@example.com", desired_position="Backend" if i % 2 else "QA",
+                               source="referral" if i < 5 else "web",
+                               technical_responses={"question_1": "long answer"})
+        handler.save_candidate_info(candidate)
+        ids.append(candidate["id"])
+    for candidate_id in ids[:3]:
+        handler.complete_session(candidate_id, {"question_2": "done"})
+
+    records, cursor = handler.get_candidates_page(page_size=3, fields=["name"])
+    assert [r["id"] for r in records] == sorted(ids)[:3]
+    assert all(set(r) == {"id", "name"} for r in records)
+    pages = list(handler.iter_candidate_pages(page_size=3, fields=["desired_position"]))
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [r["id"] for page in pages for r in page] == sorted(ids)
+
+    # A candidate added mid-way does not shift the pages after the cursor
+    handler.save_candidate_info(_candidate("late@example.com"))
+    rest, last = handler.get_candidates_page(cursor, page_size=10)
+    everyone = sorted(ids + [handler.find_candidate_id("late@example.com")])
+    assert [r["id"] for r in rest] == [i for i in everyone if i > cursor]
+    assert last is None
+
+    completed, _ = handler.get_candidates_page(page_size=10, fields=["session_completed"],
+                                               filters={"session_completed": True})
+    assert sorted(r["id"] for r in completed) == sorted(ids[:3])
+    backend, _ = handler.get_candidates_page(page_size=10, fields=[],
+                                             filters={"desired_position": ["Backend", "Data"],
+                                                      "source": "referral"})
+    assert sorted(r["id"] for r in backend) == sorted([ids[1], ids[3]])
+    assert all(set(r) == {"id"} for r in backend)
+
+    # An exactly full last page has no next cursor
+    first, cursor = handler.get_candidates_page(page_size=4)
+    second, cursor = handler.get_candidates_page(first[-1]["id"], page_size=4)
+    assert len(second) == 4 and cursor is None
+
+    # Queued completions count for filters without being flushed
+    handler.complete_session(ids[3], {"question_2": "done"})
+    completed, _ = handler.get_candidates_page(page_size=2, fields=["session_completed"],
+                                               filters={"session_completed": True})
+    assert [r["id"] for r in completed] == sorted(ids[:4])[:2]
+    everyone_done = [r["id"] for page in handler.iter_candidate_pages(
+        page_size=2, filters={"session_completed": True}) for r in page]
+    assert everyone_done == sorted(ids[:4])
+    if handler.write_buffer:
+        assert handler.write_buffer.pending_count() == 1
+
+
+def test_streaming_json_reader_matches_json_load(tmp_path):
+    """Elements come out one by one across any chunk boundary; bad documents still fail"""
+    import io
+    import json
+
+    records = [_candidate(f"s{i}@example.com", experience_years=1.5e1, notes="a ], b")
+               for i in range(20)] + [12345678901234, "x", None, [], {}]
+    text = json.dumps(records, indent=2)
+    for chunk_size in (1, 7, 4096):
+        assert list(iter_json_array(io.StringIO(text), chunk_size)) == records
+    for bad in ('{"id": 1}', "[1, 2", "[1 2]", "[1.]", "[1] x"):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO(bad), 2))
+
+    path = tmp_path / "candidates.json"
+    path.write_text('[{"id": "a"}, {"id": "b"}, {"id": ')
+    store = JsonFileStore(str(path))
+    assert store.get("a") == {"id": "a"}  # Lookups stop reading at the match
+    with pytest.raises(CorruptStoreError):
+        list(store.scan())
+
+
+def test_read_cache_streams_stores_over_its_size_cap(tmp_path):
+    """A JSON store over the cap is read through the streaming reader, not cached whole"""
+    import tracemalloc
+
+    from src.core.storage.read_cache import CachedStore
+
+    engine = JsonFileStore(str(tmp_path / "candidates.json"))
+    engine.replace_all([dict(_candidate(f"big{i}@example.com", notes="x" * 200), id=f"{i:016x}")
+                        for i in range(3000)])
+
+    def peak_read_memory(cache):
+        tracemalloc.start()
+        total = sum(1 for _ in cache.scan())
+        assert total == cache.counts()["total"] == cache.count() == 3000
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    cache = CachedStore(engine, max_bytes=64 * 1024)
+    capped = peak_read_memory(cache)
+    assert cache._records is None
+    # Streaming holds a chunk and a record; caching holds every record (about 3x the file)
+    assert capped < engine.data_size() / 2
+    assert capped * 5 < peak_read_memory(CachedStore(engine))
+
+    cache.patch(f"{5:016x}", {"phone": "555"})
+    assert cache.get(f"{5:016x}")["phone"] == "555"
+    assert [r["id"] for r in cache.scan_page(limit=2)] == [f"{0:016x}", f"{1:016x}"]
+
+
+def test_columnar_snapshot_is_mapped_and_republished(tmp_path):
+    """Snapshot columns are zero-copy views; analytics from it match the live store"""
+    import numpy as np
+
+    from src.core.analytics import CandidateAnalytics
+    from src.core.storage import CandidateSnapshot, get_snapshot_publisher
+
+    handler = DataHandler(data_dir=str(tmp_path), backend="json", write_behind=False)
+    rows = [("a", "Backend", "3", ["python", "Django"]), ("b", "Frontend", 1.5, ["React"]),
+            ("c", None, "n/a", None)]
+    for email, position, years, stack in rows:
+        handler.save_candidate_info(_candidate(f"{email}@example.com", name="Zoë " + email,
+                                               desired_position=position, experience_years=years,
+                                               tech_stack=stack))
+    handler.mark_session_complete(handler.find_candidate_id("a@example.com"))
+
+    snapshot = handler.candidate_snapshot()
+    assert len(snapshot) == 3
+    years = snapshot.column("experience_years")
+    assert not years.flags.writeable and not years.flags.owndata
+    np.testing.assert_array_equal(years, [3.0, 1.5, np.nan])
+    assert snapshot.column("session_completed").tolist() == [True, False, False]
+    assert snapshot.column("timestamp").dtype == np.dtype("datetime64[us]")
+    assert snapshot.strings("name") == ["Zoë a", "Zoë b", "Zoë c"]
+    assert snapshot.strings("tech_stack") == [["python", "Django"], ["React"], []]
+
+    from_store = CandidateAnalytics(handler, source="store")
+    from_snapshot = CandidateAnalytics(handler, source="snapshot")
+    for report in ("skill_frequency", "experience_distribution", "completion_rate_by_position"):
+        assert getattr(from_snapshot, report)().equals(getattr(from_store, report)())
+
+    # Readers keep their mapping until the publisher replaces the file
+    handler.save_candidate_info(_candidate("d@example.com"))
+    publisher = get_snapshot_publisher("json", str(tmp_path))
+    assert publisher.publish_if_changed() and not publisher.publish_if_changed()
+    assert len(snapshot) == 3 and snapshot.refresh() and len(snapshot) == 4
+    assert len(CandidateSnapshot(publisher.path)) == 4
+    handler.close()
+
+
+def test_transcripts_are_compressed_per_candidate_and_removed_on_purge(handler):
+    """Transcripts live outside the record, load on demand and go with the candidate"""
+    candidate = _candidate()
+    handler.save_candidate_info(candidate)
+    messages = [{"role": "user", "message": f"answer {i} " * 50, "timestamp": "2024-01-01T00:00:00"}
+                for i in range(20)]
+    assert handler.get_transcript(candidate["id"]) is None
+    assert handler.save_transcript(candidate["id"], messages)
+
+    assert handler.get_transcript(candidate["id"]) == messages
+    assert "conversation_history" not in handler.get_candidate_info(candidate["id"])
+    path = handler.transcripts._existing(candidate["id"])[0]
+    assert path.endswith(".json.gz") and os.path.getsize(path) < len(str(messages)) / 10
+
+    handler.privacy.purge([candidate["id"]], background=False)
+    assert handler.get_transcript(candidate["id"]) is None
+
+
+def test_sqlite_vocabulary_encoding_and_legacy_conversion(tmp_path):
+    """Positions and tech names are stored as ids; older databases are converted on open"""
+    import sqlite3
+
+    from src.core.storage import SqliteStore
+
+    db_path = str(tmp_path / "candidates.db")
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript("""
+        CREATE TABLE candidates (id TEXT PRIMARY KEY, email TEXT, name TEXT, phone TEXT,
+            experience_years, desired_position TEXT, location TEXT, timestamp TEXT,
+            session_completed INTEGER, tech_stack TEXT, technical_responses TEXT, extra TEXT);
+        INSERT INTO candidates (id, name, desired_position, session_completed, tech_stack, extra)
+            VALUES ('a', 'Ann', 'Backend Developer', 0, '["Python", "python"]', '{"note": 1}'),
+                   ('b', 'Bob', NULL, 1, NULL, NULL);
+    """)
+    legacy.close()
+
+    store = SqliteStore(db_path)
+    assert store.get("a") == {"id": "a", "name": "Ann", "desired_position": "Backend Developer",
+                              "session_completed": False, "tech_stack": ["Python", "python"], "note": 1}
+    assert store.get("b") == {"id": "b", "name": "Bob", "session_completed": True}
+
+    store.upsert({"id": "c", "desired_position": "Backend Developer", "tech_stack": ["Go", "Python"]})
+    store.upsert({"id": "d", "desired_position": 42, "tech_stack": "free text"})
+    row = store._connection().execute("SELECT position_id, tech_ids FROM candidates WHERE id = 'c'").fetchone()
+    assert row == (store.vocabulary.id("Backend Developer"), f'[{store.vocabulary.id("Go")},'
+                                                              f'{store.vocabulary.id("Python")}]')
+    assert store.get("d")["desired_position"] == 42 and store.get("d")["tech_stack"] == "free text"
+    assert [r["id"] for r in store.scan_page(filters={"desired_position": "Backend Developer"})] == ["a", "c"]
+    store.close()
+
+    # A second connection decodes terms added by the first
+    reopened = SqliteStore(db_path)
+    assert reopened.get("c")["tech_stack"] == ["Go", "Python"]
+    reopened.close()
+
+
+def test_bulk_data_quality_report_and_fix(handler):
+    """Malformed fields are reported; normalizable ones are fixed in place"""
+    handler.save_candidate_info(_candidate(" Ann@Example.COM ", phone="555.123.4567", experience_years="4 years"))
+    handler.save_candidate_info(_candidate("bob@example.com", phone="12", experience_years=75))
+    handler.save_candidate_info(_candidate("cy@example.com", phone="(555) 123-4567", experience_years=3))
+    ann = handler.find_candidate_id("ann@example.com")
+
+    report = handler.check_data_quality()
+    assert report.scanned == 3
+    assert report.summary() == {"email": {"not_normalized": 1},
+                                "experience_years": {"out_of_range": 1, "not_normalized": 1},
+                                "phone": {"invalid": 1, "not_normalized": 1}}
+    assert handler.get_candidate_info(ann)["phone"] == "555.123.4567"
+
+    # A field changed after the scan is left alone; the rest is written in one patch_many
+    handler.patch_candidate(ann, {"phone": "555 123 4567"})
+    handler.flush_pending_writes()
+    calls = []
+    patch_many = handler.storage.patch_many
+    handler.storage.patch_many = lambda patches: calls.append(patches) or patch_many(patches)
+    stale = apply_fixes(handler, report)
+    del handler.storage.patch_many
+    assert stale.fixed == 2 and stale.skipped == [ann] and len(calls) == 1
+    assert handler.get_candidate_info(ann)["phone"] == "555 123 4567"
+
+    fixed = handler.check_data_quality(fix=True)
+    assert fixed.fixed == 1 and fixed.skipped == []
+    stored = handler.get_candidate_info(ann)
+    assert (stored["email"], stored["phone"], stored["experience_years"]) == \
+        ("Ann@example.com", "(555) 123-4567", 4)
+    assert handler.find_candidate_id("ann@example.com") == ann
+    assert handler.check_data_quality().summary() == {"experience_years": {"out_of_range": 1},
+                                                      "phone": {"invalid": 1}}
+
+
+def test_bulk_email_check_matches_is_valid_email():
+    """The vectorized email rule accepts and rejects exactly what is_valid_email does"""
+    from src.core.data_handler import is_valid_email
+    from src.core.data_quality import check_emails, quality_frame
+
+    emails = ["a@b.co", "first last@example.com", "a@b@c.d", "a@b.c@d", "x@y", "no-at.com", "@.", "a@.b"]
+    issues = check_emails(quality_frame([{"id": str(i), "email": email} for i, email in enumerate(emails)]))
+    invalid = set(issues.loc[issues["issue"] == "invalid", "id"])
+    assert invalid == {str(i) for i, email in enumerate(emails) if not is_valid_email(email)}
+
+
+def test_patch_candidate_writes_only_the_given_fields(handler):
+    """Field-level patches leave the rest of the record as it was"""
+    candidate = _candidate(location="Berlin", technical_responses={"q1": "a"}, notes={"x": 1})
+    handler.save_candidate_info(candidate)
+    assert handler.patch_candidate(candidate["id"], {"phone": "555", "desired_position": "SRE"},
+                                   merge_fields={"technical_responses": {"q2": "b"}})
+    handler.flush_pending_writes()
+    stored = handler.get_candidate_info(candidate["id"])
+    assert (stored["phone"], stored["desired_position"], stored["location"]) == ("555", "SRE", "Berlin")
+    assert stored["technical_responses"] == {"q1": "a", "q2": "b"}
+    assert stored["notes"] == {"x": 1} and stored["tech_stack"] == ["Python"]
+    assert "last_updated" in stored
+
+
+def test_sqlite_patch_updates_columns_in_place(tmp_path):
+    """SQLite patches touch only their columns and match a full-row rewrite"""
+    from src.core.storage.sqlite_store import SqliteStore, column_update
+
+    columnar = SqliteStore(str(tmp_path / "columns.db"))
+    rewrite = SqliteStore(str(tmp_path / "rows.db"))
+    rewrite._json_functions = False
+    record = {"id": "c1", "name": "Jane", "desired_position": "Dev", "tech_stack": ["Python"],
+              "technical_responses": {"q1": "a"}, "notes": {"x": 1}, "score": 3}
+    patches = [({"phone": "555"}, {}), ({"desired_position": None, "score": None}, {}),
+               ({"tech_stack": "free text", "extra_list": [1, "ü"]}, {}),
+               ({"session_completed": True}, {"technical_responses": {"q2": "b", "q1": "c"}}),
+               ({"tech_stack": ["Go", "Rust"]}, {"notes": {"y": 2}})]
+    for store in (columnar, rewrite):
+        store.upsert(dict(record))
+        for set_fields, merge_fields in patches:
+            assert store.patch("c1", set_fields, merge_fields)
+    assert columnar.get("c1") == rewrite.get("c1")
+    assert not columnar.patch("missing", {"phone": "1"})
+
+    assignments, _ = column_update({"phone": "1"}, {"technical_responses": {"q3": "c"}},
+                                   columnar.vocabulary)
+    assert assignments.startswith("phone = ?, technical_responses = json_patch(")
+    assert "extra" not in assignments and "name" not in assignments
+    assert column_update(None, {"notes": {"y": 3}}, columnar.vocabulary) is None
+    columnar.close()
+    rewrite.close()